@@ -0,0 +1,419 @@
+"""
+Network content blocking with EasyList-style filter lists.
+
+Supported: `||host^` anchors, `|` anchors, `*` and `^` wildcards, /regex/
+rules, `@@` exceptions (including `@@||site^$document` to allow a whole
+site), and the options third-party, domain=, match-case, important and the
+resource types. Cosmetic rules (`##` and friends) and options we cannot
+honour (popup, csp=, redirect=, ...) are skipped.
+
+Compiled form:
+    host rules      `||ads.example.com^` without options lands in a hash set;
+                    a request checks each suffix of its host (O(labels))
+    pattern rules   bucketed under one token, a run of [a-z0-9%] the URL
+                    must contain; the least used token of the rule is
+                    chosen, so a request only tests the few rules filed
+                    under its own URL's tokens
+Parsing is skipped on later starts: the compiled rules are cached as JSON,
+keyed by the filter files' names, sizes and mtimes.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .storage import app_root, save_json, load_json
+
+CACHE_VERSION = 1
+
+# --- Rule flags ---
+THIRD_PARTY = 1
+FIRST_PARTY = 2
+MATCH_CASE = 4
+IMPORTANT = 8
+EXCEPTION = 16
+REGEX = 32
+
+# --- Resource types (bit per type) ---
+TYPES = {
+    "script": 1, "image": 2, "stylesheet": 4, "object": 8, "xmlhttprequest": 16,
+    "subdocument": 32, "media": 64, "font": 128, "ping": 256, "websocket": 512, "other": 1024,
+}
+ALL_TYPES = (1 << len(TYPES)) - 1
+_TYPE_ALIASES = {"xhr": "xmlhttprequest", "css": "stylesheet", "frame": "subdocument"}
+
+# Options that make a rule meaningless for network blocking
+_SKIP_OPTIONS = {"popup", "elemhide", "ehide", "generichide", "ghide", "genericblock",
+                 "specifichide", "shide", "csp", "redirect", "redirect-rule", "rewrite",
+                 "removeparam", "replace", "cname", "inline-script", "inline-font"}
+
+# Common to nearly every URL; used as a bucket only if a rule has nothing better
+_BAD_TOKENS = {"http", "https", "www", "com", "net", "org", "js", "html", "php"}
+
+_TOKEN = re.compile(r"[a-z0-9%]{2,}")
+_HOST_RULE = re.compile(r"\|\|([a-z0-9.-]+)\^")
+_COSMETIC = ("##", "#@#", "#?#", "#$#", "#@?#", "#%#")
+_SCHEME_HOST = re.compile(r"^[a-z][a-z0-9+.-]*://([^/?#:@]*@)?([^/?#:]*)")
+
+
+def _host(url_l: str) -> str:
+    m = _SCHEME_HOST.match(url_l)
+    return m.group(2) if m else ""
+
+
+def _suffixes(host: str) -> Iterable[str]:
+    """"a.b.com" -> "a.b.com", "b.com", "com"."""
+    while host:
+        yield host
+        dot = host.find(".")
+        if dot < 0:
+            return
+        host = host[dot + 1:]
+
+
+def base_domain(host: str) -> str:
+    """
+    Registrable domain, approximated without the public suffix list:
+    the last two labels, or three under a two-letter TLD with a short
+    second level ("example.co.uk").
+    """
+    labels = host.split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in ("co", "com", "ac", "gov", "net", "org", "edu", "ne", "or"):
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _to_regex(pattern: str) -> str:
+    out = []
+    if pattern.startswith("||"):
+        out.append(r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?")
+        pattern = pattern[2:]
+    elif pattern.startswith("|"):
+        out.append("^")
+        pattern = pattern[1:]
+    end = pattern.endswith("|")
+    if end:
+        pattern = pattern[:-1]
+    for ch in pattern:
+        if ch == "*":
+            out.append(".*")
+        elif ch == "^":
+            out.append(r"(?:[^\w.%-]|$)")
+        else:
+            out.append(re.escape(ch))
+    if end:
+        out.append("$")
+    return "".join(out)
+
+
+def _pattern_tokens(pattern: str) -> List[str]:
+    """Runs of [a-z0-9%] that any matching URL must contain as whole tokens."""
+    start_anchored = pattern.startswith("|")
+    body = pattern.lstrip("|")
+    end_anchored = body.endswith("|")
+    body = body.rstrip("|")
+    out = []
+    for m in re.finditer(r"[a-z0-9%]+", body):
+        s, e = m.span()
+        if e - s < 2:
+            continue
+        before = body[s - 1] if s > 0 else None
+        after = body[e] if e < len(body) else None
+        if before == "*" or after == "*":
+            continue
+        if (before is None and not start_anchored) or (after is None and not end_anchored):
+            continue
+        out.append(m.group())
+    return out
+
+
+class Rule:
+    __slots__ = ("text", "flags", "types", "pattern", "include", "exclude", "_regex")
+
+    def __init__(self, text: str, flags: int, types: int, pattern: str,
+                 include: Tuple[str, ...] = (), exclude: Tuple[str, ...] = ()):
+        self.text = text
+        self.flags = flags
+        self.types = types
+        self.pattern = pattern  # filter pattern, or regex source when flags & REGEX
+        self.include = include
+        self.exclude = exclude
+        self._regex = None
+
+    def matches(self, url: str, url_l: str, source: str, third: bool, tmask: int) -> bool:
+        if not self.types & tmask:
+            return False
+        if third:
+            if self.flags & FIRST_PARTY:
+                return False
+        elif self.flags & THIRD_PARTY:
+            return False
+        if self.include or self.exclude:
+            suffixes = list(_suffixes(source))
+            if self.include and not any(s in self.include for s in suffixes):
+                return False
+            if any(s in self.exclude for s in suffixes):
+                return False
+        if self._regex is None:
+            # Compiled on first use: most rules are never tested
+            source_re = self.pattern if self.flags & REGEX else _to_regex(self.pattern)
+            # Plain patterns are lower-cased already unless match-case
+            case = re.IGNORECASE if self.flags & REGEX and not self.flags & MATCH_CASE else 0
+            self._regex = re.compile(source_re, case)
+        return self._regex.search(url if self.flags & MATCH_CASE else url_l) is not None
+
+
+def _parse_options(text: str):
+    """(flags, types, include, exclude, document) or None if the rule should be skipped."""
+    flags, types, neg_types = 0, 0, 0
+    include, exclude = [], []
+    document = False
+    for opt in text.split(","):
+        opt = opt.strip().lower()
+        neg = opt.startswith("~")
+        name = opt.lstrip("~")
+        name, _, value = name.partition("=")
+        name = _TYPE_ALIASES.get(name, name)
+        if name in TYPES:
+            if neg:
+                neg_types |= TYPES[name]
+            else:
+                types |= TYPES[name]
+        elif name in ("third-party", "3p"):
+            flags |= FIRST_PARTY if neg else THIRD_PARTY
+        elif name in ("first-party", "1p"):
+            flags |= THIRD_PARTY if neg else FIRST_PARTY
+        elif name == "domain" and value:
+            for d in value.split("|"):
+                (exclude if d.startswith("~") else include).append(d.lstrip("~"))
+        elif name == "match-case":
+            flags |= MATCH_CASE
+        elif name == "important":
+            flags |= IMPORTANT
+        elif name in ("document", "doc"):
+            document = True
+        elif name in _SKIP_OPTIONS or name:
+            return None
+    if not types:
+        types = ALL_TYPES
+    types &= ~neg_types
+    if not types and not document:
+        return None
+    return flags, types, tuple(include), tuple(exclude), document
+
+
+class FilterEngine:
+    """Compiled filter lists; match() decides one request."""
+
+    def __init__(self):
+        self.hosts = set()        # ||host^: blocked for any party
+        self.hosts_3p = set()     # ||host^$third-party
+        self.allow_hosts = set()  # @@||host^
+        self.allow_sites = set()  # @@||site^$document: nothing blocked on these pages
+        self._block: Dict[str, List[Rule]] = {}
+        self._allow: Dict[str, List[Rule]] = {}
+        self._seen = set()
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        n = sum(len(b) for b in self._block.values()) + sum(len(b) for b in self._allow.values())
+        return n + len(self.hosts) + len(self.hosts_3p) + len(self.allow_hosts) + len(self.allow_sites)
+
+    # --- Building ---
+    def add_file(self, path: Path):
+        with Path(path).open("r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                self.add(line)
+
+    def add(self, line: str) -> bool:
+        """Compile one filter line; False if it is a comment or unsupported."""
+        line = line.strip()
+        if not line or line[0] in "![" or any(m in line for m in _COSMETIC) or line in self._seen:
+            return False
+        self._seen.add(line)
+        text = line
+        flags = 0
+        if line.startswith("@@"):
+            flags |= EXCEPTION
+            line = line[2:]
+        opts = (0, ALL_TYPES, (), (), False)
+        dollar = line.rfind("$")
+        # Options never contain "/", a regex ending in "$/" does
+        if dollar >= 0 and "/" not in line[dollar:]:
+            opts = _parse_options(line[dollar + 1:])
+            line = line[:dollar]
+            if opts is None:
+                self.skipped += 1
+                return False
+        is_regex = line.startswith("/") and line.endswith("/") and len(line) > 2
+        oflags, types, include, exclude, document = opts
+        flags |= oflags
+
+        if is_regex:
+            try:
+                re.compile(line[1:-1])
+            except re.error:
+                self.skipped += 1
+                return False
+            self._file(Rule(text, flags | REGEX, types, line[1:-1], include, exclude), "")
+            return True
+
+        pattern = line if flags & MATCH_CASE else line.lower()
+        pattern = pattern.strip("*") if not pattern.startswith("|") else pattern.rstrip("*")
+        if document:
+            # Only `@@||site^$document` (allow a whole site) is meaningful here
+            m = _HOST_RULE.fullmatch(pattern)
+            if flags & EXCEPTION and m:
+                self.allow_sites.add(m.group(1))
+                return True
+            self.skipped += 1
+            return False
+
+        m = _HOST_RULE.fullmatch(pattern)
+        if m and not include and not exclude and types == ALL_TYPES and not flags & (IMPORTANT | FIRST_PARTY):
+            host = m.group(1)
+            if flags & EXCEPTION:
+                if flags & THIRD_PARTY:
+                    return self._add_rule(text, flags, types, pattern, include, exclude)
+                self.allow_hosts.add(host)
+            elif flags & THIRD_PARTY:
+                self.hosts_3p.add(host)
+            else:
+                self.hosts.add(host)
+            return True
+        return self._add_rule(text, flags, types, pattern, include, exclude)
+
+    def _add_rule(self, text, flags, types, pattern, include, exclude) -> bool:
+        rule = Rule(text, flags, types, pattern, include, exclude)
+        buckets = self._allow if flags & EXCEPTION else self._block
+        tokens = _pattern_tokens(pattern.lower())
+        best = ""
+        if tokens:
+            best = min(tokens, key=lambda t: (t in _BAD_TOKENS, len(buckets.get(t, ())), -len(t)))
+        self._file(rule, best)
+        return True
+
+    def _file(self, rule: Rule, token: str):
+        buckets = self._allow if rule.flags & EXCEPTION else self._block
+        buckets.setdefault(token, []).append(rule)
+
+    # --- Matching ---
+    def match(self, url: str, source_host: str = "", rtype: str = "other") -> Optional[str]:
+        """
+        The filter that blocks a request for `url` made by a page on
+        `source_host`, or None if it is allowed.
+        """
+        url_l = url.lower()
+        host = _host(url_l)
+        source = source_host.lower()
+        if source and any(s in self.allow_sites for s in _suffixes(source)):
+            return None
+        third = bool(source) and base_domain(host) != base_domain(source)
+        tmask = TYPES.get(rtype, TYPES["other"])
+
+        blocked = None
+        for s in _suffixes(host):
+            if s in self.hosts or (third and s in self.hosts_3p):
+                blocked = f"||{s}^"
+                break
+        tokens = None
+        if blocked is None:
+            tokens = set(_TOKEN.findall(url_l))
+            rule = self._scan(self._block, tokens, url, url_l, source, third, tmask)
+            if rule is None:
+                return None
+            if rule.flags & IMPORTANT:
+                return rule.text
+            blocked = rule.text
+
+        if any(s in self.allow_hosts for s in _suffixes(host)):
+            return None
+        if tokens is None:
+            tokens = set(_TOKEN.findall(url_l))
+        if self._scan(self._allow, tokens, url, url_l, source, third, tmask) is not None:
+            return None
+        return blocked
+
+    def should_block(self, url: str, source_host: str = "", rtype: str = "other") -> bool:
+        return self.match(url, source_host, rtype) is not None
+
+    @staticmethod
+    def _scan(buckets, tokens, url, url_l, source, third, tmask) -> Optional[Rule]:
+        for tok in tokens:
+            for rule in buckets.get(tok, ()):
+                if rule.matches(url, url_l, source, third, tmask):
+                    return rule
+        for rule in buckets.get("", ()):
+            if rule.matches(url, url_l, source, third, tmask):
+                return rule
+        return None
+
+    # --- Serialized form ---
+    def to_dict(self, key=None) -> dict:
+        rules = []
+        for buckets in (self._block, self._allow):
+            for tok, bucket in buckets.items():
+                for r in bucket:
+                    rules.append([tok, r.flags, r.types, r.pattern, r.text,
+                                  list(r.include), list(r.exclude)])
+        return {
+            "version": CACHE_VERSION,
+            "key": key,
+            "hosts": sorted(self.hosts),
+            "hosts_3p": sorted(self.hosts_3p),
+            "allow_hosts": sorted(self.allow_hosts),
+            "allow_sites": sorted(self.allow_sites),
+            "rules": rules,
+        }
+
+    @staticmethod
+    def from_dict(d: dict) -> "FilterEngine":
+        e = FilterEngine()
+        e.hosts = set(d["hosts"])
+        e.hosts_3p = set(d["hosts_3p"])
+        e.allow_hosts = set(d["allow_hosts"])
+        e.allow_sites = set(d["allow_sites"])
+        for tok, flags, types, pattern, text, include, exclude in d["rules"]:
+            e._file(Rule(text, flags, types, pattern, tuple(include), tuple(exclude)), tok)
+        return e
+
+
+def filter_dir() -> Path:
+    """Filter lists (*.txt, e.g. easylist.txt) live in AppData\\Roaming\\CopperBrowserV1\\filters."""
+    return app_root() / "filters"
+
+
+def load_filters(paths: Optional[List[Path]] = None, cache_path: Optional[Path] = None) -> FilterEngine:
+    """
+    Compile the filter files (default: every *.txt in filter_dir()), reusing
+    the cached compiled form while the files are unchanged.
+    """
+    if paths is None:
+        d = filter_dir()
+        paths = sorted(d.glob("*.txt")) if d.is_dir() else []
+        cache_path = cache_path or app_root() / "cache" / "filters.json"
+    key = []
+    for p in paths:
+        try:
+            st = Path(p).stat()
+            key.append([str(p), st.st_size, st.st_mtime_ns])
+        except OSError:
+            continue
+    if cache_path is not None:
+        cached = load_json(cache_path, None)
+        if isinstance(cached, dict) and cached.get("version") == CACHE_VERSION and cached.get("key") == key:
+            try:
+                return FilterEngine.from_dict(cached)
+            except (KeyError, TypeError, ValueError):
+                pass  # Rebuild from the lists below
+    engine = FilterEngine()
+    for p, _, _ in key:
+        try:
+            engine.add_file(Path(p))
+        except OSError:
+            continue
+    if cache_path is not None:
+        try:
+            save_json(cache_path, engine.to_dict(key), indent=None)
+        except OSError:
+            pass  # Fail silently; next start parses again
+    return engine
\ No newline at end of file
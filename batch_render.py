@@ -0,0 +1,359 @@
+"""
+Headless batch rendering: screenshots, PDFs or page text for a list of
+URLs, through a pool of reused offscreen web views.
+
+    python -m copper_browser.batch_render urls.txt --out shots --format png pdf --jobs 8
+    cat urls.txt | python -m copper_browser.batch_render --format text --timeout 20
+
+One URL per line (lines starting with "#" are skipped); "-" or no file reads stdin. Each
+page is written to OUT/NNNNN-<host-and-path>.<png|pdf|txt>, one record
+per page goes to OUT/results.jsonl, and a pages/second summary to stderr.
+The exit status is 1 if any page failed.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, List, Optional
+
+from PyQt6.QtCore import QEvent, QObject, QTimer, Qt, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PyQt6.QtWidgets import QApplication
+
+from .config import Config, DEFAULT_USER_AGENT, CHROME_USER_AGENT
+from .engine_presets import PRESETS, apply_preset
+from .storage import JsonLinesLog, valid_profile_name
+from .browser_tab import BrowserTab
+from .web_profile import create_web_profile
+
+# Pages rendered at once, and how long each may take from load to last file
+DEFAULT_JOBS = 4
+DEFAULT_TIMEOUT_S = 30
+
+# Wait this long after loadFinished before capturing, so late scripts and paints land
+DEFAULT_SETTLE_MS = 500
+
+DEFAULT_VIEWPORT = (1280, 800)
+
+FORMATS = {"png": "png", "pdf": "pdf", "text": "txt"}
+
+USER_AGENTS = {"copper": DEFAULT_USER_AGENT, "chrome": CHROME_USER_AGENT}
+
+_SLUG = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def read_urls(lines) -> List[str]:
+    """URLs from a file or stdin: one per line, blank and "#" lines skipped; https:// is implied."""
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        urls.append(line if "://" in line else "https://" + line)
+    return urls
+
+
+def output_stem(index: int, url: str) -> str:
+    """File name without extension: input position, then host and path."""
+    parts = urllib.parse.urlsplit(url)
+    slug = _SLUG.sub("_", (parts.netloc + parts.path).strip("/")).strip("_")[:80]
+    return f"{index:05d}-{slug or 'page'}"
+
+
+@dataclass
+class RenderResult:
+    index: int
+    url: str
+    ok: bool = False
+    error: str = ""
+    load_ms: float = 0.0    # load() to loadFinished
+    total_ms: float = 0.0   # load() to the last file written
+    files: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"index": self.index, "url": self.url, "ok": self.ok, "error": self.error,
+                "load_ms": round(self.load_ms, 1), "total_ms": round(self.total_ms, 1), "files": self.files}
+
+
+def render_profile(config: Config, persistent: bool, parent=None):
+    """
+    The browser's on-disk profile (cookies, cache; see web_profile.create_web_profile)
+    when `persistent`, else a throwaway off-the-record one with the same user agent.
+    """
+    if persistent:
+        return create_web_profile(config, parent)
+    profile = QWebEngineProfile(parent)  # off the record
+    profile.setHttpUserAgent(config.user_agent)
+    return profile
+
+
+class _Slot:
+    """One reusable view and the job it is working on."""
+
+    def __init__(self, tab: BrowserTab):
+        self.tab = tab
+        self.result: Optional[RenderResult] = None
+        self.t0 = 0.0
+        self.pending = 0  # captures still running
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.settle = QTimer()
+        self.settle.setSingleShot(True)
+
+
+class RenderPool(QObject):
+    """
+    Renders URLs through at most `jobs` BrowserTabs at a time, shown
+    offscreen at `viewport` size. A view is reused for the next URL once
+    its page is captured; after a timeout or failure the view gets a fresh
+    page, so nothing from the abandoned load reaches the next job.
+    `pageDone` carries each RenderResult, `finished` follows the last one.
+    """
+
+    pageDone = pyqtSignal(object)
+    finished = pyqtSignal()
+
+    def __init__(self, profile, out_dir: Path, formats: List[str], jobs: int = DEFAULT_JOBS,
+                 timeout_ms: int = DEFAULT_TIMEOUT_S * 1000, settle_ms: int = DEFAULT_SETTLE_MS,
+                 viewport=DEFAULT_VIEWPORT, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.out_dir = Path(out_dir)
+        self.formats = formats
+        self.jobs = max(1, jobs)
+        self.timeout_ms = timeout_ms
+        self.settle_ms = settle_ms
+        self.viewport = viewport
+        self.results: List[RenderResult] = []
+        self._queue: Deque[RenderResult] = deque()
+        self._slots: List[_Slot] = []
+        self._busy = 0
+
+    def render(self, urls: List[str]):
+        """Queue `urls`; results come through pageDone, then finished."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        start = len(self.results) + len(self._queue) + self._busy
+        self._queue.extend(RenderResult(start + i, url) for i, url in enumerate(urls))
+        while len(self._slots) < min(self.jobs, self._busy + len(self._queue)):
+            self._slots.append(self._new_slot())
+        for slot in self._slots:
+            if slot.result is None:
+                self._next(slot)
+        if not self._busy:
+            self.finished.emit()
+
+    def _new_slot(self) -> _Slot:
+        tab = BrowserTab(self.profile)
+        # Laid out and painted like a window, but never shown on a screen
+        tab.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+        tab.resize(*self.viewport)
+        tab.show()
+        slot = _Slot(tab)
+        slot.timer.timeout.connect(lambda s=slot: self._done(s, f"timed out after {self.timeout_ms} ms"))
+        slot.settle.timeout.connect(lambda s=slot: self._capture(s))
+        tab.view.loadFinished.connect(lambda ok, s=slot: self._on_loaded(s, ok))
+        self._wire_page(slot)
+        return slot
+
+    def _wire_page(self, slot: _Slot):
+        slot.tab.view.page().pdfPrintingFinished.connect(lambda path, ok, s=slot: self._on_pdf(s, path, ok))
+
+    def _replace_page(self, slot: _Slot):
+        view = slot.tab.view
+        old = view.page()
+        old.triggerAction(QWebEnginePage.WebAction.Stop)
+        view.setPage(QWebEnginePage(self.profile, view))
+        old.deleteLater()
+        self._wire_page(slot)
+
+    def _next(self, slot: _Slot):
+        if not self._queue:
+            return
+        slot.result = self._queue.popleft()
+        slot.pending = 0
+        slot.t0 = time.perf_counter()
+        self._busy += 1
+        slot.timer.start(self.timeout_ms)
+        slot.tab.load(slot.result.url)
+
+    def _path(self, result: RenderResult, fmt: str) -> Path:
+        return self.out_dir / f"{output_stem(result.index, result.url)}.{FORMATS[fmt]}"
+
+    def _on_loaded(self, slot: _Slot, ok: bool):
+        r = slot.result
+        if r is None or r.load_ms or slot.settle.isActive():
+            return  # between jobs, or a later load of the same page (script navigation)
+        if not ok:
+            self._done(slot, "load failed")
+            return
+        r.load_ms = (time.perf_counter() - slot.t0) * 1000
+        slot.settle.start(self.settle_ms)
+
+    def _capture(self, slot: _Slot):
+        r = slot.result
+        if r is None:
+            return
+        page = slot.tab.view.page()
+        for fmt in self.formats:
+            path = self._path(r, fmt)
+            if fmt == "png":
+                if slot.tab.view.grab().save(str(path), "PNG"):
+                    r.files.append(str(path))
+                else:
+                    r.error = "screenshot failed"
+            elif fmt == "pdf":
+                slot.pending += 1
+                page.printToPdf(str(path))
+            elif fmt == "text":
+                slot.pending += 1
+                page.toPlainText(lambda text, s=slot, res=r, p=path: self._on_text(s, res, p, text))
+        if not slot.pending:
+            self._done(slot)
+
+    def _on_text(self, slot: _Slot, result: RenderResult, path: Path, text: str):
+        if slot.result is not result:
+            return  # timed out meanwhile
+        try:
+            path.write_text(text, encoding="utf-8")
+            result.files.append(str(path))
+        except OSError as e:
+            result.error = f"text: {e}"
+        self._captured(slot)
+
+    def _on_pdf(self, slot: _Slot, path: str, ok: bool):
+        r = slot.result
+        if r is None or Path(path) != self._path(r, "pdf"):
+            return  # a PDF of a page that timed out
+        if ok:
+            r.files.append(path)
+        else:
+            r.error = "PDF failed"
+        self._captured(slot)
+
+    def _captured(self, slot: _Slot):
+        slot.pending -= 1
+        if slot.pending <= 0:
+            self._done(slot)
+
+    def _done(self, slot: _Slot, error: str = ""):
+        r = slot.result
+        if r is None:
+            return
+        slot.timer.stop()
+        slot.settle.stop()
+        slot.result = None
+        self._busy -= 1
+        if error:
+            r.error = error
+            self._replace_page(slot)
+        r.ok = not r.error
+        r.total_ms = (time.perf_counter() - slot.t0) * 1000
+        slot.tab.view.history().clear()  # the view is reused; its back list is not
+        self.results.append(r)
+        self.pageDone.emit(r)
+        self._next(slot)
+        if not self._busy:
+            self.finished.emit()
+
+    def close(self):
+        """Delete the views now, so their pages go before the profile does."""
+        for slot in self._slots:
+            slot.timer.stop()
+            slot.settle.stop()
+            slot.tab.deleteLater()
+        self._slots.clear()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def parse_args(argv):
+    """Split our options from the rest, which are passed on to Qt."""
+    parser = argparse.ArgumentParser(prog="copper_browser.batch_render",
+                                     description="Render a list of URLs to screenshots, PDFs or text.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one URL per line (default: stdin)")
+    parser.add_argument("--out", default="render", help="output directory (default: ./render)")
+    parser.add_argument("--format", nargs="+", choices=sorted(FORMATS), default=["png"], dest="formats",
+                        help="what to write for each page (default: png)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="pages in flight at once")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S,
+                        help="seconds a page may take, load to last file")
+    parser.add_argument("--settle-ms", type=int, default=DEFAULT_SETTLE_MS,
+                        help="wait after loadFinished before capturing")
+    parser.add_argument("--viewport", default="%dx%d" % DEFAULT_VIEWPORT, help="WIDTHxHEIGHT of each view")
+    parser.add_argument("--user-agent", default="copper",
+                        help="'copper', 'chrome' or a user agent string")
+    parser.add_argument("--profile", default=None,
+                        help="use this on-disk browser profile (its cookies and cache); "
+                             "default: a throwaway off-the-record one")
+    parser.add_argument("--engine-preset", choices=sorted(PRESETS), default="default",
+                        help="Chromium process/raster preset")
+    return parser.parse_known_args(argv[1:])
+
+
+def main(argv=None):
+    argv = sys.argv if argv is None else argv
+    args, qt_args = parse_args(argv)
+    try:
+        width, height = (int(n) for n in args.viewport.lower().split("x"))
+    except ValueError:
+        raise SystemExit(f"invalid --viewport {args.viewport!r}; expected WIDTHxHEIGHT")
+    if args.profile is not None and not valid_profile_name(args.profile):
+        raise SystemExit(f"invalid profile name: {args.profile!r}")
+
+    if args.input == "-":
+        urls = read_urls(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            urls = read_urls(f)
+    if not urls:
+        print("no URLs to render", file=sys.stderr)
+        return 0
+
+    config = Config(user_agent=USER_AGENTS.get(args.user_agent, args.user_agent),
+                    engine_preset=args.engine_preset)
+    if args.profile:
+        config.profile = args.profile
+    apply_preset(config.engine_preset)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(argv[:1] + qt_args)
+
+    profile = render_profile(config, args.profile is not None, app)
+    out = Path(args.out)
+    pool = RenderPool(profile, out, args.formats, args.jobs, int(args.timeout * 1000),
+                      args.settle_ms, (width, height))
+    log = JsonLinesLog(out / "results.jsonl")
+    try:
+        os.remove(log.path)  # records of an earlier run into the same directory
+    except OSError:
+        pass
+
+    def page_done(r: RenderResult):
+        log.append(r.to_dict())
+        log.flush()  # a page takes far longer than the fsync
+        if not r.ok:
+            print(f"{r.url}: {r.error}", file=sys.stderr)
+
+    pool.pageDone.connect(page_done)
+    pool.finished.connect(app.quit)
+    t0 = time.perf_counter()
+    pool.render(urls)
+    if len(pool.results) < len(urls):
+        app.exec()
+    elapsed = time.perf_counter() - t0
+    pool.close()
+    log.close()
+
+    ok = sum(r.ok for r in pool.results)
+    loads = sorted(r.load_ms for r in pool.results if r.ok)
+    p50 = loads[len(loads) // 2] if loads else 0.0
+    print(f"{ok}/{len(urls)} pages in {elapsed:.1f} s: {len(urls) / elapsed:.2f} pages/s "
+          f"with {args.jobs} views, load p50 {p50:.0f} ms", file=sys.stderr)
+    return 0 if ok == len(urls) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Per-request cost of the content blocker's FilterEngine.
+
+Compiles a filter list (a synthetic EasyList-sized one, or real lists via
+--filters), times parsing and the cached compiled form, then replays a
+request log through match(). A log line is `url [source_host [type]]`;
+without --log a synthetic mix of page, CDN and ad requests is used.
+
+    python -m copper_browser.benchmarks.bench_adblock --rules 60000 --requests 200000
+    python -m copper_browser.benchmarks.bench_adblock --filters easylist.txt --log requests.txt
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from copper_browser.adblock import load_filters
+
+WORDS = ("ad ads banner track pixel beacon promo sponsor affiliate analytics stats "
+         "metrics popup tag click counter widget video img static cdn assets").split()
+
+TYPES = ("script", "image", "stylesheet", "xmlhttprequest", "subdocument", "other")
+
+
+def _ad_host(i: int) -> str:
+    return f"{WORDS[i % len(WORDS)]}{i}.adnet{i % 97}.com"
+
+
+def synthetic_filters(n: int, rng: random.Random) -> list:
+    lines = ["[Adblock Plus 2.0]", "! synthetic list"]
+    for i in range(n):
+        k = rng.random()
+        if k < 0.55:
+            lines.append(f"||{_ad_host(i)}^" + ("$third-party" if k < 0.2 else ""))
+        elif k < 0.8:
+            lines.append(f"/{rng.choice(WORDS)}-{rng.choice(WORDS)}{i}/*")
+        elif k < 0.9:
+            lines.append(f"&{rng.choice(WORDS)}_{i}=")
+        elif k < 0.95:
+            lines.append(f"||site{i}.com/{rng.choice(WORDS)}/*.js$script,domain=news{i % 50}.com")
+        elif k < 0.98:
+            lines.append(f"-{rng.choice(WORDS)}-{rng.randint(100, 999)}x{rng.randint(50, 600)}.")
+        else:
+            lines.append(f"@@||{_ad_host(i)}/allowed/*")
+    return lines
+
+
+def synthetic_log(n: int, n_rules: int, rng: random.Random) -> list:
+    pages = [f"news{i}.com" for i in range(50)] + [f"shop{i}.example.org" for i in range(50)]
+    reqs = []
+    for _ in range(n):
+        page = rng.choice(pages)
+        k = rng.random()
+        if k < 0.1:
+            host = _ad_host(rng.randrange(n_rules))
+        elif k < 0.4:
+            host = page
+        else:
+            host = f"cdn{rng.randrange(20)}.static.net"
+        path = "/".join(rng.choice(WORDS) + str(rng.randrange(1000)) for _ in range(rng.randint(1, 4)))
+        query = f"?v={rng.randrange(10**6)}&{rng.choice(WORDS)}_{rng.randrange(n_rules)}=1" if rng.random() < 0.4 else ""
+        reqs.append((f"https://{host}/{path}.js{query}", page, rng.choice(TYPES)))
+    return reqs
+
+
+def read_log(path: Path) -> list:
+    reqs = []
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.split()
+            if parts:
+                reqs.append((parts[0], parts[1] if len(parts) > 1 else "", parts[2] if len(parts) > 2 else "other"))
+    return reqs
+
+
+def run(filters: list, requests: list, rules: int) -> dict:
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        if not filters:
+            path = Path(tmp) / "synthetic.txt"
+            path.write_text("\n".join(synthetic_filters(rules, rng)), encoding="utf-8")
+            filters = [path]
+        cache = Path(tmp) / "filters.json"
+
+        t0 = time.perf_counter()
+        engine = load_filters(filters, cache)      # parse + write cache
+        t_parse = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        engine = load_filters(filters, cache)      # from cache
+        t_cached = time.perf_counter() - t0
+        cache_mb = os.path.getsize(cache) / 1e6
+
+    if not requests:
+        requests = synthetic_log(200_000, rules, rng)
+
+    times = []
+    blocked = 0
+    clock = time.perf_counter
+    for url, source, rtype in requests:
+        t0 = clock()
+        hit = engine.match(url, source, rtype)
+        times.append(clock() - t0)
+        blocked += hit is not None
+    times.sort()
+    n = len(times)
+    return {
+        "rules": len(engine),
+        "skipped": engine.skipped,
+        "parse_s": t_parse,
+        "cached_load_s": t_cached,
+        "cache_mb": cache_mb,
+        "requests": n,
+        "blocked": blocked,
+        "mean_us": sum(times) / n * 1e6,
+        "p50_us": times[n // 2] * 1e6,
+        "p99_us": times[min(n - 1, int(n * 0.99))] * 1e6,
+        "max_us": times[-1] * 1e6,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Content blocker matching benchmark")
+    ap.add_argument("--filters", type=Path, nargs="*", default=[], help="filter list files (default: synthetic)")
+    ap.add_argument("--rules", type=int, default=60_000, help="size of the synthetic list")
+    ap.add_argument("--log", type=Path, help="request log: url [source_host [type]] per line")
+    ap.add_argument("--requests", type=int, default=200_000, help="size of the synthetic log")
+    args = ap.parse_args()
+    requests = read_log(args.log) if args.log else synthetic_log(args.requests, args.rules, random.Random(2))
+    r = run(args.filters, requests, args.rules)
+    print(f"rules: {r['rules']} (skipped {r['skipped']})  parse: {r['parse_s']:.2f} s  "
+          f"cached load: {r['cached_load_s']:.2f} s  cache: {r['cache_mb']:.1f} MB")
+    print(f"requests: {r['requests']}  blocked: {r['blocked']} ({r['blocked'] / max(r['requests'], 1):.1%})")
+    print(f"match: mean {r['mean_us']:.1f} us  p50 {r['p50_us']:.1f} us  "
+          f"p99 {r['p99_us']:.1f} us  max {r['max_us']:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
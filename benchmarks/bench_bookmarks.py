@@ -0,0 +1,108 @@
+"""
+Bulk import/export and lookup cost of the bookmark store.
+
+Generates a Netscape bookmark file with N bookmarks spread over folders,
+imports it, exports it in both formats, re-imports the Chromium export into
+a fresh store and times lookups, deletes and a reload from the log. The
+longest single step shows how much a BatchJob slice can overrun.
+
+    python -m copper_browser.benchmarks.bench_bookmarks --bookmarks 100000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from copper_browser.bookmarks import Bookmarks
+from copper_browser.storage import JsonLinesLog
+from copper_browser.bookmarks_io import export_bookmarks, import_events, read_events
+
+
+def synthetic_html(path: Path, n: int, per_folder: int):
+    with path.open("w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<TITLE>Bookmarks</TITLE>\n<DL><p>\n")
+        for i in range(n):
+            if i % per_folder == 0:
+                if i:
+                    f.write("    </DL><p>\n")
+                f.write(f"    <DT><H3>Folder {i // per_folder}</H3>\n    <DL><p>\n")
+            f.write(f'        <DT><A HREF="https://host{i % 997}.example/page/{i}?q=a&amp;r={i}" '
+                    f'ADD_DATE="{1_600_000_000 + i}">Page {i} &amp; more</A>\n')
+        f.write("    </DL><p>\n</DL><p>\n")
+
+
+def _drain(steps) -> tuple:
+    """Run a generator to the end; (last value, total seconds, longest step in ms)."""
+    value, longest = 0, 0.0
+    t0 = last = time.perf_counter()
+    for value in steps:
+        now = time.perf_counter()
+        longest = max(longest, now - last)
+        last = now
+    return value, time.perf_counter() - t0, longest * 1e3
+
+
+def run(n: int, per_folder: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = tmp / "bookmarks.html"
+        synthetic_html(src, n, per_folder)
+
+        store = Bookmarks(JsonLinesLog(tmp / "a.jsonl"))
+        imported, t_import, step_import = _drain(import_events(store, read_events(src)))
+        t0 = time.perf_counter()
+        store.persist()
+        t_persist = time.perf_counter() - t0
+
+        _, t_html, _ = _drain(export_bookmarks(store, tmp / "out.html"))
+        _, t_json, _ = _drain(export_bookmarks(store, tmp / "out.json"))
+        other = Bookmarks()
+        reimported, t_reimport, step_reimport = _drain(import_events(other, read_events(tmp / "out.json")))
+
+        urls = [b.url for b in store.list()]
+        t0 = time.perf_counter()
+        hits = sum(store.is_bookmarked(u) for u in urls)
+        t_lookup = time.perf_counter() - t0
+
+        ids = [b.id for b in store.list()[::10]]
+        t0 = time.perf_counter()
+        for id_ in ids:
+            store.delete(id_)
+        t_delete = time.perf_counter() - t0
+        store.close()
+
+        t0 = time.perf_counter()
+        reloaded = len(Bookmarks(JsonLinesLog(tmp / "a.jsonl")))
+        t_load = time.perf_counter() - t0
+
+    return {
+        "bookmarks": n,
+        "imported": imported,
+        "import_s": t_import,
+        "import_step_max_ms": step_import,
+        "persist_s": t_persist,
+        "export_html_s": t_html,
+        "export_json_s": t_json,
+        "reimported": reimported,
+        "reimport_json_s": t_reimport,
+        "reimport_step_max_ms": step_reimport,
+        "lookup_us": t_lookup / max(len(urls), 1) * 1e6,
+        "lookup_hits": hits,
+        "delete_us": t_delete / max(len(ids), 1) * 1e6,
+        "reload_s": t_load,
+        "reloaded": reloaded,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Bookmark import/export benchmark")
+    ap.add_argument("--bookmarks", type=int, default=100_000)
+    ap.add_argument("--per-folder", type=int, default=500)
+    args = ap.parse_args()
+    r = run(args.bookmarks, args.per_folder)
+    for k, v in r.items():
+        print(f"{k:>20}: {v:.3f}" if isinstance(v, float) else f"{k:>20}: {v}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Keystroke-to-suggestion latency of the address-bar CompletionIndex.
+
+Indexes N synthetic URLs, then times suggest() for typed prefixes of
+increasing length. The target is well under 1 ms per keystroke at 500k URLs.
+
+    python -m copper_browser.benchmarks.bench_completion --urls 500000
+"""
+import argparse
+import random
+import time
+
+from copper_browser.completion import CompletionIndex
+
+WORDS = ("dash board report wiki docs runbook metrics alerts deploy build pipeline "
+         "search issue team calendar login admin config status api").split()
+
+QUERIES = ("g", "gi", "git", "github.com/", "d", "da", "dash1", "run", "report",
+           "https://", "metrics al", "zzz")
+
+
+def run(n_urls: int, repeat: int) -> dict:
+    rng = random.Random(1)
+    hosts = [f"{rng.choice(WORDS)}{i}.corp.example.com" for i in range(max(n_urls // 150, 1))]
+    hosts += ["github.com", "google.com", "stackoverflow.com"]
+    visits = []
+    for i in range(n_urls):
+        path = "/".join(rng.choice(WORDS) for _ in range(3))
+        title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}"
+        visits.append((f"https://{rng.choice(hosts)}/{path}/{i}", title, 650 + rng.random() * 10))
+
+    idx = CompletionIndex()
+    t0 = time.perf_counter()
+    idx.build(visits[:-1000], [])
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for url, title, frecency in visits[-1000:]:
+        idx.add_visit(url, title, frecency)
+    t_add = (time.perf_counter() - t0) / 1000
+
+    per_query = {}
+    for q in QUERIES:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            idx.suggest(q)
+        per_query[q] = (time.perf_counter() - t0) / repeat * 1e6
+
+    return {
+        "urls": len(idx),
+        "build_s": t_build,
+        "add_visit_us": t_add * 1e6,
+        "suggest_us": per_query,
+        "worst_suggest_us": max(per_query.values()),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Address-bar completion latency benchmark")
+    ap.add_argument("--urls", type=int, default=500_000)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+    r = run(args.urls, args.repeat)
+    print(f"urls: {r['urls']}  build: {r['build_s']:.1f} s  add_visit: {r['add_visit_us']:.1f} us")
+    for q, us in r["suggest_us"].items():
+        print(f"  {q!r:>16}: {us:8.1f} us")
+    print(f"worst keystroke: {r['worst_suggest_us']:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
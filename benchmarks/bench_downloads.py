@@ -0,0 +1,177 @@
+"""
+Throughput, bandwidth caps and pause/resume of the DownloadManager against
+a local HTTP server that serves large generated files with Range support.
+
+Every finished file is checked byte for byte; a mismatch fails the run.
+
+    python -m copper_browser.benchmarks.bench_downloads --mb 64 --files 4 --cap-kbps 4096
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from copper_browser.downloads import DONE, DownloadManager
+
+# File content repeats this block, so any range can be served and checked cheaply
+_BLOCK = random.Random(0).randbytes(1 << 20)
+
+# Slice the server writes per send
+_SEND = 256 * 1024
+
+
+def _content(offset: int, length: int) -> bytes:
+    out = bytearray()
+    while length > 0:
+        start = offset % len(_BLOCK)
+        piece = _BLOCK[start:start + length]
+        out += piece
+        offset += len(piece)
+        length -= len(piece)
+    return bytes(out)
+
+
+class _FileHandler(BaseHTTPRequestHandler):
+    """GET /<bytes>/<name> serves <bytes> bytes of generated content."""
+
+    def do_GET(self):
+        try:
+            size = int(self.path.split("/")[1])
+        except (IndexError, ValueError):
+            self.send_error(404)
+            return
+        start = 0
+        rng = self.headers.get("Range", "")
+        if rng.startswith("bytes="):
+            start = int(rng[6:].split("-")[0])
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+        try:
+            for offset in range(start, size, _SEND):
+                self.wfile.write(_content(offset, min(_SEND, size - offset)))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client paused or cancelled
+
+    def log_message(self, *args):
+        pass
+
+
+def serve() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FileHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _verify(manager: DownloadManager, size: int):
+    for d in manager.list():
+        if d.state != DONE:
+            raise AssertionError(f"{d.name}: {d.state} {d.error}")
+        data = Path(d.path).read_bytes()
+        if len(data) != size or data != _content(0, size):
+            raise AssertionError(f"{d.name}: content differs")
+
+
+def _fetch(base: str, root: Path, size: int, files: int, **limits) -> float:
+    """Download `files` files of `size` bytes at once; returns seconds."""
+    m = DownloadManager(root, max_concurrent=files, **limits)
+    for i in range(files):
+        m.add(f"{base}/{size}/file{i}.bin")
+    t0 = time.perf_counter()
+    m.start()
+    m.wait()
+    elapsed = time.perf_counter() - t0
+    _verify(m, size)
+    return elapsed
+
+
+def _pause_resume(base: str, root: Path, size: int) -> dict:
+    """Pause mid-way, resume, then quit mid-way and finish in a new manager."""
+    state = root / "downloads.json"
+    m = DownloadManager(root, state, max_kbps_each=size // 1024)  # about 1 s for the file
+    d = m.add(f"{base}/{size}/resume.bin")
+    m.start()
+    time.sleep(0.3)
+    m.pause(d.id)
+    time.sleep(0.2)
+    paused_at = m.get(d.id).received
+    t0 = time.perf_counter()
+    m.resume(d.id)
+    while m.get(d.id).received <= paused_at:
+        time.sleep(0.001)
+    resume_ms = (time.perf_counter() - t0) * 1e3
+    time.sleep(0.3)
+    m.close()
+
+    m = DownloadManager(root, state)  # picks up the interrupted download, uncapped
+    restored = m.get(d.id).received
+    m.start()
+    m.wait()
+    _verify(m, size)
+    return {"resume_ms": resume_ms, "restored_bytes": restored}
+
+
+def _snapshot_cost(root: Path, n: int) -> float:
+    """list() + totals() with `n` entries, as the downloads panel polls them."""
+    m = DownloadManager(root)
+    for i in range(n):
+        m.add(f"http://127.0.0.1:9/{i}.bin")
+    t0 = time.perf_counter()
+    for _ in range(20):
+        m.list()
+        m.totals()
+    return (time.perf_counter() - t0) / 20
+
+
+def run(mb: int = 64, files: int = 4, cap_kbps: int = 4096) -> dict:
+    server = serve()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    size = mb * 1024 * 1024
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            t = _fetch(base, root / "plain", size, files)
+            results["unlimited_mb_per_s"] = mb * files / t
+
+            # Both caps: the global one shared by all, and a looser per-download one
+            capped_size = cap_kbps * 1024 * 2 // files  # about 2 s at the cap
+            t = _fetch(base, root / "capped", capped_size, files,
+                       max_kbps=cap_kbps, max_kbps_each=cap_kbps)
+            achieved = capped_size * files / t / 1024
+            results["cap_kbps"] = cap_kbps
+            results["capped_kbps"] = achieved
+            results["cap_accuracy_ratio"] = min(achieved, cap_kbps) / max(achieved, cap_kbps)
+
+            results.update(_pause_resume(base, root / "resume", 2 * 1024 * 1024))
+            results["snapshot_1000_us"] = _snapshot_cost(root / "snapshot", 1000) * 1e6
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Download manager benchmark")
+    ap.add_argument("--mb", type=int, default=64, help="size of each file in the throughput run")
+    ap.add_argument("--files", type=int, default=4, help="concurrent downloads")
+    ap.add_argument("--cap-kbps", type=int, default=4096, help="global cap for the capped run")
+    args = ap.parse_args()
+    for k, v in run(args.mb, args.files, args.cap_kbps).items():
+        print(f"{k:>22}: {v:.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
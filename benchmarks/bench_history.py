@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for the URL-keyed history index.
+
+Replays N visits over a smaller set of unique URLs (like reloading the same
+dashboards all day) and reports per-operation add and lookup cost.
+
+    python -m copper_browser.benchmarks.bench_history --visits 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from copper_browser.history import History, HistoryLog
+
+
+def _urls(n_unique: int):
+    return [f"https://host{i % 997}.example/path/{i}" for i in range(n_unique)]
+
+
+def run(visits: int, unique: int, persist: bool) -> dict:
+    rng = random.Random(1)
+    urls = _urls(unique)
+    # Skewed picks: a few URLs get most of the visits, the rest are spread out
+    picks = [
+        urls[min(int(rng.paretovariate(1.2)) - 1, unique - 1)] if rng.random() < 0.8
+        else rng.choice(urls)
+        for _ in range(visits)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = HistoryLog(Path(tmp) / "history.jsonl") if persist else None
+        h = History(log)
+        h.index  # load the (empty) log up front so add() updates the index
+        ts = 1_700_000_000.0
+
+        t0 = time.perf_counter()
+        for i, url in enumerate(picks):
+            h.add(url, "Title", ts + i)
+        t_add = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for url in picks:
+            h.get(url)
+        t_get = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        top = h.top(10)
+        t_top = time.perf_counter() - t0
+
+        if log is not None:
+            t0 = time.perf_counter()
+            h.compact()
+            t_compact = time.perf_counter() - t0
+            log.close()
+            t0 = time.perf_counter()
+            reloaded = len(History(HistoryLog(log.path)).index)
+            t_load = time.perf_counter() - t0
+        else:
+            t_compact = t_load = 0.0
+            reloaded = len(h)
+
+    return {
+        "visits": visits,
+        "unique_urls": len(h),
+        "persist": persist,
+        "add_us": t_add / visits * 1e6,
+        "get_us": t_get / visits * 1e6,
+        "top10_ms": t_top * 1e3,
+        "compact_ms": t_compact * 1e3,
+        "load_ms": t_load * 1e3,
+        "reloaded": reloaded,
+        "top_url": top[0].url if top else "",
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="History add/lookup benchmark")
+    ap.add_argument("--visits", type=int, default=1_000_000)
+    ap.add_argument("--unique", type=int, default=50_000)
+    ap.add_argument("--memory", action="store_true", help="skip the on-disk log")
+    args = ap.parse_args()
+    r = run(args.visits, args.unique, not args.memory)
+    for k, v in r.items():
+        print(f"{k:>12}: {v:.3f}" if isinstance(v, float) else f"{k:>12}: {v}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
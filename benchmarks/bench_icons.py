@@ -0,0 +1,99 @@
+"""
+Favicon store: cost of storing an icon, of the first lookup of a host in
+a session (disk read + decode), of later lookups (memory) and of hosts
+without an icon; then a history-sized list is "painted" to check that
+each host is decoded once, and a small cap checks eviction.
+
+    python -m copper_browser.benchmarks.bench_icons --hosts 5000 --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _icons(n: int):
+    from PyQt6.QtGui import QColor, QIcon, QPixmap
+    out = []
+    for i in range(n):
+        pm = QPixmap(32, 32)
+        pm.fill(QColor((i * 2654435761) & 0xFFFFFF))
+        out.append(QIcon(pm))
+    return out
+
+
+def run(hosts: int = 5000, rows: int = 100_000) -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # A QApplication, not a QGuiApplication, so bench_tabs can run in the same process
+    from PyQt6.QtWidgets import QApplication
+    from copper_browser.favicons import IconStore
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841 (pixmaps need it)
+    urls = [f"https://host{i}.example/page" for i in range(hosts)]
+    icons = _icons(hosts)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        store = IconStore(root, 64)
+        t0 = time.perf_counter()
+        for url, icon in zip(urls, icons):
+            store.set_icon(url, icon)
+        results["store_us"] = (time.perf_counter() - t0) / hosts * 1e6
+        results["disk_kb_per_icon"] = store.stats.bytes / hosts / 1024
+
+        t0 = time.perf_counter()
+        for url, icon in zip(urls, icons):
+            store.set_icon(url, icon)  # unchanged icons: encoded and compared, not written
+        results["store_same_us"] = (time.perf_counter() - t0) / hosts * 1e6
+
+        # A new session: the first lookup per host reads and decodes
+        store = IconStore(root, 64, memory=hosts)
+        t0 = time.perf_counter()
+        for url in urls:
+            store.icon(url)
+        results["cold_lookup_us"] = (time.perf_counter() - t0) / hosts * 1e6
+        t0 = time.perf_counter()
+        for url in urls:
+            store.icon(url)
+        results["hit_lookup_us"] = (time.perf_counter() - t0) / hosts * 1e6
+        t0 = time.perf_counter()
+        for i in range(hosts):
+            store.icon(f"https://unknown{i}.example/")
+        results["miss_lookup_us"] = (time.perf_counter() - t0) / hosts * 1e6
+
+        # Painting a long list: every host decoded once however many rows share it
+        store = IconStore(root, 64, memory=hosts)
+        list_hosts = min(hosts, 1000)
+        t0 = time.perf_counter()
+        for r in range(rows):
+            store.icon(urls[r % list_hosts])
+        results["list_row_us"] = (time.perf_counter() - t0) / rows * 1e6
+        results["list_decoded"] = store.stats.decoded
+        if store.stats.decoded != list_hosts:
+            raise AssertionError(f"{store.stats.decoded} decodes for {list_hosts} hosts")
+
+        # Eviction under a cap of a fifth of what is stored
+        small = IconStore(root / "capped", 1)
+        small.max_bytes = int(results["disk_kb_per_icon"] * 1024 * hosts / 5)
+        for url, icon in zip(urls, icons):
+            small.set_icon(url, icon)
+        results["capped_kb"] = small.stats.bytes / 1024
+        results["capped_evicted"] = small.stats.evicted
+        if small.stats.bytes > small.max_bytes:
+            raise AssertionError("store is over its cap")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Favicon store benchmark")
+    ap.add_argument("--hosts", type=int, default=5000)
+    ap.add_argument("--rows", type=int, default=100_000, help="rows in the list-painting run")
+    args = ap.parse_args()
+    for k, v in run(args.hosts, args.rows).items():
+        print(f"{k:>18}: {v:.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Single-instance forwarding: a stand-in browser (an InstanceServer in a
+child process) receives the URLs. Measures the forward() round trip and
+the wall time of a whole second launch (`python -m copper_browser.main
+URL`), which must exit without loading Qt widgets or the web engine.
+A bare interpreter start is measured too, as the floor of the latter.
+
+    python -m copper_browser.benchmarks.bench_instance --forwards 200 --launches 10
+    python -m copper_browser.benchmarks.bench_instance --serve PROFILE
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+_ROOT = str(Path(__file__).absolute().parents[2])  # directory holding the copper_browser package
+
+
+def serve(profile: str):
+    """Stand-in browser: prints "ready", then one line per message with the number of URLs."""
+    from PyQt6.QtCore import QCoreApplication
+    from copper_browser.single_instance import InstanceServer, server_name
+
+    app = QCoreApplication(sys.argv[:1])
+    server = InstanceServer(server_name(profile), app)
+    if not server.listen():
+        raise SystemExit(f"cannot listen: {server.error()}")
+    server.urlsReceived.connect(lambda urls: print(len(urls), flush=True))
+    print("ready", flush=True)
+    app.exec()
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (_ROOT, env.get("PYTHONPATH")) if p)
+    env.setdefault("APPDATA", str(Path.home()))
+    return env
+
+
+def _wall_ms(cmd, env, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, (time.perf_counter() - t0) * 1e3)
+    return best
+
+
+def run(forwards: int = 200, launches: int = 10) -> dict:
+    env = _env()
+    os.environ["APPDATA"] = env["APPDATA"]  # server_name() depends on it
+    from copper_browser.single_instance import forward, server_name
+
+    profile = f"bench-{uuid.uuid4().hex[:8]}"
+    child = subprocess.Popen([sys.executable, "-m", "copper_browser.benchmarks.bench_instance", "--serve", profile],
+                             env=env, stdout=subprocess.PIPE, text=True)
+    results = {}
+    try:
+        if child.stdout.readline().strip() != "ready":
+            raise RuntimeError("stand-in browser did not start")
+        name = server_name(profile)
+        urls = [f"https://example.com/{i}" for i in range(5)]
+
+        t0 = time.perf_counter()
+        for _ in range(forwards):
+            if not forward(name, urls):
+                raise RuntimeError("forward() found no browser")
+        results["forward_ms"] = (time.perf_counter() - t0) / forwards * 1e3
+
+        results["python_startup_ms"] = _wall_ms([sys.executable, "-c", "pass"], env, launches)
+        results["second_launch_ms"] = _wall_ms(
+            [sys.executable, "-m", "copper_browser.main", "--profile", profile, "https://example.com/"],
+            env, launches)
+    finally:
+        child.terminate()
+        out, _ = child.communicate(timeout=10)
+        from PyQt6.QtNetwork import QLocalServer
+        QLocalServer.removeServer(server_name(profile))  # the socket file a terminated server leaves
+    results["messages"] = forwards + launches
+    results["received"] = len(out.split())  # equal to messages when nothing was lost
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Single-instance forwarding benchmark")
+    ap.add_argument("--forwards", type=int, default=200, help="forward() round trips to time")
+    ap.add_argument("--launches", type=int, default=10, help="second launches to time (best is kept)")
+    ap.add_argument("--serve", metavar="PROFILE", help="only run the stand-in browser for PROFILE")
+    args = ap.parse_args()
+    if args.serve:
+        serve(args.serve)
+        return
+    for k, v in run(args.forwards, args.launches).items():
+        print(f"{k:>20}: {v:.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Batch render throughput (batch_render.RenderPool), headless: the
+bench_tabs fixture pages are rendered to PNG and text one view at a time
+and through a pool of --jobs views, from a local http.server with a
+throwaway off-the-record profile.
+
+    python -m copper_browser.benchmarks.bench_render --pages 40 --jobs 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from copper_browser.benchmarks.bench_tabs import serve, write_fixtures
+
+# A batch slower than this counts as stuck
+BATCH_TIMEOUT_MS = 300_000
+
+
+def _render(app, pool, urls) -> float:
+    """Seconds to render `urls` through `pool`."""
+    from copper_browser.benchmarks.bench_tabs import _wait
+
+    done = []
+    pool.finished.connect(lambda: done.append(True))
+    t0 = time.perf_counter()
+    pool.render(urls)
+    if not _wait(app, lambda: done, BATCH_TIMEOUT_MS):
+        raise RuntimeError("batch did not finish")
+    return time.perf_counter() - t0
+
+
+def run(pages: int = 40, jobs: int = 4) -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # Imports QtWebEngineWidgets, which has to happen before the QApplication exists
+    from copper_browser.batch_render import RenderPool, render_profile
+    from copper_browser.config import Config
+    from PyQt6.QtWidgets import QApplication
+
+    tmp = tempfile.TemporaryDirectory()
+    site = Path(tmp.name) / "site"
+    names = write_fixtures(site)
+    server = serve(site)
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+    urls = [base + names[i % len(names)] + f"?{i}" for i in range(pages)]
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    profile = render_profile(Config(), False, app)
+    results = {"pages": pages, "jobs": jobs}
+    try:
+        for name, n in (("serial", 1), ("pool", jobs)):
+            pool = RenderPool(profile, Path(tmp.name) / name, ["png", "text"], n, settle_ms=100)
+            elapsed = _render(app, pool, urls)
+            results[f"{name}_pages_per_s"] = pages / elapsed
+            results[f"{name}_failed"] = sum(not r.ok for r in pool.results)
+            loads = sorted(r.load_ms for r in pool.results if r.ok)
+            results[f"{name}_load_p50_ms"] = loads[len(loads) // 2] if loads else 0.0
+            pool.close()
+        results["speedup_ratio"] = results["pool_pages_per_s"] / results["serial_pages_per_s"]
+    finally:
+        server.shutdown()
+        tmp.cleanup()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch render throughput benchmark")
+    ap.add_argument("--pages", type=int, default=40, help="URLs per batch")
+    ap.add_argument("--jobs", type=int, default=4, help="views in the pooled run")
+    args = ap.parse_args()
+    for k, v in run(args.pages, args.jobs).items():
+        print(f"{k:>22}: {v:.3f}" if isinstance(v, float) else f"{k:>22}: {v}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
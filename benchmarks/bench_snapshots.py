@@ -0,0 +1,88 @@
+"""
+Page snapshot store: bookkeeping cost of a finished save (rename, index,
+eviction), of the lookups behind "Open snapshot" and the revisit
+counter, and of indexing the directory in a new session. Then a skewed
+stream of visits runs against a small cap to show how many revisits still
+find a snapshot, and an aged store checks max-age expiry. The engine's own MHTML
+writing is not included; files of --kb are written in its place.
+
+    python -m copper_browser.benchmarks.bench_snapshots --pages 2000 --visits 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+
+def _save(store, url: str, data: bytes):
+    """What the engine and MainWindow do for one snapshot."""
+    temp = store.begin(url)
+    temp.write_bytes(data)
+    store.finished(temp, True)
+
+
+def run(pages: int = 2000, visits: int = 20_000, kb: int = 64) -> dict:
+    from copper_browser.snapshots import SnapshotStore
+
+    urls = [f"https://runbooks.example/page/{i}" for i in range(pages)]
+    data = os.urandom(kb * 1024)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        store = SnapshotStore(root, max_mb=1 + pages * kb // 1024)
+        t0 = time.perf_counter()
+        for url in urls:
+            _save(store, url, data)
+        results["save_us"] = (time.perf_counter() - t0) / pages * 1e6
+
+        t0 = time.perf_counter()
+        for url in urls:
+            store.visited(url)
+        results["visited_us"] = (time.perf_counter() - t0) / pages * 1e6
+        t0 = time.perf_counter()
+        for url in urls:
+            store.get(url)
+        results["get_us"] = (time.perf_counter() - t0) / pages * 1e6
+
+        # A new session lists the directory once
+        store = SnapshotStore(root, max_mb=1 + pages * kb // 1024)
+        t0 = time.perf_counter()
+        store.has(urls[0])
+        results["index_ms"] = (time.perf_counter() - t0) * 1e3
+
+        # Skewed revisits against a cap of a tenth of the pages: the popular ones stay
+        cap_mb = max(1, pages * kb // 10 // 1024)
+        store = SnapshotStore(root / "capped", max_mb=cap_mb)
+        rng = random.Random(1)
+        weights = [1 / (i + 1) for i in range(pages)]
+        for url in rng.choices(urls, weights, k=visits):
+            if not store.visited(url):
+                _save(store, url, data)
+        s = store.stats
+        results["revisit_ratio"] = s.revisits / visits
+        results["evicted"] = s.evicted
+        results["over_cap_mb"] = max(0.0, (s.bytes - store.max_bytes) / 1024 / 1024)
+
+        # Everything older than the max age goes on the next session's first lookup
+        old = time.time() - 2 * 86400
+        for path in (root / "snapshots").iterdir():
+            os.utime(path, (old, old))
+        store = SnapshotStore(root, max_age_s=86400)
+        results["expired"] = store.stats.expired
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Page snapshot store benchmark")
+    ap.add_argument("--pages", type=int, default=2000, help="distinct pages")
+    ap.add_argument("--visits", type=int, default=20_000, help="visits in the skewed run")
+    ap.add_argument("--kb", type=int, default=64, help="size of each stand-in snapshot")
+    args = ap.parse_args()
+    for k, v in run(args.pages, args.visits, args.kb).items():
+        print(f"{k:>16}: {v:.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
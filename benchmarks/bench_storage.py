@@ -0,0 +1,125 @@
+"""
+Add, save, load and lookup cost of the History and Bookmarks stores at
+growing sizes (10^3 to 10^6 entries by default up to 10^5).
+
+Each size gets a fresh on-disk log in a temporary directory. "save" is one
+persist() of everything added, "load" opens a new store on the same log
+and forces the lazy read.
+
+    python -m copper_browser.benchmarks.bench_storage --sizes 1000,10000,100000,1000000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from copper_browser.bookmarks import Bookmarks
+from copper_browser.history import History
+from copper_browser.storage import JsonLinesLog
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def _url(i: int) -> str:
+    return f"https://host{i % 997}.example/section/{i % 31}/page-{i}"
+
+
+def bench_history(n: int, root: Path) -> dict:
+    path = root / f"history-{n}.jsonl"
+    h = History(JsonLinesLog(path))
+    h.index  # load the (empty) log so add() updates the index
+    urls = [_url(i) for i in range(n)]
+    ts = 1_700_000_000.0
+
+    t0 = time.perf_counter()
+    for i, url in enumerate(urls):
+        h.add(url, "Title", ts + i)
+    t_add = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    h.persist()
+    t_save = time.perf_counter() - t0
+    h.close()
+
+    t0 = time.perf_counter()
+    h = History(JsonLinesLog(path))
+    h.index
+    t_load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for url in urls:
+        h.get(url)
+    t_get = time.perf_counter() - t0
+    h.close()
+
+    return {
+        f"history_{n}_add_us": t_add / n * 1e6,
+        f"history_{n}_save_ms": t_save * 1e3,
+        f"history_{n}_load_ms": t_load * 1e3,
+        f"history_{n}_lookup_us": t_get / n * 1e6,
+    }
+
+
+def bench_bookmarks(n: int, root: Path) -> dict:
+    path = root / f"bookmarks-{n}.jsonl"
+    b = Bookmarks(JsonLinesLog(path))
+    urls = [_url(i) for i in range(n)]
+    folders = [b.add_folder(f"Folder {i}").id for i in range(max(1, n // 1000))]
+
+    t0 = time.perf_counter()
+    for i, url in enumerate(urls):
+        b.add("Page", url, folders[i % len(folders)], 1_700_000_000.0)
+    t_add = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    b.persist()
+    t_save = time.perf_counter() - t0
+    b.close()
+
+    t0 = time.perf_counter()
+    b = Bookmarks(JsonLinesLog(path))
+    len(b)
+    t_load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for url in urls:
+        b.is_bookmarked(url)
+    t_lookup = time.perf_counter() - t0
+
+    ids = [x.id for x in b.list()[::10]]
+    t0 = time.perf_counter()
+    for id_ in ids:
+        b.delete(id_)
+    t_delete = time.perf_counter() - t0
+    b.close()
+
+    return {
+        f"bookmarks_{n}_add_us": t_add / n * 1e6,
+        f"bookmarks_{n}_save_ms": t_save * 1e3,
+        f"bookmarks_{n}_load_ms": t_load * 1e3,
+        f"bookmarks_{n}_lookup_us": t_lookup / n * 1e6,
+        f"bookmarks_{n}_delete_us": t_delete / max(len(ids), 1) * 1e6,
+    }
+
+
+def run(sizes=DEFAULT_SIZES) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            results.update(bench_history(n, Path(tmp)))
+            results.update(bench_bookmarks(n, Path(tmp)))
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="History/Bookmarks storage benchmark")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                    help="comma-separated entry counts")
+    args = ap.parse_args()
+    r = run([int(s) for s in args.sizes.split(",") if s])
+    for k, v in r.items():
+        print(f"{k:>28}: {v:.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
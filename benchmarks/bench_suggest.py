@@ -0,0 +1,159 @@
+"""
+Search suggestions against a local stand-in engine: round trip of an
+uncached prefix, cost of a cached one, how many requests simulated typing
+sends (debounce) and cancels (stale requests), and how many connections
+the shared QNetworkAccessManager opened (keep-alive).
+
+    python -m copper_browser.benchmarks.bench_suggest --queries 200
+    python -m copper_browser.benchmarks.bench_suggest --serve 8765
+
+With --serve, only the stand-in runs; point Config.suggest_endpoints at
+http://127.0.0.1:8765/suggest?q={query} to try it in the browser.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from copper_browser.config import Config
+
+_WORDS = ("performance", "python", "qt webengine", "download manager", "bandwidth",
+          "keep alive", "cache", "latency", "browser", "suggestion")
+
+
+class _SuggestHandler(BaseHTTPRequestHandler):
+    """GET /suggest?q=... answers OpenSearch JSON after `delay` seconds, over keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _SuggestHandler.lock:
+            _SuggestHandler.connections += 1
+
+    def do_GET(self):
+        q = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get("q", [""])[0]
+        time.sleep(self.delay)
+        body = json.dumps([q, [f"{q}{suffix}" for suffix in ("", " tutorial", " benchmark", " 2024")]])
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-suggestions+json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the request was aborted as stale
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), _SuggestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _wait(app, done, timeout_s: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while not done():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.0005)
+    return True
+
+
+def _type(app, suggester, word: str, interval_s: float):
+    """Feed `word` one keystroke every `interval_s`, then let the last request finish."""
+    for i in range(1, len(word) + 1):
+        suggester.request(word[:i])
+        _wait(app, lambda: False, interval_s)
+    _wait(app, lambda: suggester._reply is None and not suggester._timer.isActive(), 5.0)
+
+
+def run(queries: int = 200) -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # A QApplication, not a QCoreApplication, so bench_tabs can run in the same process
+    from PyQt6.QtWidgets import QApplication
+    from copper_browser.search_suggest import SearchSuggester
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    server = serve()
+    _SuggestHandler.connections = 0
+    config = Config(suggest_endpoints={
+        "DuckDuckGo": f"http://127.0.0.1:{server.server_address[1]}/suggest?q={{query}}"})
+    s = SearchSuggester(config)
+    got = []
+    s.suggested.connect(lambda text, phrases: got.append(text))
+    results = {}
+    try:
+        # Uncached prefixes: debounce + round trip
+        texts = [f"query {i}" for i in range(queries)]
+        t0 = time.perf_counter()
+        for text in texts:
+            s.request(text)
+            if not _wait(app, lambda: got and got[-1] == text):
+                raise RuntimeError(f"no suggestions for {text!r}")
+        elapsed = time.perf_counter() - t0
+        results["miss_ms"] = elapsed / queries * 1e3
+        results["round_trip_ms"] = s.stats.avg_ms
+        results["miss_connections"] = _SuggestHandler.connections  # 1 with keep-alive
+
+        # The same prefixes again come from the cache
+        t0 = time.perf_counter()
+        for text in texts:
+            s.request(text)
+        results["hit_us"] = (time.perf_counter() - t0) / queries * 1e6
+
+        # Typing faster than the debounce: about one request per word
+        s.cache.clear()
+        before = s.stats.requests
+        for word in _WORDS:
+            _type(app, s, word, 0.05)
+        results["fast_typing_keystrokes"] = sum(map(len, _WORDS))
+        results["fast_typing_requests"] = s.stats.requests - before
+
+        # Typing slower than the debounce against a slow engine: stale requests are aborted
+        _SuggestHandler.delay = 0.3
+        s.cache.clear()
+        before, cancelled = s.stats.requests, s.stats.cancelled
+        for word in _WORDS[:3]:
+            _type(app, s, word, 0.2)
+        results["slow_engine_requests"] = s.stats.requests - before
+        results["slow_engine_cancelled"] = s.stats.cancelled - cancelled
+        results["connections"] = _SuggestHandler.connections  # an aborted request costs its connection
+    finally:
+        _SuggestHandler.delay = 0.0
+        server.shutdown()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Search suggestion benchmark")
+    ap.add_argument("--queries", type=int, default=200, help="distinct prefixes in the miss/hit runs")
+    ap.add_argument("--serve", type=int, metavar="PORT", help="only run the stand-in engine on PORT")
+    args = ap.parse_args()
+    if args.serve is not None:
+        server = serve(args.serve)
+        print(f"http://127.0.0.1:{server.server_address[1]}/suggest?q={{query}}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+    for k, v in run(args.queries).items():
+        print(f"{k:>22}: {v:.3f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
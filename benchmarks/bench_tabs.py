@@ -0,0 +1,226 @@
+"""
+Tab and page-load cost of the real MainWindow, headless.
+
+Runs under the Qt "offscreen" platform against a local http.server serving
+generated fixture pages, with a throwaway profile (APPDATA points at a
+temporary directory). Measures the synchronous cost of MainWindow.new_tab,
+time to loadFinished, renderer memory per tab (Linux /proc) and how much
+of it comes back after the tabs are closed.
+
+    python -m copper_browser.benchmarks.bench_tabs --tabs 10 --preset low-memory
+
+With --preset, the engine preset's switches are applied before Qt starts
+and the results are checked against the targets it declares.
+"""
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from copper_browser.engine_presets import PRESETS, apply_preset
+
+# Give a closed renderer this long to exit before memory is measured again
+SETTLE_MS = 3000
+
+# A page load slower than this counts as failed
+LOAD_TIMEOUT_MS = 30_000
+
+_LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+          "tempor incididunt ut labore et dolore magna aliqua. ")
+
+
+def write_fixtures(root: Path) -> list:
+    """Fixture pages of different shapes; returns their paths relative to root."""
+    (root / "img").mkdir(parents=True, exist_ok=True)
+    for i in range(20):
+        (root / "img" / f"{i}.svg").write_text(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="64" height="64">'
+            f'<rect width="64" height="64" fill="#{i * 12345 % 0xFFFFFF:06x}"/></svg>')
+    pages = {
+        "blank.html": "<!doctype html><title>blank</title>",
+        "text.html": "<!doctype html><title>text</title>"
+                     + "".join(f"<p>{_LOREM * 8}</p>" for _ in range(100)),
+        "images.html": "<!doctype html><title>images</title>"
+                       + "".join(f'<img src="img/{i}.svg" width="64" height="64">' for i in range(20)),
+        "dom.html": "<!doctype html><title>dom</title><div id=root></div><script>"
+                    "var r = document.getElementById('root');"
+                    "for (var i = 0; i < 5000; i++) { var d = document.createElement('div');"
+                    "d.textContent = 'row ' + i; r.appendChild(d); }</script>",
+        "table.html": "<!doctype html><title>table</title><table>"
+                      + "".join(f"<tr><td>{i}</td><td>{_LOREM[:40]}</td><td>{i * i}</td></tr>" for i in range(2000))
+                      + "</table>",
+    }
+    for name, html in pages.items():
+        (root / name).write_text(html, encoding="utf-8")
+    return [p for p in pages if p != "blank.html"]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(root: Path) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _wait(app, done, timeout_ms: int) -> bool:
+    """Process events until done() or the timeout; True if done() became true."""
+    deadline = time.monotonic() + timeout_ms / 1000
+    while not done():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.001)
+    return True
+
+
+def _settle(app, ms: int):
+    _wait(app, lambda: False, ms)
+
+
+def _renderer_pids(window) -> set:
+    pids = set()
+    for i in range(window.tabs.count()):
+        tab = window.tabs.widget(i)
+        if hasattr(tab, "view"):
+            pid = tab.view.page().renderProcessPid()
+            if pid > 0:
+                pids.add(pid)
+    return pids
+
+
+def _descendants_rss_mb(rss_mb) -> float:
+    """Resident memory of every descendant process (zygotes, renderers, GPU), from /proc."""
+    children = {}
+    for d in Path("/proc").iterdir():
+        if not d.name.isdigit():
+            continue
+        try:
+            ppid = int((d / "stat").read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(d.name))
+    total = 0.0
+    stack = list(children.get(os.getpid(), ()))
+    while stack:
+        pid = stack.pop()
+        total += max(rss_mb(pid), 0.0)
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+def run(n_tabs: int, preset: str = "default") -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["APPDATA"] = str(Path(tmp.name) / "appdata")
+    # Only takes effect if the web engine has not started yet in this process
+    apply_preset(preset)
+
+    from PyQt6.QtWidgets import QApplication
+    from copper_browser.browser_window import MainWindow
+    from copper_browser.config import Config
+    from copper_browser.tab_lifecycle import rss_mb
+
+    site = Path(tmp.name) / "site"
+    pages = write_fixtures(site)
+    server = serve(site)
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    config = Config(homepage=base + "blank.html", profile="bench", restore_session=False,
+                    fulltext_index=False, tab_hibernation=False, prerender=False,
+                    content_blocking=False, nav_timing=False, engine_preset=preset)
+    window = MainWindow(config)
+    window.show()
+    window.start()
+    first = window.current_tab()
+    loaded = {}
+    first.view.loadFinished.connect(lambda ok: loaded.setdefault(first, ok))
+    _wait(app, lambda: first in loaded, LOAD_TIMEOUT_MS)
+    _settle(app, 500)
+
+    base_browser = rss_mb(os.getpid())
+    base_renderers = _descendants_rss_mb(rss_mb)
+
+    new_tab_ms, load_ms, failed = [], [], 0
+    for i in range(n_tabs):
+        url = base + pages[i % len(pages)]
+        done = {}
+        t0 = time.perf_counter()
+        window.new_tab(url)
+        new_tab_ms.append((time.perf_counter() - t0) * 1000)
+        tab = window.current_tab()
+        tab.view.loadFinished.connect(lambda ok, d=done: d.setdefault("ok", ok))
+        if _wait(app, lambda: "ok" in done, LOAD_TIMEOUT_MS) and done["ok"]:
+            load_ms.append((time.perf_counter() - t0) * 1000)
+        else:
+            failed += 1
+    _settle(app, 500)
+
+    renderers = len(_renderer_pids(window))
+    open_browser = rss_mb(os.getpid())
+    open_renderers = _descendants_rss_mb(rss_mb)
+
+    t0 = time.perf_counter()
+    while window.tabs.count() > 1:
+        window.close_tab(window.tabs.count() - 1)
+    close_ms = (time.perf_counter() - t0) * 1000
+    _settle(app, SETTLE_MS)
+    closed_browser = rss_mb(os.getpid())
+    closed_renderers = _descendants_rss_mb(rss_mb)
+
+    window.close()
+    server.shutdown()
+    _settle(app, 200)
+    tmp.cleanup()
+
+    grown = (open_browser + open_renderers) - (base_browser + base_renderers)
+    back = (open_browser + open_renderers) - (closed_browser + closed_renderers)
+    load_ms.sort()
+    return {
+        "tabs": n_tabs,
+        "failed_loads": failed,
+        "renderer_processes": renderers,
+        "new_tab_ms": sum(new_tab_ms) / len(new_tab_ms) if new_tab_ms else 0.0,
+        "load_p50_ms": load_ms[len(load_ms) // 2] if load_ms else 0.0,
+        "load_max_ms": load_ms[-1] if load_ms else 0.0,
+        "per_tab_mb": grown / n_tabs if n_tabs else 0.0,
+        "renderer_per_tab_mb": (open_renderers - base_renderers) / n_tabs if n_tabs else 0.0,
+        "close_all_ms": close_ms,
+        "reclaimed_ratio": back / grown if grown > 0 else 0.0,
+    }
+
+
+def check_targets(preset: str, results: dict) -> list:
+    """(metric, op, target, value, met) for each target of the preset."""
+    rows = []
+    for metric, op, target in PRESETS[preset].targets:
+        value = results.get(metric)
+        if value is not None:
+            rows.append((metric, op, target, value, value <= target if op == "<=" else value >= target))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless tab/page-load benchmark")
+    ap.add_argument("--tabs", type=int, default=10)
+    ap.add_argument("--preset", choices=sorted(PRESETS), default="default",
+                    help="engine preset to run with (engine_presets.PRESETS)")
+    args = ap.parse_args()
+    r = run(args.tabs, args.preset)
+    for k, v in r.items():
+        print(f"{k:>20}: {v:.3f}" if isinstance(v, float) else f"{k:>20}: {v}")
+    for metric, op, target, value, met in check_targets(args.preset, r):
+        print(f"target {metric} {op} {target:g}: {value:.3f} {'ok' if met else 'MISSED'}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,276 @@
+"""
+Runs the benchmarks with fixed, release-sized parameters and writes one
+machine-readable JSON file; with --baseline, compares against an earlier
+file and exits non-zero on regressions. Each benchmark runs --repeat
+times and the best value of every metric is kept.
+
+    python -m copper_browser.benchmarks.suite --out bench.json
+    python -m copper_browser.benchmarks.suite --out new.json --baseline release.json
+    python -m copper_browser.benchmarks.suite --compare release.json new.json
+
+Metric names carry their direction: *_us, *_ms, *_s and *_mb are costs
+(lower is better), *_ratio and *_per_s are rates (higher is better);
+anything else (counts) is informational and never compared.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# A metric this much worse than its baseline counts as a regression
+DEFAULT_TOLERANCE = 0.10
+
+# Each benchmark runs this many times; the best value of each metric is kept
+DEFAULT_REPEAT = 3
+
+# Costs below this are timer noise and are not compared
+NOISE_FLOOR = {"_us": 0.05, "_ms": 0.5, "_s": 0.001, "_mb": 1.0}
+
+_COST_SUFFIXES = ("_us", "_ms", "_s", "_mb")
+_RATE_SUFFIXES = ("_ratio", "_per_s")
+
+
+def _storage():
+    from . import bench_storage
+    return bench_storage.run((1_000, 10_000, 100_000, 1_000_000))
+
+
+def _storage_quick():
+    from . import bench_storage
+    return bench_storage.run((1_000, 10_000))
+
+
+def _history():
+    from . import bench_history
+    return bench_history.run(200_000, 20_000, True)
+
+
+def _bookmarks():
+    from . import bench_bookmarks
+    return bench_bookmarks.run(100_000, 500)
+
+
+def _completion():
+    from . import bench_completion
+    return bench_completion.run(200_000, 20)
+
+
+def _adblock():
+    from . import bench_adblock
+    return bench_adblock.run([], [], 60_000)
+
+
+def _downloads():
+    from . import bench_downloads
+    return bench_downloads.run(64, 4, 4096)
+
+
+def _downloads_quick():
+    from . import bench_downloads
+    return bench_downloads.run(8, 2, 2048)
+
+
+def _snapshots():
+    from . import bench_snapshots
+    return bench_snapshots.run(2000, 20_000, 64)
+
+
+def _render():
+    from . import bench_render
+    return bench_render.run(40, 4)
+
+
+def _suggest():
+    from . import bench_suggest
+    return bench_suggest.run(200)
+
+
+def _icons():
+    from . import bench_icons
+    return bench_icons.run(5000, 100_000)
+
+
+def _instance():
+    from . import bench_instance
+    return bench_instance.run(200, 10)
+
+
+def _tabs():
+    from . import bench_tabs
+    return bench_tabs.run(10)
+
+
+# name -> benchmark; "tabs" and "render" need QtWebEngine, "suggest" and "icons" other Qt
+# modules, the rest are pure Python. The Qt ones run after "tabs", which has to create the
+# QApplication itself; "instance" runs its Qt side in child processes.
+BENCHMARKS: Dict[str, Callable[[], dict]] = {
+    "storage": _storage,
+    "history": _history,
+    "bookmarks": _bookmarks,
+    "completion": _completion,
+    "adblock": _adblock,
+    "downloads": _downloads,
+    "snapshots": _snapshots,
+    "tabs": _tabs,
+    "render": _render,
+    "suggest": _suggest,
+    "icons": _icons,
+    "instance": _instance,
+}
+
+# Small sizes for a quick pre-commit check
+QUICK: Dict[str, Callable[[], dict]] = {"storage": _storage_quick, "downloads": _downloads_quick}
+
+
+def direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not compared."""
+    if metric.endswith(_RATE_SUFFIXES):
+        return 1
+    if metric.endswith(_COST_SUFFIXES):
+        return -1
+    return 0
+
+
+def _numeric(results: dict) -> dict:
+    """Numbers only; a dict of them ({"git": 12.0} under "suggest_us") becomes "suggest[git]_us"."""
+    out = {}
+    for k, v in results.items():
+        if isinstance(v, dict):
+            stem, suffix = k, ""
+            for s in _COST_SUFFIXES + _RATE_SUFFIXES:
+                if k.endswith(s):
+                    stem, suffix = k[:-len(s)], s
+                    break
+            out.update(_numeric({f"{stem}[{sub}]{suffix}": x for sub, x in v.items()}))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[k] = v
+    return out
+
+
+def _best(runs: List[dict]) -> dict:
+    """Per metric, the best of several runs (least disturbed by other load)."""
+    out = dict(runs[0])
+    for r in runs[1:]:
+        for k, v in r.items():
+            d = direction(k)
+            if k not in out or d == 0:
+                out.setdefault(k, v)
+            elif d < 0:
+                out[k] = min(out[k], v)
+            else:
+                out[k] = max(out[k], v)
+    return out
+
+
+def run(names: List[str], quick: bool = False, repeat: int = DEFAULT_REPEAT) -> dict:
+    results, errors = {}, {}
+    for name in names:
+        fn = QUICK.get(name, BENCHMARKS[name]) if quick else BENCHMARKS[name]
+        print(f"running {name}…", file=sys.stderr, flush=True)
+        t0 = time.perf_counter()
+        try:
+            results[name] = _best([_numeric(fn()) for _ in range(max(1, repeat))])
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        print(f"  {name}: {time.perf_counter() - t0:.1f} s", file=sys.stderr, flush=True)
+    return {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": results,
+        "errors": errors,
+    }
+
+
+def compare(baseline: dict, current: dict) -> List[Tuple]:
+    """
+    (benchmark, metric, baseline, current, change) for every comparable
+    metric present in both; change is relative, positive means worse.
+    """
+    rows = []
+    for bench, metrics in current.get("results", {}).items():
+        base = baseline.get("results", {}).get(bench, {})
+        for metric, value in metrics.items():
+            d = direction(metric)
+            old = base.get(metric)
+            if d == 0 or old is None:
+                continue
+            floor = next((f for s, f in NOISE_FLOOR.items() if metric.endswith(s)), 0.0)
+            if d < 0 and max(old, value) < floor:
+                continue
+            if old == 0:
+                continue
+            change = (value - old) / abs(old) * (-d)
+            rows.append((bench, metric, old, value, change))
+    return rows
+
+
+def report(rows: List[Tuple], tolerance: float) -> int:
+    """Print the comparison; returns the number of regressions."""
+    regressions = 0
+    for bench, metric, old, new, change in sorted(rows, key=lambda r: -r[4]):
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -tolerance:
+            flag = "  improved"
+        print(f"{bench:>10} {metric:<32} {old:>12.3f} -> {new:>12.3f}  {change:+7.1%}{flag}")
+    print(f"{len(rows)} metrics compared, {regressions} regressions (tolerance {tolerance:.0%})")
+    return regressions
+
+
+def _load(path: Path) -> dict:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark suite with JSON output and baseline comparison")
+    ap.add_argument("--only", default="", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    ap.add_argument("--skip", default="", help="comma-separated benchmarks to leave out")
+    ap.add_argument("--quick", action="store_true", help="small sizes, for a fast sanity run")
+    ap.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                    help="runs per benchmark; the best value of each metric is kept")
+    ap.add_argument("--out", type=Path, help="write results here (default: stdout)")
+    ap.add_argument("--baseline", type=Path, help="compare the new results against this file")
+    ap.add_argument("--compare", type=Path, nargs=2, metavar=("BASELINE", "CURRENT"),
+                    help="compare two result files without running anything")
+    ap.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                    help="relative change counted as a regression (default 0.10)")
+    args = ap.parse_args()
+
+    if args.compare:
+        sys.exit(1 if report(compare(_load(args.compare[0]), _load(args.compare[1])), args.tolerance) else 0)
+
+    names = [n for n in (args.only.split(",") if args.only else BENCHMARKS) if n]
+    skip = set(filter(None, args.skip.split(",")))
+    unknown = [n for n in names + list(skip) if n not in BENCHMARKS]
+    if unknown:
+        ap.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    current = run([n for n in names if n not in skip], args.quick, args.repeat)
+
+    text = json.dumps(current, indent=2, sort_keys=True)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    failed = bool(current["errors"])
+    if args.baseline:
+        failed |= report(compare(_load(args.baseline), current), args.tolerance) > 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
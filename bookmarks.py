@@ -1,13 +1,21 @@
 import os
 import json
-from dataclasses import dataclass, asdict
-from typing import List
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Union
 
-# --- Path under AppData\Roaming\CopperBrowserV1 ---
-APPDATA_DIR = os.path.join(os.environ["APPDATA"], "CopperBrowserV1")
-os.makedirs(APPDATA_DIR, exist_ok=True)
+from .storage import JsonLinesLog, app_root, log_file
 
-BOOKMARKS_FILE = os.path.join(APPDATA_DIR, "bookmarks.json")
+# Legacy flat bookmarks.json under AppData\Roaming\CopperBrowserV1; migrated
+# into the profile's bookmark log on first load
+LEGACY_BOOKMARKS_NAME = "bookmarks.json"
+
+# The implicit top-level folder; it is never stored
+ROOT_ID = 0
+
+# Rewrite the log once it holds this many stale lines and more stale than live ones
+COMPACT_MIN_STALE = 1000
 
 
 @dataclass
@@ -15,54 +23,323 @@ class Bookmark:
     id: int
     name: str
     url: str
+    parent: int = ROOT_ID
+    added: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {"op": "add", "id": self.id, "name": self.name, "url": self.url,
+                "parent": self.parent, "added": self.added}
+
+
+@dataclass
+class Folder:
+    id: int
+    name: str
+    parent: int = ROOT_ID
+
+    def to_dict(self) -> dict:
+        return {"op": "folder", "id": self.id, "name": self.name, "parent": self.parent}
+
+
+Node = Union[Bookmark, Folder]
 
 
 class Bookmarks:
-    def __init__(self):
-        self.items: List[Bookmark] = []
+    """
+    Bookmarks and folders indexed by id and by URL, so lookup, delete and
+    is_bookmarked() are O(1). Each folder keeps its children in insertion
+    order (a dict used as an ordered set).
+
+    Changes are appended to a JSON-lines log ({"op": "add" | "folder" | "del"});
+    like History, the log is read on first use and written by persist().
+    """
+
+    def __init__(self, log: Optional[JsonLinesLog] = None):
+        self._log = log
+        self._loaded = log is None
+        self._bookmarks: Dict[int, Bookmark] = {}
+        self._folders: Dict[int, Folder] = {}
+        self._children: Dict[int, Dict[int, None]] = {ROOT_ID: {}}
+        self._by_url: Dict[str, Dict[int, None]] = {}
         self._next_id = 1
+        self._lines = 0  # records currently in the log
+        # Lets worker threads load and write the log while the GUI thread keeps editing.
+        # Disk writes hold only _io_lock (taken before _lock), so edits never wait on them
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
 
-    def add(self, name: str, url: str):
-        """Add a new bookmark."""
-        b = Bookmark(self._next_id, name, url)
-        self.items.append(b)
-        self._next_id += 1
+    # --- Loading ---
+    def _ensure_loaded(self):
+        """Bookmarks are read from the log on first access, not at startup."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
 
-    def list(self) -> List[Bookmark]:
-        """Return all bookmarks."""
-        return self.items
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def _load(self):
+        for rec in self._log.read():
+            self._lines += 1
+            try:
+                self._replay(rec)
+            except (KeyError, TypeError, ValueError):
+                continue
+        self._loaded = True
+
+    def _replay(self, rec: dict):
+        op = rec["op"]
+        if op == "add":
+            self._insert(Bookmark(int(rec["id"]), rec.get("name", ""), rec["url"],
+                                  int(rec.get("parent", ROOT_ID)), float(rec.get("added", 0.0))))
+        elif op == "folder":
+            self._insert(Folder(int(rec["id"]), rec.get("name", ""), int(rec.get("parent", ROOT_ID))))
+        elif op == "del":
+            self._remove(int(rec["id"]))
+
+    # --- Index maintenance (caller holds the lock; nothing is logged) ---
+    def _insert(self, node: Node):
+        if node.parent not in self._children:
+            node.parent = ROOT_ID  # parent lost from a torn log; keep the node reachable
+        if isinstance(node, Folder):
+            self._folders[node.id] = node
+            self._children.setdefault(node.id, {})
+        else:
+            self._bookmarks[node.id] = node
+            self._by_url.setdefault(node.url, {})[node.id] = None
+        self._children[node.parent][node.id] = None
+        self._next_id = max(self._next_id, node.id + 1)
+
+    def _remove(self, id_: int) -> Optional[Node]:
+        node = self._bookmarks.pop(id_, None)
+        if node is not None:
+            ids = self._by_url.get(node.url)
+            if ids is not None:
+                ids.pop(id_, None)
+                if not ids:
+                    del self._by_url[node.url]
+        else:
+            node = self._folders.pop(id_, None)
+            if node is None:
+                return None
+            # Iterative, so deeply nested imports cannot hit the recursion limit
+            stack = [id_]
+            while stack:
+                for child in self._children.pop(stack.pop(), {}):
+                    b = self._bookmarks.pop(child, None)
+                    if b is not None:
+                        ids = self._by_url.get(b.url)
+                        if ids is not None:
+                            ids.pop(child, None)
+                            if not ids:
+                                del self._by_url[b.url]
+                    elif self._folders.pop(child, None) is not None:
+                        stack.append(child)
+        self._children.get(node.parent, {}).pop(id_, None)
+        return node
+
+    def _record(self, rec: dict):
+        if self._log is not None:
+            self._log.append(rec)
+            self._lines += 1
+
+    # --- Editing ---
+    def add(self, name: str, url: str, parent: int = ROOT_ID, added: Optional[float] = None) -> Bookmark:
+        """Add a new bookmark to folder `parent` (the top level by default)."""
+        self._ensure_loaded()
+        with self._lock:
+            if parent not in self._folders:
+                parent = ROOT_ID
+            b = Bookmark(self._next_id, name, url, parent, time.time() if added is None else added)
+            self._insert(b)
+            self._record(b.to_dict())
+        return b
+
+    def add_folder(self, name: str, parent: int = ROOT_ID) -> Folder:
+        """Add a new, empty folder."""
+        self._ensure_loaded()
+        with self._lock:
+            if parent not in self._folders:
+                parent = ROOT_ID
+            f = Folder(self._next_id, name, parent)
+            self._insert(f)
+            self._record(f.to_dict())
+        return f
 
     def delete(self, id_: int) -> bool:
-        """Delete a bookmark by ID."""
-        for i, b in enumerate(self.items):
-            if b.id == id_:
-                del self.items[i]
-                return True
-        return False
-
-
-def load_bookmarks() -> Bookmarks:
-    """Load bookmarks from JSON file into a Bookmarks object."""
-    b = Bookmarks()
-    if os.path.exists(BOOKMARKS_FILE):
-        try:
-            with open(BOOKMARKS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                for item in data:
-                    bm = Bookmark(**item)
-                    b.items.append(bm)
-                    b._next_id = max(b._next_id, bm.id + 1)
-        except Exception:
-            # If file is corrupt/unreadable, start fresh
-            pass
-    return b
-
-
-def save_bookmarks(bookmarks: Bookmarks):
-    """Save bookmarks to JSON file."""
+        """Delete a bookmark, or a folder with everything in it, by ID."""
+        self._ensure_loaded()
+        with self._lock:
+            if self._remove(id_) is None:
+                return False
+            self._record({"op": "del", "id": id_})
+        return True
+
+    # --- Lookup ---
+    def get(self, id_: int) -> Optional[Bookmark]:
+        self._ensure_loaded()
+        return self._bookmarks.get(id_)
+
+    def folder(self, id_: int) -> Optional[Folder]:
+        self._ensure_loaded()
+        return self._folders.get(id_)
+
+    def is_bookmarked(self, url: str) -> bool:
+        self._ensure_loaded()
+        return url in self._by_url
+
+    def find(self, url: str) -> List[Bookmark]:
+        """All bookmarks of `url` (it may be bookmarked in several folders)."""
+        self._ensure_loaded()
+        return [self._bookmarks[i] for i in list(self._by_url.get(url, ()))]
+
+    def children(self, folder_id: int = ROOT_ID) -> List[Node]:
+        """Direct children of a folder, in the order they were added."""
+        self._ensure_loaded()
+        with self._lock:
+            ids = list(self._children.get(folder_id, ()))
+        return [self._bookmarks.get(i) or self._folders[i] for i in ids]
+
+    def folder_path(self, folder_id: int) -> str:
+        """Slash-separated folder names down to `folder_id`; "" for the top level."""
+        self._ensure_loaded()
+        names = []
+        f = self._folders.get(folder_id)
+        while f is not None and len(names) < 256:
+            names.append(f.name)
+            f = self._folders.get(f.parent)
+        return "/".join(reversed(names))
+
+    def walk(self, folder_id: int = ROOT_ID) -> Iterator[tuple]:
+        """
+        Depth-first ("open", Folder), ("link", Bookmark) and ("close", Folder)
+        events for everything under a folder, without recursion.
+        """
+        for node in self.children(folder_id):
+            if isinstance(node, Bookmark):
+                yield "link", node
+                continue
+            yield "open", node
+            stack = [(node, iter(self.children(node.id)))]
+            while stack:
+                child = next(stack[-1][1], None)
+                if child is None:
+                    yield "close", stack.pop()[0]
+                elif isinstance(child, Bookmark):
+                    yield "link", child
+                else:
+                    yield "open", child
+                    stack.append((child, iter(self.children(child.id))))
+
+    def list(self) -> List[Bookmark]:
+        """Return all bookmarks (not folders), oldest first."""
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._bookmarks.values())
+
+    def folders(self) -> List[Folder]:
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._folders.values())
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._bookmarks)
+
+    # --- Persistence ---
+    def persist(self):
+        """Write buffered changes, compacting the log instead if that is due."""
+        if self._log is None:
+            return
+        with self._io_lock:
+            # The records are taken under the lock and written outside it;
+            # a compaction snapshot includes every buffered change
+            snapshot = None
+            with self._lock:
+                lines = self._lines
+                taken = self._log.take()
+                live = len(self._bookmarks) + len(self._folders)
+                stale = self._lines - live
+                if self._loaded and stale >= COMPACT_MIN_STALE and stale > live:
+                    snapshot = self._snapshot()
+                    self._lines = len(snapshot)
+            try:
+                if snapshot is not None:
+                    self._log.rewrite(snapshot)
+                else:
+                    self._log.write(taken)
+            except BaseException:
+                with self._lock:
+                    self._log.pending[:0] = taken  # retried by the next persist()
+                    if snapshot is not None:
+                        self._lines += lines - len(snapshot)
+                raise
+
+    def _snapshot(self) -> List[dict]:
+        # Caller holds the lock. Folders are written before their contents.
+        records = []
+        stack = [ROOT_ID]
+        while stack:
+            for id_ in self._children.get(stack.pop(), ()):
+                if id_ in self._folders:
+                    records.append(self._folders[id_].to_dict())
+                    stack.append(id_)
+                else:
+                    records.append(self._bookmarks[id_].to_dict())
+        return records
+
+    def close(self):
+        """Write any buffered changes and close the log."""
+        if self._log is None:
+            return
+        with self._io_lock, self._lock:
+            try:
+                self._log.flush()
+            except OSError:
+                pass  # Fail silently; the profile is not writable
+            self._log.close()
+
+
+def _migrate_legacy(log: JsonLinesLog):
+    """One-time import of the old bookmarks.json into the log; the old file is kept as .bak."""
+    legacy = app_root() / LEGACY_BOOKMARKS_NAME
+    if log.exists() or not legacy.exists():
+        return
+    try:
+        with legacy.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        ts = legacy.stat().st_mtime
+        records = [{"op": "add", "id": int(item["id"]), "name": item.get("name", ""),
+                    "url": item["url"], "parent": ROOT_ID, "added": ts} for item in data]
+    except Exception:
+        # If file is corrupt or unreadable, start fresh
+        records = []
+    log.rewrite(records)
+    try:
+        os.replace(legacy, legacy.with_name(legacy.name + ".bak"))
+    except OSError:
+        pass
+
+
+def load_bookmarks(profile: str = "default") -> Bookmarks:
+    """Open the profile's bookmark log; it is read lazily on first use."""
+    log = JsonLinesLog(log_file("bookmarks", profile))
+    _migrate_legacy(log)
+    return Bookmarks(log)
+
+
+def save_bookmarks(bookmarks: Bookmarks, writer=None):
+    """
+    Write buffered changes (compacting the log if due). With a PersistenceWriter
+    this happens on its thread and a burst of edits (or an import) shares one write.
+    """
+    if writer is not None:
+        writer.submit(f"bookmarks-{id(bookmarks)}", bookmarks.persist)
+        return
     try:
-        with open(BOOKMARKS_FILE, "w", encoding="utf-8") as f:
-            json.dump([asdict(b) for b in bookmarks.items], f, indent=2)
+        bookmarks.persist()
     except Exception:
         # Fail silently if file cannot be written
         pass
\ No newline at end of file
@@ -0,0 +1,393 @@
+"""
+Bookmark import and export: Netscape bookmark HTML (every browser's
+"Export bookmarks" format) and Chromium's Bookmarks JSON file.
+
+Everything here is a generator, so a caller can run it a slice at a time
+(browser_dialogs.BatchJob) and keep the UI responsive through 100k+ entries.
+Readers yield events:
+
+    ("open", name)              a folder starts
+    ("link", name, url, added)  a bookmark; `added` in seconds since the epoch
+    ("close",)                  the innermost open folder ends
+    ("wait",)                   nothing yet; the reader is still decoding
+"""
+import html
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Iterator
+
+from .bookmarks import ROOT_ID, Bookmarks, Folder
+
+# Characters of HTML handed to the scanner per step
+READ_CHUNK = 16 * 1024
+
+# Characters of Chromium JSON read per step, and JSON values decoded per step
+JSON_READ_CHUNK = 1024 * 1024
+JSON_VALUES_PER_STEP = 500
+
+# An object or array that closes within this many characters and holds no
+# other container is decoded in one call
+JSON_FLAT_LOOKAHEAD = 4096
+
+# Chromium timestamps count microseconds from 1601-01-01
+_CHROMIUM_EPOCH_S = 11_644_473_600
+
+# Top-level folders of a Chromium Bookmarks file, in its own order
+_CHROMIUM_ROOTS = (("bookmark_bar", "Bookmarks bar"), ("other", "Other bookmarks"),
+                   ("synced", "Mobile bookmarks"))
+
+
+def detect_format(path: Path) -> str:
+    """"netscape" or "chromium", by extension and then by the first bytes."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".html", ".htm"):
+        return "netscape"
+    if suffix == ".json":
+        return "chromium"
+    with open(path, "rb") as f:
+        head = f.read(512).lstrip()
+    return "chromium" if head.startswith(b"{") else "netscape"
+
+
+# --- Netscape bookmark HTML ---
+# The format is regular enough for a regex scanner, which is
+# about twice as fast as html.parser on 100k-entry files
+_TAG = re.compile(r"""<(/?)([a-zA-Z0-9]+)((?:[^>"']|"[^"]*"|'[^']*')*)>""")
+_ATTR = re.compile(r"""([a-zA-Z_:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+
+
+class _NetscapeScanner:
+    """
+    Turns the tag soup into events. <H3> names the folder whose <DL> follows;
+    a <DL> without one (the outermost list) is not a folder.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._buf = ""
+        self._dl = []            # per open <DL>: does it close a folder?
+        self._text = None        # text of the open <A> or <H3>
+        self._link = None        # (url, added) of the open <A>
+        self._folder = None      # name of an <H3> waiting for its <DL>
+
+    def feed(self, data: str):
+        buf = self._buf + data
+        pos = 0
+        for m in _TAG.finditer(buf):
+            if self._text is not None and m.start() > pos:
+                self._text.append(buf[pos:m.start()])
+            pos = m.end()
+            self._tag(m.group(2).lower(), m.group(1) == "/", m.group(3))
+        # Keep an unfinished tag for the next chunk
+        cut = buf.find("<", pos)
+        if cut < 0:
+            cut = len(buf)
+        if self._text is not None and cut > pos:
+            self._text.append(buf[pos:cut])
+        self._buf = buf[cut:]
+
+    def _tag(self, tag: str, closing: bool, attrs: str):
+        if not closing:
+            if tag == "a":
+                a = {m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ""
+                     for m in _ATTR.finditer(attrs)}
+                self._link = (html.unescape(a.get("href", "")), _seconds(a.get("add_date")))
+                self._text = []
+            elif tag == "h3":
+                self._text = []
+            elif tag == "dl":
+                opens = self._folder is not None
+                if opens:
+                    self.events.append(("open", self._folder))
+                    self._folder = None
+                self._dl.append(opens)
+        elif tag == "a" and self._link is not None:
+            url, added = self._link
+            name = html.unescape("".join(self._text)).strip()
+            if url:
+                self.events.append(("link", name or url, url, added))
+            self._link = self._text = None
+        elif tag == "h3" and self._text is not None:
+            self._folder = html.unescape("".join(self._text)).strip()
+            self._text = None
+        elif tag == "dl" and self._dl:
+            if self._dl.pop():
+                self.events.append(("close",))
+
+
+def _seconds(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def iter_netscape(path: Path) -> Iterator[tuple]:
+    """Events of a Netscape bookmark file, scanned READ_CHUNK characters at a time."""
+    scanner = _NetscapeScanner()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            scanner.feed(chunk)
+            yield from scanner.events
+            scanner.events.clear()
+    # Unclosed folders in a truncated file
+    for opens in scanner._dl:
+        if opens:
+            yield ("close",)
+
+
+def export_netscape(bookmarks: Bookmarks, path: Path) -> Iterator[int]:
+    """Write every bookmark as Netscape HTML; yields the number written so far."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    n = 0
+    depth = 1
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+                '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+                "<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n")
+        for event, node in bookmarks.walk():
+            pad = "    " * depth
+            if event == "link":
+                f.write(f'{pad}<DT><A HREF="{html.escape(node.url)}" ADD_DATE="{int(node.added)}">'
+                        f"{html.escape(node.name)}</A>\n")
+                n += 1
+                yield n
+            elif event == "open":
+                f.write(f"{pad}<DT><H3>{html.escape(node.name)}</H3>\n{pad}<DL><p>\n")
+                depth += 1
+            else:
+                depth -= 1
+                f.write(f"{'    ' * depth}</DL><p>\n")
+        f.write("</DL><p>\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# --- Chromium Bookmarks JSON ---
+def _chromium_time(value) -> float:
+    try:
+        us = int(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, us / 1e6 - _CHROMIUM_EPOCH_S) if us else 0.0
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+_WAIT = ("wait",)
+
+
+def _json_key(text: str, pos: int, decode) -> tuple:
+    key, pos = decode(text, pos)
+    if not isinstance(key, str):
+        raise ValueError(f"Expecting property name at char {pos}")
+    pos = _WS.match(text, pos).end()
+    if text[pos:pos + 1] != ":":
+        raise ValueError(f"Expecting ':' delimiter at char {pos}")
+    return key, _WS.match(text, pos + 1).end()
+
+
+def _decode_stepwise(text: str) -> Iterator[tuple]:
+    """
+    json.loads(text), yielding ("wait",) every JSON_VALUES_PER_STEP values;
+    the document is the generator's return value. The C decoder does the
+    scalars and the small flat objects (a Chromium bookmark), so only the
+    nesting is walked here.
+    """
+    decode = json.JSONDecoder().raw_decode
+    ws = _WS.match
+    stack = []  # per open container: [container, key its next value goes under]
+    n = 0
+    pos = ws(text, 0).end()
+    while True:
+        ch = text[pos:pos + 1]
+        if ch == "{" or ch == "[":
+            close = "}" if ch == "{" else "]"
+            end = text.find(close, pos + 1, pos + JSON_FLAT_LOOKAHEAD)
+            if end >= 0 and text.find("{", pos + 1, end) < 0 and text.find("[", pos + 1, end) < 0:
+                value, pos = decode(text, pos)
+            else:
+                stack.append([{} if ch == "{" else [], None])
+                pos = ws(text, pos + 1).end()
+                if text.startswith(close, pos):
+                    value = stack.pop()[0]
+                    pos += 1
+                else:
+                    if ch == "{":
+                        stack[-1][1], pos = _json_key(text, pos, decode)
+                    continue
+        else:
+            value, pos = decode(text, pos)
+        # Attach the value, and any containers it completes, to their parents
+        while True:
+            n += 1
+            if n % JSON_VALUES_PER_STEP == 0:
+                yield _WAIT
+            if not stack:
+                if text[ws(text, pos).end():].strip():
+                    raise ValueError(f"Extra data at char {pos}")
+                return value
+            container, key = stack[-1]
+            if key is None:
+                container.append(value)
+            else:
+                container[key] = value
+            pos = ws(text, pos).end()
+            ch = text[pos:pos + 1]
+            if ch == ",":
+                pos = ws(text, pos + 1).end()
+                if key is not None:
+                    stack[-1][1], pos = _json_key(text, pos, decode)
+                break
+            if ch != ("]" if key is None else "}"):
+                raise ValueError(f"Expecting ',' delimiter at char {pos}")
+            value = stack.pop()[0]
+            pos += 1
+
+
+def iter_chromium(path: Path) -> Iterator[tuple]:
+    """
+    Events of a Chromium Bookmarks file. The stdlib has no incremental JSON
+    parser and json.load holds the GIL throughout, so the file is read and
+    decoded a slice at a time here (see _decode_stepwise); the tree is then
+    walked without recursion, one event per step.
+    """
+    chunks = []
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(JSON_READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            yield _WAIT
+    text = "".join(chunks)
+    del chunks
+    yield _WAIT
+    data = yield from _decode_stepwise(text)
+    del text
+    roots = data.get("roots", {}) if isinstance(data, dict) else {}
+    for key, default_name in _CHROMIUM_ROOTS:
+        root = roots.get(key)
+        if not isinstance(root, dict) or not root.get("children"):
+            continue
+        yield ("open", root.get("name") or default_name)
+        stack = [iter(root["children"])]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                yield ("close",)
+            elif not isinstance(node, dict):
+                continue
+            elif node.get("type") == "folder":
+                yield ("open", node.get("name", ""))
+                stack.append(iter(node.get("children") or ()))
+            elif node.get("url"):
+                yield ("link", node.get("name") or node["url"], node["url"],
+                       _chromium_time(node.get("date_added")))
+
+
+def export_chromium(bookmarks: Bookmarks, path: Path) -> Iterator[int]:
+    """
+    Write every bookmark as a Chromium Bookmarks file (all under
+    "Bookmarks bar"), node by node; yields the number written so far.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    now = str(int((time.time() + _CHROMIUM_EPOCH_S) * 1e6))
+    n = 0
+    next_id = 4  # 1-3 are the roots
+    first = [True]  # per open children list: nothing written yet?
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write('{"roots": {"bookmark_bar": {"type": "folder", "id": "1", "name": "Bookmarks bar", '
+                f'"date_added": "{now}", "children": [')
+        for event, node in bookmarks.walk():
+            if event == "close":
+                f.write("]}")
+                first.pop()
+                continue
+            if not first[-1]:
+                f.write(", ")
+            first[-1] = False
+            if event == "link":
+                added = str(int((node.added + _CHROMIUM_EPOCH_S) * 1e6)) if node.added else now
+                f.write(json.dumps({"type": "url", "id": str(next_id), "name": node.name,
+                                    "url": node.url, "date_added": added}, ensure_ascii=False))
+                n += 1
+                yield n
+            else:
+                f.write(f'{{"type": "folder", "id": "{next_id}", "name": '
+                        f'{json.dumps(node.name, ensure_ascii=False)}, "date_added": "{now}", "children": [')
+                first.append(True)
+            next_id += 1
+        f.write(']}, "other": {"type": "folder", "id": "2", "name": "Other bookmarks", "children": []}, '
+                '"synced": {"type": "folder", "id": "3", "name": "Mobile bookmarks", "children": []}}, '
+                '"version": 1}\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# --- Import / export entry points ---
+def read_events(path: Path) -> Iterator[tuple]:
+    return iter_chromium(path) if detect_format(path) == "chromium" else iter_netscape(path)
+
+
+def import_events(bookmarks: Bookmarks, events: Iterator[tuple], parent: int = ROOT_ID,
+                  skip_existing: bool = True) -> Iterator[int]:
+    """
+    Add the bookmarks and folders described by `events` under folder `parent`;
+    yields the number of bookmarks added so far. With skip_existing, URLs that
+    are already bookmarked are left out and folders of the same name are merged,
+    so importing a file twice is harmless.
+    """
+    # Per open folder: [name, id]; the id stays None until a bookmark lands in
+    # it, so folders whose links were all skipped are never created
+    stack = [[None, parent]]
+    n = 0
+    for ev in events:
+        kind = ev[0]
+        if kind == "link":
+            _, name, url, added = ev
+            if skip_existing and bookmarks.is_bookmarked(url):
+                continue
+            bookmarks.add(name, url, _folder_id(bookmarks, stack, skip_existing), added or None)
+            n += 1
+            yield n
+        elif kind == "open":
+            stack.append([ev[1], None])
+        elif kind == "close" and len(stack) > 1:
+            stack.pop()
+        elif kind == "wait":
+            yield n
+
+
+def _folder_id(bookmarks: Bookmarks, stack: list, merge: bool) -> int:
+    """Create the innermost open folder (and any missing ancestors); return its id."""
+    for i, entry in enumerate(stack):
+        if entry[1] is None:
+            parent = stack[i - 1][1]
+            folder = _existing_folder(bookmarks, entry[0], parent) if merge else None
+            entry[1] = (folder or bookmarks.add_folder(entry[0], parent)).id
+    return stack[-1][1]
+
+
+def _existing_folder(bookmarks: Bookmarks, name: str, parent: int):
+    for node in bookmarks.children(parent):
+        if isinstance(node, Folder) and node.name == name:
+            return node
+    return None
+
+
+def export_bookmarks(bookmarks: Bookmarks, path: Path) -> Iterator[int]:
+    """Export in the format implied by the file name (.json: Chromium, else Netscape HTML)."""
+    if Path(path).suffix.lower() == ".json":
+        return export_chromium(bookmarks, path)
+    return export_netscape(bookmarks, path)
\ No newline at end of file
@@ -1,75 +1,756 @@
+import bisect
+import html
+import threading
+import time
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QSortFilterProxyModel, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem
+    QTableView, QLineEdit, QAbstractItemView, QListWidget, QListWidgetItem, QLabel, QScrollArea
 )
 
+# Rows handed to the view per fetchMore() call
+FETCH_BATCH = 256
+
+# Wait this long after the last keystroke before re-filtering
+FILTER_DELAY_MS = 150
+
+# While a filter is active, unfetched rows are pulled in this many per event-loop pass
+FILTER_FETCH_BATCH = 4096
+
+# A BatchJob works this long per event-loop pass, then lets the UI run
+BATCH_SLICE_MS = 12
+
+# The downloads panel redraws at most this often, however fast bytes arrive
+DOWNLOAD_REFRESH_MS = 500
 
-class BookmarksDialog(QDialog):
-    """Dialog for managing bookmarks."""
 
-    def __init__(self, parent, bookmarks):
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+class BatchJob(QObject):
+    """
+    Drives a long-running generator (bookmark import/export) a time slice
+    per event-loop pass, so the window stays responsive. progress carries
+    the generator's latest value; finished carries an error message, or ""
+    once the generator is exhausted.
+    """
+
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(str)
+
+    def __init__(self, steps, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Bookmarks")
-        self.bookmarks = bookmarks
+        self._steps = iter(steps)
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_slice)
+
+    def start(self):
+        self._timer.start()
+
+    @property
+    def running(self) -> bool:
+        return self._timer.isActive()
+
+    def _run_slice(self):
+        deadline = time.perf_counter() + BATCH_SLICE_MS / 1000
+        value = None
+        try:
+            for value in self._steps:
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                self._timer.stop()
+                self.progress.emit(value)
+                self.finished.emit("")
+                return
+        except Exception as e:
+            self._timer.stop()
+            self.finished.emit(str(e) or type(e).__name__)
+            return
+        self.progress.emit(value)
+
+
+class LazyTableModel(QAbstractTableModel):
+    """
+    Read-only table over a Python list. Rows are exposed to the view in
+    FETCH_BATCH chunks and cells are formatted on demand, so no per-cell
+    objects exist and opening a huge list costs the same as a small one.
+    """
+
+    headers = []
+    # Column showing the row's favicon, looked up by its `url` through `icons`
+    icon_column = -1
+
+    def __init__(self, rows=None, parent=None, icons=None):
+        super().__init__(parent)
+        self._rows = list(rows or [])
+        self._fetched = min(len(self._rows), FETCH_BATCH)
+        self.icons = icons  # url -> QIcon or None (favicons.IconStore.icon)
+
+    def cell(self, obj, row: int, col: int) -> str:
+        raise NotImplementedError
+
+    def search_text(self, obj) -> str:
+        """Lower-cased text the filter box matches against."""
+        raise NotImplementedError
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.cell(self._rows[index.row()], index.row(), index.column())
+        if role == Qt.ItemDataRole.DecorationRole and index.column() == self.icon_column and self.icons:
+            return self.icons(self._rows[index.row()].url)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid():
+            self.fetch(FETCH_BATCH)
+
+    # --- Incremental updates ---
+    def fetch(self, count: int):
+        """Expose up to `count` more rows to views and proxies."""
+        n = min(count, len(self._rows) - self._fetched)
+        if n <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + n - 1)
+        self._fetched += n
+        self.endInsertRows()
+
+    def row_object(self, row: int):
+        return self._rows[row]
+
+    def reset(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._fetched = min(len(self._rows), FETCH_BATCH)
+        self.endResetModel()
+
+    def append(self, obj):
+        row = len(self._rows)
+        if self._fetched < row:
+            # Not visible yet; fetchMore() will pick it up
+            self._rows.append(obj)
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(obj)
+        self._fetched += 1
+        self.endInsertRows()
+
+    def row_changed(self, row: int):
+        if row < self._fetched:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.headers) - 1))
+
+    def remove(self, row: int):
+        if row >= self._fetched:
+            del self._rows[row]
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self._fetched -= 1
+        self.endRemoveRows()
+
+
+class BookmarksModel(LazyTableModel):
+    headers = ["ID", "Name", "URL", "Folder"]
+    icon_column = 1
+
+    def __init__(self, rows=None, parent=None, folder_path=None, icons=None):
+        super().__init__(rows, parent, icons)
+        self._folder_path = folder_path or (lambda folder_id: "")
+        # id -> position counting removed rows, and the removed positions (sorted),
+        # so a row is found and removed without a scan or renumbering the rest
+        self._pos_by_id = None
+        self._removed = []
+
+    def cell(self, b, row, col):
+        if col == 3:
+            return self._folder_path(b.parent)
+        return (str(b.id), b.name, b.url)[col]
+
+    def search_text(self, b):
+        return f"{b.name}\n{b.url}\n{self._folder_path(b.parent)}".lower()
+
+    def reset(self, rows):
+        self._pos_by_id = None
+        self._removed = []
+        super().reset(rows)
+
+    def _positions(self):
+        if self._pos_by_id is None:
+            self._pos_by_id = {b.id: i for i, b in enumerate(self._rows)}
+            self._removed = []
+        return self._pos_by_id
+
+    def append(self, obj):
+        self._positions()[obj.id] = len(self._rows) + len(self._removed)
+        super().append(obj)
+
+    def row_of(self, id_: int) -> int:
+        pos = self._positions().get(id_)
+        return -1 if pos is None else pos - bisect.bisect_left(self._removed, pos)
+
+    def remove_id(self, id_: int):
+        row = self.row_of(id_)
+        if row < 0:
+            return
+        bisect.insort(self._removed, self._pos_by_id.pop(id_))
+        self.remove(row)
+
+
+class HistoryModel(LazyTableModel):
+    headers = ["#", "Title", "URL", "Visits", "Last visit"]
+    icon_column = 1
+
+    def __init__(self, rows=None, parent=None, icons=None):
+        super().__init__(rows, parent, icons)
+        self._row_by_url = None
+
+    def cell(self, e, row, col):
+        if col == 0:
+            return str(row + 1)
+        if col == 1:
+            return e.title or e.url
+        if col == 2:
+            return e.url
+        if col == 3:
+            return str(e.visit_count)
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(e.last_visit))
+
+    def search_text(self, e):
+        return f"{e.title}\n{e.url}".lower()
+
+    def reset(self, rows):
+        self._row_by_url = None
+        super().reset(rows)
+
+    def entry_updated(self, entry):
+        """Repaint the row of a revisited URL, or append a newly visited one."""
+        if self._row_by_url is None:
+            self._row_by_url = {e.url: i for i, e in enumerate(self._rows)}
+        row = self._row_by_url.get(entry.url)
+        if row is None:
+            self._row_by_url[entry.url] = len(self._rows)
+            self.append(entry)
+        else:
+            self._rows[row] = entry
+            self.row_changed(row)
+
+
+class HostTimingModel(LazyTableModel):
+    headers = ["Host", "Loads", "Failed", "p50 ms", "p95 ms", "Last ms"]
+
+    def cell(self, s, row, col):
+        if col == 0:
+            return s.host
+        if col == 1:
+            return str(s.loads)
+        if col == 2:
+            return str(s.failed)
+        return f"{(s.p50_ms, s.p95_ms, s.last_ms)[col - 3]:.0f}"
+
+    def search_text(self, s):
+        return s.host.lower()
+
+
+class TaskModel(LazyTableModel):
+    headers = ["Tab", "PID", "PSS MB", "RSS MB", "CPU %", "CPU s"]
+
+    def cell(self, s, row, col):
+        p = s.proc
+        if col == 0:
+            return s.title if s.shared == 1 else f"{s.title} (renderer shared by {s.shared} tabs)"
+        if col == 1:
+            return str(p.pid) if p.pid > 0 else "–"
+        value = (p.pss_mb, p.rss_mb, p.cpu_pct, p.cpu_s)[col - 2]
+        if value < 0:
+            return "–"
+        return f"{value:.1f}" if col < 5 else f"{value:.0f}"
+
+    def search_text(self, s):
+        return f"{s.title} {s.url}".lower()
+
+
+class DownloadModel(LazyTableModel):
+    headers = ["Name", "Status", "Progress", "Speed"]
+
+    def cell(self, d, row, col):
+        if col == 0:
+            return d.name
+        if col == 1:
+            return f"{d.state}: {d.error}" if d.error else d.state
+        if col == 2:
+            if d.total > 0:
+                return f"{format_bytes(d.received)} / {format_bytes(d.total)} ({d.received / d.total:.0%})"
+            return format_bytes(d.received)
+        return f"{format_bytes(d.speed)}/s" if d.speed else ""
+
+    def search_text(self, d):
+        return f"{d.name} {d.url}".lower()
+
+
+class TextFilterProxy(QSortFilterProxyModel):
+    """Case-insensitive substring filter using one search_text() call per row."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_needle(self, text: str):
+        self._needle = text.lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        model = self.sourceModel()
+        return self._needle in model.search_text(model.row_object(source_row))
+
+
+class _TableDialog(QDialog):
+    """Filter box over a proxied, lazily fetched table view."""
+
+    _rows_loaded = pyqtSignal(object)  # worker -> GUI thread
+
+    def __init__(self, parent, title: str, model: LazyTableModel):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.model = model
+        model.setParent(self)
+
+        self.proxy = TextFilterProxy(self)
+        self.proxy.setSourceModel(model)
 
         layout = QVBoxLayout(self)
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["ID", "Name", "URL"])
-        self.table.setSelectionBehavior(self.table.SelectionBehavior.SelectRows)
+        self.filter = QLineEdit(self)
+        self.filter.setPlaceholderText("Filter…")
+        self.filter.setClearButtonEnabled(True)
+        layout.addWidget(self.filter)
+
+        self.table = QTableView(self)
+        self.table.setModel(self.proxy)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.table)
 
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.filter.textChanged.connect(lambda _: self._filter_timer.start())
+
+        # Matches may sit in rows the view has not fetched yet; pull them in
+        # a chunk per event-loop pass so results stream in without a freeze
+        self._drain_timer = QTimer(self)
+        self._drain_timer.setInterval(0)
+        self._drain_timer.timeout.connect(self._drain)
+
+    def _fill(self, loaded: bool, rows):
+        """
+        Fill the model with rows(). A store that has not read its log yet
+        (or is still reading it) is listed on a worker thread meanwhile.
+        """
+        if loaded:
+            self.model.reset(rows())
+            return
+        self.filter.setPlaceholderText("Loading…")
+        self._rows_loaded.connect(self._on_rows_loaded)
+
+        def work():
+            result = rows()
+            try:
+                self._rows_loaded.emit(result)
+            except RuntimeError:
+                pass  # the dialog is gone
+
+        threading.Thread(target=work, name="dialog-rows", daemon=True).start()
+
+    def _on_rows_loaded(self, rows):
+        self.filter.setPlaceholderText("Filter…")
+        self.model.reset(rows)
+        self._apply_filter()
+
+    def _apply_filter(self):
+        self.proxy.set_needle(self.filter.text())
+        if self.filter.text():
+            self._drain_timer.start()
+        else:
+            self._drain_timer.stop()
+
+    def _drain(self):
+        if not self.model.canFetchMore():
+            self._drain_timer.stop()
+            return
+        self.model.fetch(FILTER_FETCH_BATCH)
+
+    def selected_row(self) -> int:
+        """Source-model row of the current selection, or -1."""
+        idx = self.table.currentIndex()
+        if not idx.isValid():
+            return -1
+        return self.proxy.mapToSource(idx).row()
+
+    def selected(self):
+        row = self.selected_row()
+        return self.model.row_object(row) if row >= 0 else None
+
+    def selected_url(self) -> str:
+        obj = self.selected()
+        return obj.url if obj is not None else ""
+
+    def _snapshot_button(self, has_snapshot) -> QPushButton:
+        """"Open snapshot", enabled while the selected page has one (snapshots.SnapshotStore.has)."""
+        btn = QPushButton("Open snapshot")
+        btn.setEnabled(False)
+
+        def update(*_):
+            url = self.selected_url()
+            btn.setEnabled(bool(url) and has_snapshot(url))
+
+        self.table.selectionModel().currentChanged.connect(update)
+        return btn
+
+
+class BookmarksDialog(_TableDialog):
+    """Dialog for managing bookmarks."""
+
+    def __init__(self, parent, bookmarks, icons=None, has_snapshot=None):
+        super().__init__(parent, "Bookmarks", BookmarksModel(folder_path=bookmarks.folder_path, icons=icons))
+        self.bookmarks = bookmarks
+        self._fill(bookmarks.loaded, bookmarks.list)
+        self.status = QLabel(self)
+        self.layout().addWidget(self.status)
+
         # Buttons
         btns = QHBoxLayout()
         self.btn_open = QPushButton("Open")
+        self.btn_snapshot = self._snapshot_button(has_snapshot or (lambda url: False))
         self.btn_add = QPushButton("Add current")
         self.btn_delete = QPushButton("Delete")
+        self.btn_import = QPushButton("Import…")
+        self.btn_export = QPushButton("Export…")
         self.btn_close = QPushButton("Close")
-        for b in (self.btn_open, self.btn_add, self.btn_delete, self.btn_close):
+        for b in (self.btn_open, self.btn_snapshot, self.btn_add, self.btn_delete, self.btn_import, self.btn_export, self.btn_close):
             btns.addWidget(b)
-        layout.addLayout(btns)
+        self.layout().addLayout(btns)
+
+    def watch(self, job: BatchJob, verb: str):
+        """Show a running import/export's progress; no other one starts meanwhile."""
+        t0 = time.perf_counter()
+        count = [0]
+        self.btn_import.setEnabled(False)
+        self.btn_export.setEnabled(False)
+        self.status.setText(f"{verb}…")
+
+        def progress(n):
+            count[0] = n or 0
+            self.status.setText(f"{verb} {count[0]} bookmarks…")
+
+        def done(error: str):
+            self.btn_import.setEnabled(True)
+            self.btn_export.setEnabled(True)
+            if error:
+                self.status.setText(f"{verb} failed: {error}")
+            else:
+                self.status.setText(f"{verb} {count[0]} bookmarks in {time.perf_counter() - t0:.1f} s")
 
-        self.refresh()
+        job.progress.connect(progress)
+        job.finished.connect(done)
 
     def refresh(self):
-        items = self.bookmarks.list()
-        self.table.setRowCount(len(items))
-        for r, b in enumerate(items):
-            self.table.setItem(r, 0, QTableWidgetItem(str(b.id)))
-            self.table.setItem(r, 1, QTableWidgetItem(b.name))
-            self.table.setItem(r, 2, QTableWidgetItem(b.url))
+        """Reload every row; prefer bookmark_added/bookmark_deleted."""
+        self.model.reset(self.bookmarks.list())
 
+    def bookmark_added(self, b):
+        self.model.append(b)
 
-class HistoryDialog(QDialog):
+    def bookmark_deleted(self, id_: int):
+        self.model.remove_id(id_)
+
+
+class HistoryDialog(_TableDialog):
     """Dialog for browsing history."""
 
-    def __init__(self, parent, history):
-        super().__init__(parent)
-        self.setWindowTitle("History")
+    def __init__(self, parent, history, icons=None, has_snapshot=None):
+        super().__init__(parent, "History", HistoryModel(icons=icons))
         self.history = history
+        self._fill(history.loaded, history.list)
+
+        # Buttons
+        btns = QHBoxLayout()
+        self.btn_open = QPushButton("Open")
+        self.btn_snapshot = self._snapshot_button(has_snapshot or (lambda url: False))
+        self.btn_clear = QPushButton("Clear")
+        self.btn_close = QPushButton("Close")
+        for b in (self.btn_open, self.btn_snapshot, self.btn_clear, self.btn_close):
+            btns.addWidget(b)
+        self.layout().addLayout(btns)
+
+    def refresh(self):
+        """Reload every row (e.g. after clearing history)."""
+        self.model.reset(self.history.list())
+
+    def entry_updated(self, entry):
+        self.model.entry_updated(entry)
+
+
+class PerformanceDialog(_TableDialog):
+    """Page load time percentiles per host, from nav_timing.NavTimingLog."""
+
+    def __init__(self, parent, log):
+        super().__init__(parent, "Performance", HostTimingModel(log.host_stats()))
+        self.log = log
+        self.resize(700, 450)
+        self.status = QLabel(self)
+        self.layout().addWidget(self.status)
+
+        # Buttons
+        btns = QHBoxLayout()
+        self.btn_refresh = QPushButton("Refresh")
+        self.btn_export = QPushButton("Export…")
+        self.btn_clear = QPushButton("Clear")
+        self.btn_close = QPushButton("Close")
+        for b in (self.btn_refresh, self.btn_export, self.btn_clear, self.btn_close):
+            btns.addWidget(b)
+        self.layout().addLayout(btns)
+        self.btn_refresh.clicked.connect(self.refresh)
+        self._update_status()
+
+    def refresh(self):
+        self.model.reset(self.log.host_stats())
+        self._update_status()
+
+    def _update_status(self):
+        records = self.log.records()
+        failed = sum(not r.ok for r in records)
+        self.status.setText(f"{len(records)} recent navigations, {failed} failed; "
+                            "load time is loadStarted to loadFinished")
+
+
+class DownloadsDialog(_TableDialog):
+    """Progress and controls for downloads.DownloadManager, refreshed on a timer."""
+
+    def __init__(self, parent, manager):
+        super().__init__(parent, "Downloads", DownloadModel(manager.list()))
+        self.manager = manager
+        self.resize(750, 400)
+        self.status = QLabel(self)
+        self.layout().addWidget(self.status)
+
+        # Buttons
+        btns = QHBoxLayout()
+        self.btn_pause = QPushButton("Pause")
+        self.btn_resume = QPushButton("Resume")
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_clear = QPushButton("Clear finished")
+        self.btn_folder = QPushButton("Open folder")
+        self.btn_close = QPushButton("Close")
+        for b in (self.btn_pause, self.btn_resume, self.btn_cancel, self.btn_clear, self.btn_folder, self.btn_close):
+            btns.addWidget(b)
+        self.layout().addLayout(btns)
+        self.btn_pause.clicked.connect(lambda: self._on_selected(manager.pause))
+        self.btn_resume.clicked.connect(lambda: self._on_selected(manager.resume))
+        self.btn_cancel.clicked.connect(lambda: self._on_selected(manager.cancel))
+        self.btn_clear.clicked.connect(lambda: (manager.clear_finished(), self.refresh()))
+
+        # Workers bump manager.version per chunk; redraw only on a timer tick
+        self._version = manager.version
+        self._timer = QTimer(self)
+        self._timer.setInterval(DOWNLOAD_REFRESH_MS)
+        self._timer.timeout.connect(self._poll)
+        self._timer.start()
+        self._update_status()
+
+    def _on_selected(self, fn):
+        d = self.selected()
+        if d is not None:
+            fn(d.id)
+            self.refresh()
+
+    def _poll(self):
+        if self.manager.version != self._version:
+            self.refresh()
+
+    def refresh(self):
+        self._version = self.manager.version
+        current = self.selected()
+        downloads = self.manager.list()
+        self.model.reset(downloads)
+        if current is not None:
+            for row, d in enumerate(downloads):
+                if d.id == current.id:
+                    self.model.fetch(row + 1)
+                    self.table.selectRow(self.proxy.mapFromSource(self.model.index(row, 0)).row())
+                    break
+        self._update_status()
+
+    def _update_status(self):
+        t = self.manager.totals()
+        size = format_bytes(t.total) if t.total >= 0 else "?"
+        self.status.setText(f"{t.active} active, {t.queued} queued, {t.paused} paused; "
+                            f"{format_bytes(t.received)} of {size} at {format_bytes(t.speed)}/s — "
+                            f"saving to {self.manager.directory}")
+
+
+class TaskManagerDialog(_TableDialog):
+    """Live renderer memory and CPU per tab, from task_manager.TaskSampler."""
+
+    def __init__(self, parent, sampler):
+        super().__init__(parent, "Task manager", TaskModel(sampler.latest))
+        self.sampler = sampler
+        self.resize(750, 450)
+        self.status = QLabel(self)
+        self.layout().addWidget(self.status)
+
+        # Buttons
+        btns = QHBoxLayout()
+        self.btn_reload = QPushButton("Reload tab")
+        self.btn_kill = QPushButton("Kill renderer")
+        self.btn_dump = QPushButton("Dump JSON…")
+        self.btn_close = QPushButton("Close")
+        for b in (self.btn_reload, self.btn_kill, self.btn_dump, self.btn_close):
+            btns.addWidget(b)
+        self.layout().addLayout(btns)
+
+        sampler.sampled.connect(self.update_samples)
+        sampler.set_live(True)
+        self.finished.connect(self._stop)
+        self._update_status()
+
+    def _stop(self):
+        self.sampler.sampled.disconnect(self.update_samples)
+        self.sampler.set_live(False)
+
+    def update_samples(self, samples):
+        # Rows move as figures change; keep the selection on the same tab
+        current = self.selected()
+        self.model.reset(samples)
+        if current is not None:
+            for row, s in enumerate(samples):
+                if s.tab is current.tab:
+                    self.model.fetch(row + 1)
+                    self.table.selectRow(self.proxy.mapFromSource(self.model.index(row, 0)).row())
+                    break
+        self._update_status()
+
+    def _update_status(self):
+        b = self.sampler.browser
+        if not self.sampler.available:
+            self.status.setText("Per-process figures need /proc (Linux)")
+        elif b is not None:
+            renderers = {s.proc.pid: s.proc for s in self.sampler.latest if s.proc.pid > 0}
+            self.status.setText(f"{len(self.sampler.latest)} tabs on {len(renderers)} renderers; "
+                                f"browser process {b.pss_mb if b.pss_mb >= 0 else b.rss_mb:.0f} MB, {b.cpu_pct:.1f}% CPU")
+
+
+class AboutDialog(QDialog):
+    """Read-only facts about this build and session, as titled sections of rows."""
+
+    def __init__(self, parent, sections):
+        super().__init__(parent)
+        self.setWindowTitle("About CopperBrowser")
+        self.resize(600, 500)
+        parts = []
+        for title, rows in sections:
+            parts.append(f"<h3>{html.escape(title)}</h3><table cellspacing=4>")
+            for label, value in rows:
+                parts.append(f"<tr><td><b>{html.escape(label)}</b></td>"
+                             f"<td>{html.escape(str(value))}</td></tr>")
+            parts.append("</table>")
+        text = QLabel("".join(parts), self)
+        text.setTextFormat(Qt.TextFormat.RichText)
+        text.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        text.setWordWrap(True)
+        text.setAlignment(Qt.AlignmentFlag.AlignTop)
+        scroll = QScrollArea(self)
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(text)
 
         layout = QVBoxLayout(self)
-        self.table = QTableWidget(self)
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["#", "Title", "URL"])
-        self.table.setSelectionBehavior(self.table.SelectionBehavior.SelectRows)
-        layout.addWidget(self.table)
+        layout.addWidget(scroll)
+        self.btn_close = QPushButton("Close")
+        self.btn_close.clicked.connect(self.accept)
+        layout.addWidget(self.btn_close)
+
+
+class PageSearchDialog(QDialog):
+    """Search the text of previously visited pages."""
+
+    def __init__(self, parent, indexer, limit: int = 50):
+        super().__init__(parent)
+        self.setWindowTitle("Search visited pages")
+        self.resize(700, 500)
+        self.indexer = indexer
+        self.limit = limit
+
+        layout = QVBoxLayout(self)
+        self.query = QLineEdit(self)
+        self.query.setPlaceholderText("Words from pages you have read…")
+        layout.addWidget(self.query)
+        self.status = QLabel(self)
+        layout.addWidget(self.status)
+        self.results = QListWidget(self)
+        self.results.setWordWrap(True)
+        layout.addWidget(self.results)
 
         # Buttons
         btns = QHBoxLayout()
         self.btn_open = QPushButton("Open")
-        self.btn_clear = QPushButton("Clear")
         self.btn_close = QPushButton("Close")
-        for b in (self.btn_open, self.btn_clear, self.btn_close):
+        for b in (self.btn_open, self.btn_close):
             btns.addWidget(b)
         layout.addLayout(btns)
 
-        self.refresh()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FILTER_DELAY_MS)
+        self._timer.timeout.connect(self.run_query)
+        self.query.textChanged.connect(lambda _: self._timer.start())
 
-    def refresh(self):
-        entries = self.history.list()
-        self.table.setRowCount(len(entries))
-        for i, e in enumerate(entries, start=1):
-            self.table.setItem(i-1, 0, QTableWidgetItem(str(i)))
-            self.table.setItem(i-1, 1, QTableWidgetItem(e.title or e.url))
-            self.table.setItem(i-1, 2, QTableWidgetItem(e.url))
\ No newline at end of file
+    def run_query(self):
+        self.results.clear()
+        text = self.query.text().strip()
+        if not text:
+            self.status.clear()
+            return
+        if not self.indexer.ready:
+            # Opening the index reads its segments; try again shortly
+            self.status.setText("Still opening the page index…")
+            self._timer.start()
+            return
+        t0 = time.perf_counter()
+        hits = self.indexer.search(text, self.limit)
+        ms = (time.perf_counter() - t0) * 1000
+        self.status.setText(f"{len(hits)} pages in {ms:.1f} ms")
+        for h in hits:
+            item = QListWidgetItem(f"{h.title or h.url}\n{h.url}\n{h.snippet}")
+            item.setData(Qt.ItemDataRole.UserRole, h.url)
+            self.results.addItem(item)
+
+    def selected_url(self) -> str:
+        item = self.results.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item is not None else ""
\ No newline at end of file
@@ -1,7 +1,9 @@
+import time
+
 from PyQt6.QtCore import QUrl
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
 
 
 class BrowserTab(QWidget):
@@ -10,17 +12,31 @@ class BrowserTab(QWidget):
     def __init__(self, profile: QWebEngineProfile, parent=None):
         super().__init__(parent)
         self.view = QWebEngineView(self)
+        self.view.setPage(QWebEnginePage(profile, self.view))
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.view)
 
+        # Kept on the tab so a discarded page can be restored from them
         self.url = ""
         self.title = ""
+        self.last_active = time.monotonic()
         self.view.titleChanged.connect(self._on_title_changed)
+        self.view.urlChanged.connect(self._on_url_changed)
 
     def _on_title_changed(self, t: str):
         self.title = t
 
+    def _on_url_changed(self, u: QUrl):
+        if not u.isEmpty():
+            self.url = u.toString()
+
+    def remember_state(self):
+        """Snapshot URL and title before the page is discarded."""
+        if not self.view.url().isEmpty():
+            self.url = self.view.url().toString()
+        self.title = self.view.title() or self.title
+
     def load(self, url: str):
         self.url = url
         self.view.setUrl(QUrl(url))
\ No newline at end of file
@@ -1,5 +1,110 @@
-from PyQt6.QtWidgets import QToolBar, QLineEdit
-from PyQt6.QtGui import QAction
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QModelIndex, pyqtSignal
+from PyQt6.QtWidgets import QToolBar, QLineEdit, QCompleter
+from PyQt6.QtGui import QAction, QStandardItemModel, QStandardItem
+
+from .completion import CompletionIndex, inline_completion
+
+
+class AddressCompleter(QCompleter):
+    """
+    Suggestion dropdown and inline completion for the address bar.
+    The CompletionIndex is built on a worker thread; updates that arrive
+    meanwhile are queued and replayed once it is ready.
+    """
+
+    urlChosen = pyqtSignal(str)
+    suggested = pyqtSignal(list)  # the Suggestions shown for the current text
+    _built = pyqtSignal(object)
+
+    def __init__(self, line_edit: QLineEdit, max_items: int = 8):
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.max_items = max_items
+        self.index: Optional[CompletionIndex] = None
+        self._pending = []
+        self._last_text = ""
+
+        self._model = QStandardItemModel(self)
+        self.setModel(self._model)
+        self.setWidget(line_edit)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setMaxVisibleItems(max_items)
+
+        line_edit.textEdited.connect(self._on_text_edited)
+        self.activated[QModelIndex].connect(self._on_activated)
+        self._built.connect(self._on_built)
+
+    # --- Index lifecycle ---
+    def populate(self, build: Callable[[], CompletionIndex]):
+        """Run `build` on a worker thread and switch to its index when done."""
+        threading.Thread(target=lambda: self._built.emit(build()), daemon=True).start()
+
+    def _on_built(self, index: CompletionIndex):
+        self.index = index
+        pending, self._pending = self._pending, []
+        for fn, args in pending:
+            fn(index, *args)
+
+    def _apply(self, fn, *args):
+        if self.index is None:
+            self._pending.append((fn, args))
+        else:
+            fn(self.index, *args)
+
+    def note_visit(self, url: str, title: str, frecency: float):
+        self._apply(CompletionIndex.add_visit, url, title, frecency)
+
+    def set_bookmarked(self, url: str, title: str, bookmarked: bool = True):
+        self._apply(CompletionIndex.set_bookmarked, url, title, bookmarked)
+
+    def forget_history(self):
+        self._apply(CompletionIndex.forget_history)
+
+    # --- Typing ---
+    def _on_text_edited(self, text: str):
+        deleting = len(text) <= len(self._last_text)
+        self._last_text = text
+        self._model.clear()
+        if self.index is None or not text.strip():
+            self.popup().hide()
+            self.suggested.emit([])
+            return
+        suggestions = self.index.suggest(text, self.max_items)
+        self.suggested.emit(suggestions)
+        for s in suggestions:
+            item = QStandardItem(f"{s.title} — {s.url}" if s.title else s.url)
+            item.setData(s.url, Qt.ItemDataRole.UserRole)
+            self._model.appendRow(item)
+        if not suggestions:
+            self.popup().hide()
+            return
+        self.complete()
+        if not deleting:
+            completed = inline_completion(text, suggestions[0].url)
+            if completed:
+                self.line_edit.setText(completed)
+                self.line_edit.setSelection(len(text), len(completed) - len(text))
+
+    def show_searches(self, text: str, items: List[Tuple[str, str]]):
+        """Add search-engine suggestions, (phrase, search URL), below the history ones for `text`."""
+        if text != self._last_text.strip() or not items:
+            return
+        for phrase, url in items[:self.max_items]:
+            if self._model.findItems(f"🔍 {phrase}"):
+                continue
+            item = QStandardItem(f"🔍 {phrase}")
+            item.setData(url, Qt.ItemDataRole.UserRole)
+            self._model.appendRow(item)
+        self.complete()
+
+    def _on_activated(self, index: QModelIndex):
+        url = index.data(Qt.ItemDataRole.UserRole)
+        if url:
+            self.line_edit.setText(url)
+            self.urlChosen.emit(url)
 
 
 class BrowserToolbar:
@@ -20,6 +125,11 @@ class BrowserToolbar:
         self.act_close_tab = QAction("Close Tab", parent)
         self.act_bookmarks = QAction("Bookmarks", parent)
         self.act_history = QAction("History", parent)
+        self.act_downloads = QAction("Downloads", parent)
+        self.act_search_pages = QAction("Search pages", parent)
+        self.act_performance = QAction("Performance", parent)
+        self.act_task_manager = QAction("Task manager", parent)
+        self.act_about = QAction("About", parent)
 
         # Toggles
         self.act_toggle_ua = QAction("UA: Copper", parent)       # User Agent toggle
@@ -28,6 +138,7 @@ class BrowserToolbar:
         # Address bar
         self.address = QLineEdit(parent)
         self.address.setPlaceholderText("Enter URL or search…")
+        self.completer = AddressCompleter(self.address)
 
         # Assemble toolbar
         self.toolbar.addAction(self.act_back)
@@ -39,8 +150,13 @@ class BrowserToolbar:
         self.toolbar.addAction(self.act_close_tab)
         self.toolbar.addAction(self.act_bookmarks)
         self.toolbar.addAction(self.act_history)
+        self.toolbar.addAction(self.act_downloads)
+        self.toolbar.addAction(self.act_search_pages)
+        self.toolbar.addAction(self.act_performance)
+        self.toolbar.addAction(self.act_task_manager)
         self.toolbar.addAction(self.act_toggle_ua)
         self.toolbar.addAction(self.act_search_engine)
+        self.toolbar.addAction(self.act_about)
 
     def get_toolbar(self) -> QToolBar:
         """Return the actual QToolBar widget."""
@@ -57,7 +173,13 @@ class BrowserToolbar:
             "close_tab": self.act_close_tab,
             "bookmarks": self.act_bookmarks,
             "history": self.act_history,
+            "downloads": self.act_downloads,
+            "search_pages": self.act_search_pages,
+            "performance": self.act_performance,
+            "task_manager": self.act_task_manager,
             "toggle_ua": self.act_toggle_ua,
             "search_engine": self.act_search_engine,
+            "about": self.act_about,
             "address": self.address,
+            "completer": self.completer,
         }
\ No newline at end of file
@@ -1,43 +1,112 @@
-from PyQt6.QtCore import QUrl
+import html
+import os
+import platform
+import signal
+import threading
+
+from PyQt6.QtCore import QUrl, QTimer, QT_VERSION_STR, PYQT_VERSION_STR, pyqtSignal
+from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtWebEngineCore import QWebEngineDownloadRequest
 from PyQt6.QtWidgets import (
-    QMainWindow, QTabWidget, QMessageBox, QInputDialog
+    QMainWindow, QTabWidget, QMessageBox, QInputDialog, QFileDialog
 )
-from PyQt6.QtWebEngineCore import QWebEngineProfile
 
 from .config import (
     Config, DEFAULT_USER_AGENT, CHROME_USER_AGENT, SEARCH_ENGINES
 )
-from .storage import app_root
-from .bookmarks import save_bookmarks, load_bookmarks
+from .storage import JsonLinesLog, app_root, data_file, log_file, profile_root
+from .bookmarks import ROOT_ID, save_bookmarks, load_bookmarks
+from .bookmarks_io import export_bookmarks, import_events, read_events
 from .history import save_history, load_history
+from .completion import build_index
 from .browser_tab import BrowserTab
 from .browser_toolbar import BrowserToolbar
-from .browser_dialogs import BookmarksDialog, HistoryDialog
+from .browser_dialogs import (
+    AboutDialog, BatchJob, BookmarksDialog, DownloadsDialog, HistoryDialog, PageSearchDialog,
+    PerformanceDialog, TaskManagerDialog
+)
+from .tab_lifecycle import TabLifecycleManager
+from .persistence import PersistenceWriter
+from .web_profile import CacheStats, CookieMirror, RequestBlocker, create_web_profile
+from .prerender import Prerenderer
+from .search_suggest import SearchSuggester, is_search_query, search_url
+from .nav_timing import NavTimingLog, NavTimingRecorder
+from .downloads import DownloadManager, download_directory
+from .favicons import THUMBNAIL_DELAY_MS, IconStore
+from .snapshots import SNAPSHOT_DELAY_MS, SnapshotStore, snapshot_eligible
+from .task_manager import TaskSampler
+from .startup import StartupProfiler
+from .engine_presets import PRESETS, active_flags, format_targets
+from .session import (
+    LazyTab, SessionState, TabState, CHECKPOINT_INTERVAL_MS,
+    load_session, save_session, serialize_history, restore_history
+)
 
 
 class MainWindow(QMainWindow):
     """Main application window with tabs, toolbar, UA toggle, SE switcher, bookmarks, and history."""
 
-    def __init__(self, config: Config):
+    _download_refused = pyqtSignal(object)  # DownloadManager worker -> GUI thread
+
+    def __init__(self, config: Config, profiler: StartupProfiler = None):
         super().__init__()
         self.setWindowTitle("CopperBrowser V1 (PyQt6)")
         self.resize(1100, 700)
+        self.profiler = profiler or StartupProfiler()
 
         app_root()
         self.config = config
-        self.history = load_history()
-        self.bookmarks = load_bookmarks()
+        # All profile writes go through here, off the GUI thread
+        self.writer = PersistenceWriter()
+        # Both open lazily; their files are parsed on first use, off the GUI thread
+        self.history = load_history(self.config.profile)
+        self.bookmarks = load_bookmarks(self.config.profile)
+        self._history_dialog = None
+        self._downloads_dialog = None
+        self.profiler.mark("stores")
+
+        # Full-text index of visited pages; created by _start_background()
+        self.fulltext = None
+        self.text_capture = None
 
-        # Web profile and UA
+        # Web profile and UA; the web engine starts in start()
         self.current_ua = self.config.user_agent
-        self.web_profile = QWebEngineProfile.defaultProfile()
-        self.web_profile.setHttpUserAgent(self.current_ua)
+        self.web_profile = None
+        self.cache_stats = CacheStats()  # HTTP cache hit ratio of loaded pages
+        self.blocker = None  # content blocker, installed with the web profile
+        self.cookies = None  # copy of the profile's cookies for downloads
+        # Favicons (by host) and page thumbnails, decoded once and kept on disk
+        self.icons = IconStore(profile_root(self.config.profile), self.config.icon_cache_max_mb, self.writer)
+        # Offline MHTML copies of visited pages; taken only with Config.page_snapshots
+        self.snapshots = SnapshotStore(profile_root(self.config.profile), self.config.snapshot_max_mb,
+                                       self.config.snapshot_max_age_days * 86400)
+
+        # Downloads run on worker threads; unfinished ones resume in _start_background().
+        # Those the manager cannot fetch go back to the engine (_on_download_refused)
+        self.downloads = DownloadManager(
+            download_directory(self.config.download_dir), data_file("downloads", self.config.profile),
+            self.writer, self.config.download_max_concurrent,
+            self.config.download_max_kbps, self.config.download_max_kbps_each,
+            on_refused=self._download_refused.emit,
+            cookies=lambda url: self.cookies.header(url) if self.cookies is not None else "")
+        self._download_refused.connect(self._on_download_refused)
+        self._engine_downloads = set()  # URLs handed back to the engine, not yet requested again
+
+        # Per-navigation timing for the Performance panel (and optionally a JSONL log)
+        sink = JsonLinesLog(log_file("navtiming", self.config.profile)) if self.config.nav_timing_log else None
+        self.nav_log = NavTimingLog(self.config.nav_timing_buffer, sink, self.writer)
+        self.nav_timing = NavTimingRecorder(self.nav_log, self) if self.config.nav_timing else None
 
         # Tabs
         self.tabs = QTabWidget(self)
         self.setCentralWidget(self.tabs)
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.lifecycle = TabLifecycleManager(self.tabs, self.config, self)
+        # Renderer memory/CPU per tab; `latest` and `history` are there for policies and dumps
+        self.task_sampler = TaskSampler(self.tabs, self.config.task_sample_interval_s, self)
+        self._swapping = False
+        self.tabs.currentChanged.connect(self._on_current_changed)
 
         # Toolbar
         self.toolbar = BrowserToolbar(self)
@@ -53,29 +122,141 @@ class MainWindow(QMainWindow):
         actions["close_tab"].triggered.connect(self.close_tab_current)
         actions["bookmarks"].triggered.connect(self.on_bookmarks)
         actions["history"].triggered.connect(self.on_history)
+        actions["downloads"].triggered.connect(self.on_downloads)
+        actions["search_pages"].triggered.connect(self.on_search_pages)
+        actions["performance"].triggered.connect(self.on_performance)
+        actions["task_manager"].triggered.connect(self.on_task_manager)
+        actions["about"].triggered.connect(self.on_about)
         actions["toggle_ua"].triggered.connect(self.toggle_user_agent)
         actions["search_engine"].triggered.connect(self.toggle_search_engine)
         actions["address"].returnPressed.connect(self.on_go)
+        actions["completer"].urlChosen.connect(self.navigate)
 
         self.address = actions["address"]
+        self.completer = actions["completer"]
         self.act_toggle_ua = actions["toggle_ua"]
         self.act_search_engine = actions["search_engine"]
 
-        # Initial tab
-        self.new_tab(self.config.homepage)
+        # Likely address-bar destinations are preconnected or loaded in a hidden tab.
+        # Hidden tabs are parented to the tab widget so they go before the web profile.
+        self.prerender = Prerenderer(lambda: BrowserTab(self.web_profile, self.tabs),
+                                     self.current_tab, self.config, self)
+        self.completer.suggested.connect(self.prerender.predict)
+
+        # Search-engine query suggestions, shown below the history ones
+        self.suggester = SearchSuggester(self.config, self)
+        self.address.textEdited.connect(self.suggester.request)
+        self.suggester.suggested.connect(
+            lambda text, phrases: self.completer.show_searches(
+                text, [(p, search_url(self.config.search_engine, p)) for p in phrases]))
+
+        # Periodic checkpoints so a crash loses at most one interval
+        self._last_session = None
+        self._checkpoint_timer = QTimer(self)
+        self._checkpoint_timer.setInterval(CHECKPOINT_INTERVAL_MS)
+        self._checkpoint_timer.timeout.connect(self.checkpoint_session)
+
+        # URLs from the command line or later launches (open_urls) that arrive before start()
+        self._pending_urls = []
+
+        # Everything else waits for the event loop, so the window paints first
+        self._started = False
+        self._closing = False  # set by closeEvent; deferred captures check it
+        QTimer.singleShot(0, self.start)
+
+    # --- Deferred startup ---
+    def start(self):
+        """Start the web engine and open the first tabs (once the event loop runs)."""
+        if self._started:
+            return
+        self._started = True
+        self.web_profile = create_web_profile(self.config, self)
+        self.profiler.mark("profile")
+        self.web_profile.setHttpUserAgent(self.current_ua)
+        if self.config.content_blocking:
+            # Passes everything until _start_background() has compiled the filters
+            self.blocker = RequestBlocker(self)
+            self.web_profile.setUrlRequestInterceptor(self.blocker)
+        self.cookies = CookieMirror(self.web_profile, self)
+        self.web_profile.downloadRequested.connect(self._on_download_requested)
+
+        # Initial tabs: the previous session if there is one, else the homepage, then any given URLs
+        restored = self.config.restore_session and self.restore_session()
+        if not (restored or self._pending_urls):
+            self.new_tab(self.config.homepage)
+        urls, self._pending_urls = self._pending_urls, []
+        for url in urls:
+            self.new_tab(url)
+        if self.config.restore_session:
+            self._checkpoint_timer.start()
+        self.profiler.mark("first tab")
+        QTimer.singleShot(0, self._start_background)
+
+    def _start_background(self):
+        """Non-essential services, started after the first tab."""
+        # Full-text index of visited pages (tokenizing and disk I/O on a worker thread)
+        if self.config.fulltext_index:
+            from .fulltext import FullTextIndexer
+            from .text_capture import PageTextCapture
+            self.fulltext = FullTextIndexer(profile_root(self.config.profile) / "fulltext")
+            self.text_capture = PageTextCapture(self.fulltext, self)
+
+        # Filter lists are compiled (or read from their cache) off the GUI thread
+        if self.blocker is not None:
+            from .adblock import load_filters
+            threading.Thread(target=lambda: setattr(self.blocker, "engine", load_filters()),
+                             name="filters", daemon=True).start()
+
+        # Address-bar suggestions; history and bookmarks are parsed off the GUI thread
+        self._rebuild_completer()
+
+        self.downloads.start()
 
     # --- Tab management ---
     def current_tab(self) -> BrowserTab:
         return self.tabs.currentWidget()
 
-    def new_tab(self, url: str):
+    def _create_tab(self) -> BrowserTab:
         tab = BrowserTab(self.web_profile, self)
-        idx = self.tabs.addTab(tab, "New Tab")
-        self.tabs.setCurrentIndex(idx)
+        self._wire_tab(tab)
+        return tab
+
+    def _wire_tab(self, tab: BrowserTab):
         tab.view.urlChanged.connect(lambda u, t=tab: self.update_address(u, t))
         tab.view.loadFinished.connect(lambda ok, t=tab: self.on_load_finished(ok, t))
+        tab.view.iconChanged.connect(lambda icon, t=tab: self._on_icon_changed(t, icon))
+        if self.nav_timing is not None:
+            self.nav_timing.attach(tab)
+
+    def new_tab(self, url: str):
+        tab = self._create_tab()
+        idx = self.tabs.addTab(tab, "New Tab")
+        self._set_tab_icon(idx, url)
+        self.tabs.setCurrentIndex(idx)
         tab.load(url)
 
+    def _on_current_changed(self, index: int):
+        w = self.tabs.widget(index)
+        if isinstance(w, LazyTab) and not self._swapping:
+            self._materialize(index, w)
+
+    def _materialize(self, index: int, lazy: LazyTab):
+        """Replace a restored placeholder with a real tab and reload its history."""
+        tab = self._create_tab()
+        tab.url, tab.title = lazy.url, lazy.title
+        self._swapping = True
+        try:
+            self.tabs.insertTab(index, tab, lazy.title or "Tab")
+            self._set_tab_icon(index, lazy.url)
+            self.tabs.setCurrentIndex(index)
+            self.tabs.removeTab(index + 1)
+        finally:
+            self._swapping = False
+        lazy.deleteLater()
+        self.address.setText(lazy.url)
+        if not restore_history(tab.view.history(), lazy.state.history):
+            tab.load(lazy.url)
+
     def close_tab(self, index: int):
         if self.tabs.count() <= 1:
             QMessageBox.information(self, "CopperBrowser", "Cannot close the last tab.")
@@ -97,28 +278,199 @@ class MainWindow(QMainWindow):
     def on_reload(self): self.current_tab().view.reload()
     def on_home(self): self.current_tab().load(self.config.homepage)
 
+    def address_url(self, text: str) -> str:
+        """What typing `text` into the address bar opens: a search, or the address."""
+        if is_search_query(text):
+            return search_url(self.config.search_engine, text)
+        if "://" not in text:
+            return "https://" + text
+        return text
+
     def on_go(self):
         text = self.address.text().strip()
         if not text:
             return
-        if "://" not in text and "." not in text:
-            url = self.config.search_engine.replace("{query}", text)
-        elif "://" not in text:
-            url = "https://" + text
-        else:
-            url = text
-        self.current_tab().load(url)
+        self.navigate(self.address_url(text))
+
+    def open_urls(self, urls: list):
+        """Open URLs from the command line or another launch in new tabs, and bring the window up."""
+        urls = [self.address_url(u.strip()) for u in urls if u.strip()]
+        if not self._started:
+            self._pending_urls.extend(urls)
+            return
+        for url in urls:
+            self.new_tab(url)
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def navigate(self, url: str):
+        """Load `url` in the current tab, swapping in a prerendered tab if there is one."""
+        hit = self.prerender.take(url)
+        if hit is None:
+            self.current_tab().load(url)
+            return
+        tab = hit.tab
+        # The prerendered page replaces the current tab (whose back history is not carried over)
+        index = self.tabs.currentIndex()
+        old = self.tabs.widget(index)
+        self._wire_tab(tab)
+        self._swapping = True
+        try:
+            self.tabs.insertTab(index, tab, tab.view.title() or "Tab")
+            self._set_tab_icon(index, url)
+            self.tabs.setCurrentIndex(index)
+            self.tabs.removeTab(index + 1)
+        finally:
+            self._swapping = False
+        tab.show()
+        old.deleteLater()
+        self.address.setText(tab.view.url().toString() or url)
+        if hit.load_ms is not None:
+            # Finished while hidden; record the visit now that it is shown
+            self.on_load_finished(True, tab)
 
     def on_load_finished(self, ok: bool, tab: BrowserTab):
+        self.profiler.finish("first load")
         if ok:
             url = tab.view.url().toString()
             title = tab.view.title()
             self.tabs.setTabText(self.tabs.indexOf(tab), title or "Tab")
-            self.history.add(url, title)
-            save_history(self.history)
+            if self.snapshots.is_snapshot(tab.view.url().toLocalFile()):
+                return  # an offline copy; its page is already in the history
+            entry = self.history.add(url, title)
+            if entry is not None:
+                self.completer.note_visit(url, title, entry.frecency)
+                if self._history_dialog is not None:
+                    self._history_dialog.entry_updated(entry)
+            save_history(self.history, self.writer)
+            self.cache_stats.sample(tab.view.page())
+            if self.text_capture is not None:
+                self.text_capture.page_loaded(tab)
+            if self.config.page_thumbnails and tab is self.current_tab() and url.startswith(("http:", "https:")):
+                QTimer.singleShot(THUMBNAIL_DELAY_MS, lambda t=tab, u=url: self._capture_thumbnail(t, u))
+            if self.config.page_snapshots and snapshot_eligible(url, self.config.snapshot_hosts):
+                self.snapshots.visited(url)
+                if self.snapshots.wants(url):
+                    QTimer.singleShot(SNAPSHOT_DELAY_MS, lambda t=tab, u=url: self._save_snapshot(t, u))
         else:
             QMessageBox.warning(self, "Load failed", "The page failed to load.")
 
+    # --- Icons ---
+    def _set_tab_icon(self, index: int, url: str):
+        icon = self.icons.icon(url) if url else None
+        if icon is not None:
+            self.tabs.setTabIcon(index, icon)
+
+    def _set_tab_preview(self, index: int, url: str, title: str):
+        path = self.icons.thumbnail_path(url) if url else None
+        if path is not None:
+            self.tabs.setTabToolTip(index, f'<img src="{html.escape(path.as_uri())}"><br>{html.escape(title or url)}')
+
+    def _on_icon_changed(self, tab: BrowserTab, icon):
+        url = tab.view.url().toString()
+        self.icons.set_icon(url, icon)
+        index = self.tabs.indexOf(tab)
+        if index >= 0:
+            self.tabs.setTabIcon(index, icon)
+
+    def _capture_thumbnail(self, tab: BrowserTab, url: str):
+        if self._closing:
+            return
+        try:
+            if tab is not self.current_tab() or tab.view.url().toString() != url:
+                return  # switched away or navigated on meanwhile
+            self.icons.set_thumbnail(url, tab.view.grab().toImage())
+        except RuntimeError:
+            return  # tab was closed
+        self._set_tab_preview(self.tabs.indexOf(tab), url, tab.view.title())
+
+    # --- Snapshots ---
+    def _save_snapshot(self, tab: BrowserTab, url: str):
+        if self._closing:
+            return
+        try:
+            if tab.view.url().toString() != url:
+                return  # navigated on meanwhile
+            page = tab.view.page()
+        except RuntimeError:
+            return  # tab was closed
+        # Completes through _on_download_requested, like any save
+        page.save(str(self.snapshots.begin(url)), QWebEngineDownloadRequest.SavePageFormat.MimeHtmlSaveFormat)
+
+    def _on_snapshot_saved(self, request):
+        if not request.isFinished():
+            return
+        path = os.path.join(request.downloadDirectory(), request.downloadFileName())
+        ok = request.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted
+        self.snapshots.finished(path, ok)
+
+    def _open_snapshot(self, dlg):
+        url = dlg.selected_url()
+        if not url: return
+        path = self.snapshots.get(url)
+        if path is None:
+            QMessageBox.information(self, "Open snapshot", "There is no snapshot of this page (any more).")
+            return
+        self.current_tab().load(QUrl.fromLocalFile(str(path)).toString())
+        dlg.accept()
+
+    # --- Session ---
+    def restore_session(self) -> bool:
+        """Open the saved tabs as placeholders; only the current one gets a web view."""
+        state = load_session(self.config.profile)
+        if state is None:
+            return False
+        self._swapping = True
+        try:
+            for ts in state.tabs:
+                index = self.tabs.addTab(LazyTab(ts, self), ts.title or ts.url or "Tab")
+                self._set_tab_icon(index, ts.url)
+                self._set_tab_preview(index, ts.url, ts.title)
+            current = min(max(state.current, 0), self.tabs.count() - 1)
+            self.tabs.setCurrentIndex(current)
+        finally:
+            self._swapping = False
+        self._materialize(current, self.tabs.widget(current))
+        self._last_session = state
+        return True
+
+    def session_state(self) -> SessionState:
+        tabs = []
+        for i in range(self.tabs.count()):
+            w = self.tabs.widget(i)
+            if isinstance(w, LazyTab):
+                tabs.append(w.state)
+                continue
+            url = w.view.url().toString() or w.url
+            tabs.append(TabState(url, w.view.title() or w.title,
+                                 serialize_history(w.view.history())))
+        return SessionState(tabs, self.tabs.currentIndex())
+
+    def checkpoint_session(self):
+        """Save open tabs, unless nothing changed since the last save."""
+        state = self.session_state()
+        if state == self._last_session:
+            return
+        save_session(state, self.config.profile, self.writer)
+        self._last_session = state
+
+    def closeEvent(self, event):
+        self._closing = True
+        if self.config.restore_session:
+            self.checkpoint_session()
+        self._checkpoint_timer.stop()
+        self.prerender.clear()
+        self.downloads.close()
+        self.writer.close()
+        if self.fulltext is not None:
+            self.fulltext.close()
+        self.history.close()
+        self.bookmarks.close()
+        self.nav_log.close()
+        super().closeEvent(event)
+
     # --- User Agent Toggle ---
     def toggle_user_agent(self):
         if self.current_ua == DEFAULT_USER_AGENT:
@@ -127,7 +479,9 @@ class MainWindow(QMainWindow):
         else:
             self.current_ua = DEFAULT_USER_AGENT
             self.act_toggle_ua.setText("UA: Copper")
-        self.web_profile.setHttpUserAgent(self.current_ua)
+        if self.web_profile is not None:
+            self.web_profile.setHttpUserAgent(self.current_ua)
+        self.suggester.user_agent = self.current_ua
         QMessageBox.information(self, "User Agent Switched",
                                 f"Now using:\n{self.current_ua}")
 
@@ -146,17 +500,20 @@ class MainWindow(QMainWindow):
 
     # --- Bookmarks ---
     def on_bookmarks(self):
-        dlg = BookmarksDialog(self, self.bookmarks)
-        dlg.btn_open.clicked.connect(lambda: self._open_from_table(dlg.table, dlg))
+        dlg = BookmarksDialog(self, self.bookmarks, self.icons.icon, self.snapshots.has)
+        dlg.btn_open.clicked.connect(lambda: self._open_from_table(dlg))
+        dlg.btn_snapshot.clicked.connect(lambda: self._open_snapshot(dlg))
+        dlg.table.doubleClicked.connect(lambda _: self._open_from_table(dlg))
         dlg.btn_add.clicked.connect(lambda: self._add_bookmark(dlg))
         dlg.btn_delete.clicked.connect(lambda: self._delete_bookmark(dlg))
+        dlg.btn_import.clicked.connect(lambda: self._import_bookmarks(dlg))
+        dlg.btn_export.clicked.connect(lambda: self._export_bookmarks(dlg))
         dlg.btn_close.clicked.connect(dlg.accept)
         dlg.exec()
 
-    def _open_from_table(self, table, dlg):
-        row = table.currentRow()
-        if row < 0: return
-        url = table.item(row, 2).text()
+    def _open_from_table(self, dlg):
+        url = dlg.selected_url()
+        if not url: return
         self.current_tab().load(url)
         dlg.accept()
 
@@ -166,29 +523,222 @@ class MainWindow(QMainWindow):
         name, ok = QInputDialog.getText(self, "Add Bookmark", "Name:",
                                         text=tab.title or tab.view.url().toString())
         if not ok or not name: return
-        self.bookmarks.add(name, tab.view.url().toString())
-        save_bookmarks(self.bookmarks)
-        dlg.refresh()
+        parent = ROOT_ID
+        folders = sorted((self.bookmarks.folder_path(f.id), f.id) for f in self.bookmarks.folders())
+        if folders:
+            labels = ["(Top level)"] + [path for path, _ in folders]
+            label, ok = QInputDialog.getItem(self, "Add Bookmark", "Folder:", labels, 0, False)
+            if not ok: return
+            parent = dict(folders).get(label, ROOT_ID)
+        b = self.bookmarks.add(name, tab.view.url().toString(), parent)
+        self.completer.set_bookmarked(b.url, name)
+        save_bookmarks(self.bookmarks, self.writer)
+        dlg.bookmark_added(b)
 
     def _delete_bookmark(self, dlg):
-        row = dlg.table.currentRow()
-        if row < 0: return
-        id_ = int(dlg.table.item(row, 0).text())
-        if self.bookmarks.delete(id_):
-            save_bookmarks(self.bookmarks)
+        b = dlg.selected()
+        if b is None: return
+        if self.bookmarks.delete(b.id):
+            if not self.bookmarks.is_bookmarked(b.url):
+                self.completer.set_bookmarked(b.url, "", False)
+            save_bookmarks(self.bookmarks, self.writer)
+            dlg.bookmark_deleted(b.id)
+
+    def _import_bookmarks(self, dlg):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import bookmarks", "",
+            "Bookmarks (*.html *.htm *.json Bookmarks);;All files (*)")
+        if not path: return
+        # Applied a slice per event-loop pass; one write and one index rebuild at the end
+        job = BatchJob(import_events(self.bookmarks, read_events(path)), self)
+        dlg.watch(job, "Imported")
+
+        def done(error: str):
+            save_bookmarks(self.bookmarks, self.writer)
+            self._rebuild_completer()
             dlg.refresh()
+        job.finished.connect(done)
+        job.start()
+
+    def _export_bookmarks(self, dlg):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export bookmarks", "bookmarks.html",
+            "Bookmark HTML (*.html);;Chromium bookmarks (*.json)")
+        if not path: return
+        job = BatchJob(export_bookmarks(self.bookmarks, path), self)
+        dlg.watch(job, "Exported")
+        job.start()
+
+    def _rebuild_completer(self):
+        # Address-bar suggestions; history and bookmarks are parsed off the GUI thread
+        self.completer.populate(lambda: build_index(self.history.list(), self.bookmarks.list()))
 
     # --- History ---
     def on_history(self):
-        dlg = HistoryDialog(self, self.history)
-        dlg.btn_open.clicked.connect(lambda: self._open_from_table(dlg.table, dlg))
+        dlg = HistoryDialog(self, self.history, self.icons.icon, self.snapshots.has)
+        dlg.btn_open.clicked.connect(lambda: self._open_from_table(dlg))
+        dlg.btn_snapshot.clicked.connect(lambda: self._open_snapshot(dlg))
+        dlg.table.doubleClicked.connect(lambda _: self._open_from_table(dlg))
         dlg.btn_clear.clicked.connect(lambda: self._clear_history(dlg))
         dlg.btn_close.clicked.connect(dlg.accept)
+        # Pages keep loading behind the modal dialog; show their visits live
+        self._history_dialog = dlg
         dlg.exec()
+        self._history_dialog = None
 
     def _clear_history(self, dlg):
         self.history.clear()           # <-- FIXED: actually clears entries
-        save_history(self.history)     # overwrite file with empty list
+        self.completer.forget_history()
+        save_history(self.history, self.writer)
         dlg.refresh()                  # refresh the dialog table
         QMessageBox.information(self, "History Cleared",
-                                "All browsing history has been removed.")
\ No newline at end of file
+                                "All browsing history has been removed.")
+
+    # --- Page search ---
+    def on_search_pages(self):
+        if self.fulltext is None:
+            QMessageBox.information(self, "Search pages",
+                                    "Page indexing is turned off (Config.fulltext_index).")
+            return
+        dlg = PageSearchDialog(self, self.fulltext)
+        dlg.btn_open.clicked.connect(lambda: self._open_from_table(dlg))
+        dlg.results.itemDoubleClicked.connect(lambda _: self._open_from_table(dlg))
+        dlg.btn_close.clicked.connect(dlg.accept)
+        dlg.exec()
+
+    # --- Downloads ---
+    def _on_download_requested(self, request):
+        if request.isSavePageDownload():
+            # QWebEnginePage.save() (snapshots); already accepted with its path
+            request.isFinishedChanged.connect(lambda r=request: self._on_snapshot_saved(r))
+            return
+        url = request.url()
+        if (url.scheme() not in ("http", "https") or url.userInfo()
+                or url.toString() in self._engine_downloads):
+            # blob:, data: and the like only exist inside the page, credentials in the URL are
+            # the engine's to send, and a handed-back download already failed in the manager;
+            # let the engine save them
+            self._engine_downloads.discard(url.toString())
+            request.setDownloadDirectory(str(self.downloads.directory))
+            request.accept()
+            return
+        headers = {"User-Agent": self.current_ua}
+        page = request.page()
+        if page is not None and page.url().scheme() in ("http", "https"):
+            headers["Referer"] = page.url().toString()
+        request.cancel()
+        self.downloads.add(url.toString(), request.downloadFileName(), headers, fallback=True)
+        if self._downloads_dialog is None:
+            self.on_downloads()
+
+    def _on_download_refused(self, d):
+        """
+        The manager's first request for `d` failed (HTTP auth, a session the
+        replayed headers do not carry, ...); have the engine fetch it again.
+        """
+        tab = self.current_tab()
+        if self._closing or tab is None:
+            return
+        self._engine_downloads.add(d.url)
+        tab.view.page().download(QUrl(d.url), d.name)
+
+    def on_downloads(self):
+        dlg = DownloadsDialog(self, self.downloads)
+        dlg.btn_folder.clicked.connect(
+            lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.downloads.directory))))
+        dlg.btn_close.clicked.connect(dlg.accept)
+        # Further downloads started from pages show up in the open dialog
+        self._downloads_dialog = dlg
+        dlg.exec()
+        self._downloads_dialog = None
+
+    # --- Performance ---
+    def on_performance(self):
+        dlg = PerformanceDialog(self, self.nav_log)
+        dlg.btn_export.clicked.connect(lambda: self._export_nav_timing(dlg))
+        dlg.btn_clear.clicked.connect(lambda: (self.nav_log.clear(), dlg.refresh()))
+        dlg.btn_close.clicked.connect(dlg.accept)
+        dlg.exec()
+
+    def _export_nav_timing(self, dlg):
+        path, _ = QFileDialog.getSaveFileName(self, "Export navigation timing", "navtiming.jsonl",
+                                              "JSON lines (*.jsonl);;All files (*)")
+        if not path: return
+        try:
+            self.nav_log.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export failed", str(e))
+
+    # --- Task manager ---
+    def on_task_manager(self):
+        dlg = TaskManagerDialog(self, self.task_sampler)
+        dlg.btn_reload.clicked.connect(lambda: self._reload_renderer(dlg))
+        dlg.btn_kill.clicked.connect(lambda: self._kill_renderer(dlg))
+        dlg.btn_dump.clicked.connect(self._dump_task_samples)
+        dlg.btn_close.clicked.connect(dlg.accept)
+        dlg.exec()
+
+    def _reload_renderer(self, dlg):
+        s = dlg.selected()
+        if s is None: return
+        try:
+            s.tab.view.reload()  # also brings a killed or crashed renderer back
+        except RuntimeError:
+            pass  # tab was closed
+        self.task_sampler.sample()
+
+    def _kill_renderer(self, dlg):
+        s = dlg.selected()
+        if s is None or s.proc.pid <= 0: return
+        if s.shared > 1:
+            answer = QMessageBox.question(self, "Kill renderer",
+                                          f"This renderer also hosts {s.shared - 1} other tab(s). Kill it?")
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+        try:
+            os.kill(s.proc.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError as e:
+            QMessageBox.warning(self, "Kill renderer", str(e))
+        self.task_sampler.sample()
+
+    def _dump_task_samples(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump task samples", "tasks.json",
+                                              "JSON (*.json);;All files (*)")
+        if not path: return
+        try:
+            self.task_sampler.dump(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Dump failed", str(e))
+
+    # --- About ---
+    def on_about(self):
+        preset = PRESETS.get(self.config.engine_preset, PRESETS["default"])
+        try:
+            from PyQt6.QtWebEngineCore import qWebEngineChromiumVersion
+            chromium = qWebEngineChromiumVersion()
+        except ImportError:
+            chromium = "unknown"
+        sections = [
+            ("Versions", [
+                ("Python", platform.python_version()),
+                ("Qt / PyQt", f"{QT_VERSION_STR} / {PYQT_VERSION_STR}"),
+                ("Chromium", chromium),
+                ("Profile", f"{self.config.profile} ({profile_root(self.config.profile)})"),
+            ]),
+            ("Engine preset", [
+                ("Preset", preset.name),
+                ("", preset.description),
+                ("Chromium switches", " ".join(active_flags()) or "(none)"),
+                ("Targets (bench_tabs)", "; ".join(format_targets(preset)) or "(none)"),
+            ]),
+            ("This session", [
+                ("HTTP cache", self.cache_stats.summary()),
+                ("Prerender", self.prerender.stats.summary()),
+                ("Content blocker", f"{self.blocker.blocked}/{self.blocker.checked} requests blocked, "
+                                    f"{self.blocker.avg_us:.0f} us each" if self.blocker else "off"),
+                ("Navigations timed", len(self.nav_log)),
+                ("Icons", self.icons.stats.summary()),
+                ("Snapshots", self.snapshots.stats.summary()),
+            ]),
+        ]
+        AboutDialog(self, sections).exec()
\ No newline at end of file
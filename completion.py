@@ -0,0 +1,405 @@
+import bisect
+import heapq
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .history import FRECENCY_HALF_LIFE
+
+# --- Prefix index tuning ---
+TOP_K = 16          # best keys cached on every trie node
+BUCKET_SIZE = 128   # a leaf holding more keys than this is split by the next character
+MAX_DEPTH = 256     # never split below this depth (pathological shared prefixes)
+
+# --- Ranking ---
+BOOKMARK_BOOST = 1.0   # same as doubling the visit weight
+MAX_TOKENS = 12        # tokens indexed per URL (host labels, title words, path words)
+CONFIDENCE_PRIOR = 1.0  # weight of "somewhere else" when judging the top suggestion
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _offer(top: list, key, score: float):
+    """
+    Insert or move `key` in a best-first `[(-score, key)]` list capped at TOP_K.
+    `score` must not be lower than the one `key` already has in `top`.
+    """
+    neg = -score
+    if len(top) >= TOP_K and neg > top[-1][0]:
+        return
+    for i, (_, k) in enumerate(top):
+        if k == key:
+            del top[i]
+            break
+    bisect.insort(top, (neg, key))
+    if len(top) > TOP_K:
+        top.pop()
+
+
+class _Node:
+    __slots__ = ("children", "keys", "top")
+
+    def __init__(self):
+        self.children: Optional[Dict[str, "_Node"]] = None  # set once the leaf is split
+        self.keys = set()  # leaf: every key below; inner node: keys ending exactly here
+        self.top: List[Tuple[float, str]] = []  # (-score, key), best first
+
+
+class PrefixIndex:
+    """
+    Burst trie over string keys. Leaves are small buckets; every node caches the
+    TOP_K best-scored keys below it, so a prefix query is one walk down the
+    trie plus, at most, a scan of one bucket.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self._scores: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._scores
+
+    def set(self, key: str, score: float):
+        """Insert `key` or change its score."""
+        old = self._scores.get(key)
+        if old == score:
+            return
+        if old is not None and score < old:
+            self.remove(key)
+        self._scores[key] = score
+        node, depth = self.root, 0
+        while True:
+            _offer(node.top, key, score)
+            if node.children is None or depth == len(key):
+                break
+            child = node.children.get(key[depth])
+            if child is None:
+                child = node.children[key[depth]] = _Node()
+            node, depth = child, depth + 1
+        node.keys.add(key)
+        if node.children is None and len(node.keys) > BUCKET_SIZE and depth < MAX_DEPTH:
+            self._burst(node, depth)
+
+    def build(self, pairs: Iterable[Tuple[str, float]]):
+        """Replace the contents with `(key, score)` pairs in one bulk pass."""
+        self.clear()
+        self._scores.update(pairs)
+        self.root.keys = set(self._scores)
+        self.root.top = self._best(self.root.keys)
+        if len(self.root.keys) > BUCKET_SIZE:
+            self._burst(self.root, 0)
+
+    def remove(self, key: str):
+        if self._scores.pop(key, None) is None:
+            return
+        path = []
+        node, depth = self.root, 0
+        while node is not None:
+            path.append(node)
+            if node.children is None or depth == len(key):
+                break
+            node, depth = node.children.get(key[depth]), depth + 1
+        path[-1].keys.discard(key)
+        # A key missing from a child's top cannot be in its parent's top
+        for n in reversed(path):
+            if not any(k == key for _, k in n.top):
+                break
+            n.top = self._recompute(n)
+
+    def clear(self):
+        self.root = _Node()
+        self._scores.clear()
+
+    def query(self, prefix: str, limit: int = TOP_K) -> List[str]:
+        """Return up to `limit` (<= TOP_K) keys starting with `prefix`, best first."""
+        node, depth = self.root, 0
+        while node.children is not None and depth < len(prefix):
+            node = node.children.get(prefix[depth])
+            if node is None:
+                return []
+            depth += 1
+        if depth == len(prefix):
+            return [k for _, k in node.top[:limit]]
+        scores = self._scores
+        hits = ((-scores[k], k) for k in node.keys if k.startswith(prefix))
+        return [k for _, k in heapq.nsmallest(limit, hits)]
+
+    def _best(self, keys: Iterable[str]) -> List[Tuple[float, str]]:
+        scores = self._scores
+        return heapq.nsmallest(TOP_K, ((-scores[k], k) for k in keys))
+
+    def _recompute(self, node: _Node) -> List[Tuple[float, str]]:
+        if node.children is None:
+            return self._best(node.keys)
+        cands = [(-self._scores[k], k) for k in node.keys]
+        for child in node.children.values():
+            cands.extend(child.top)
+        return heapq.nsmallest(TOP_K, cands)
+
+    def _burst(self, node: _Node, depth: int):
+        keys, node.keys, node.children = node.keys, set(), {}
+        for k in keys:
+            if len(k) == depth:
+                node.keys.add(k)
+                continue
+            child = node.children.get(k[depth])
+            if child is None:
+                child = node.children[k[depth]] = _Node()
+            child.keys.add(k)
+        for child in node.children.values():
+            child.top = self._best(child.keys)
+            if len(child.keys) > BUCKET_SIZE and depth + 1 < MAX_DEPTH:
+                self._burst(child, depth + 1)
+
+
+def normalize(url: str) -> str:
+    """Lower-case `url` and drop the scheme and a leading "www."."""
+    s = url.strip().lower()
+    if "://" in s:
+        s = s.split("://", 1)[1]
+    if s.startswith("www."):
+        s = s[4:]
+    return s
+
+
+def tokenize(url: str, title: str) -> Tuple[str, ...]:
+    """Host labels (minus the TLD), title words and path words, de-duplicated."""
+    norm = normalize(url)
+    host, _, path = norm.partition("/")
+    labels = host.split(":")[0].split(".")
+    words = labels[:-1] if len(labels) > 1 else labels
+    words = list(words) + _WORD.findall(title.lower()) + _WORD.findall(path)
+    out = []
+    for w in words:
+        if len(w) < 2 or w.isdigit() or w in out:
+            continue
+        out.append(w)
+        if len(out) == MAX_TOKENS:
+            break
+    return tuple(out)
+
+
+@dataclass
+class Suggestion:
+    url: str
+    title: str
+    score: float
+    bookmarked: bool
+
+
+class _Item:
+    __slots__ = ("id", "url", "title", "frecency", "bookmarked", "added", "key", "tokens", "score")
+
+    def __init__(self, id_: int, url: str):
+        self.id = id_
+        self.url = url
+        self.title = ""
+        self.frecency: Optional[float] = None  # None: never visited
+        self.bookmarked = False
+        self.added = time.time()
+        self.key = f"{normalize(url)}\0{id_}"
+        self.tokens: Tuple[str, ...] = ()
+        self.score = float("-inf")
+
+
+class CompletionIndex:
+    """
+    Address-bar suggestions over history and bookmarks.
+
+    URLs live in a PrefixIndex keyed by their normalized form; words from hosts,
+    paths and titles live in a second PrefixIndex whose score is the best URL
+    using that word. Each word keeps only its TOP_K best URLs, which is all a
+    dropdown can show.
+    """
+
+    def __init__(self):
+        self._items: Dict[str, _Item] = {}
+        self._by_id: Dict[int, _Item] = {}
+        self._next_id = 1
+        self._urls = PrefixIndex()
+        self._words = PrefixIndex()
+        self._postings: Dict[str, List[Tuple[float, int]]] = {}  # word -> [(-score, id)]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # --- Updates ---
+    def add_visit(self, url: str, title: str, frecency: float):
+        """Index or re-rank `url` after a history visit (HistoryEntry.frecency)."""
+        item = self._item(url)
+        item.frecency = frecency
+        self._update(item, title or item.title)
+
+    def set_bookmarked(self, url: str, title: str, bookmarked: bool = True):
+        item = self._items.get(url)
+        if item is None:
+            if not bookmarked:
+                return
+            item = self._item(url)
+        item.bookmarked = bookmarked
+        if not bookmarked and item.frecency is None:
+            self.remove(url)
+            return
+        self._update(item, item.title or title)
+
+    def forget_history(self):
+        """Drop visit data (history was cleared); bookmarked URLs stay indexed."""
+        for item in list(self._items.values()):
+            if item.bookmarked:
+                item.frecency = None
+                item.added = time.time()
+                self._update(item, item.title)
+            else:
+                self.remove(item.url)
+
+    def remove(self, url: str):
+        item = self._items.pop(url, None)
+        if item is None:
+            return
+        del self._by_id[item.id]
+        self._urls.remove(item.key)
+        self._set_tokens(item, ())
+
+    def clear(self):
+        self.__init__()
+
+    def build(self, visits: Iterable[Tuple[str, str, float]], bookmarks: Iterable[Tuple[str, str]]):
+        """
+        Replace the index with `(url, title, frecency)` visits and `(url, name)`
+        bookmarks in one bulk pass, much faster than adding them one by one.
+        """
+        self.clear()
+        for url, title, frecency in visits:
+            item = self._item(url)
+            item.title, item.frecency = title, frecency
+        for url, name in bookmarks:
+            item = self._item(url)
+            item.bookmarked = True
+            item.title = item.title or name
+        postings: Dict[str, List[Tuple[float, int]]] = {}
+        for item in self._items.values():
+            item.score = self._score(item)
+            item.tokens = tokenize(item.url, item.title)
+            for tok in item.tokens:
+                postings.setdefault(tok, []).append((-item.score, item.id))
+        self._postings = {tok: heapq.nsmallest(TOP_K, post) for tok, post in postings.items()}
+        self._urls.build((i.key, i.score) for i in self._items.values())
+        self._words.build((tok, -post[0][0]) for tok, post in self._postings.items())
+
+    def _item(self, url: str) -> _Item:
+        item = self._items.get(url)
+        if item is None:
+            item = _Item(self._next_id, url)
+            self._next_id += 1
+            self._items[url] = item
+            self._by_id[item.id] = item
+        return item
+
+    @staticmethod
+    def _score(item: _Item) -> float:
+        # Bookmarked but never visited: rank like a single visit when it was added
+        base = item.frecency if item.frecency is not None else item.added / FRECENCY_HALF_LIFE
+        return base + (BOOKMARK_BOOST if item.bookmarked else 0.0)
+
+    def _update(self, item: _Item, title: str):
+        score = self._score(item)
+        if score < item.score:
+            # _offer only moves keys up; take the item out of its postings first
+            self._set_tokens(item, ())
+        item.score = score
+        item.title = title
+        self._urls.set(item.key, score)
+        self._set_tokens(item, tokenize(item.url, title))
+
+    def _set_tokens(self, item: _Item, tokens: Tuple[str, ...]):
+        for tok in item.tokens:
+            if tok in tokens:
+                continue
+            post = self._postings.get(tok)
+            if post is None:
+                continue
+            post[:] = [p for p in post if p[1] != item.id]
+            if post:
+                self._words.set(tok, -post[0][0])
+            else:
+                del self._postings[tok]
+                self._words.remove(tok)
+        for tok in tokens:
+            post = self._postings.setdefault(tok, [])
+            _offer(post, item.id, item.score)
+            if post:
+                self._words.set(tok, -post[0][0])
+            else:
+                del self._postings[tok]
+        item.tokens = tokens
+
+    # --- Queries ---
+    def suggest(self, text: str, limit: int = 8) -> List[Suggestion]:
+        """URL-prefix matches first, then word matches, best score first."""
+        q = text.strip().lower()
+        if not q:
+            return []
+        words = q.split()
+        picked: List[_Item] = []
+        seen = set()
+
+        def take(item: _Item):
+            if item.id not in seen and all(w in item.url.lower() or w in item.title.lower()
+                                           for w in words[1:]):
+                seen.add(item.id)
+                picked.append(item)
+
+        if len(words) == 1:
+            # Keys are normalized, so a typed scheme or "www." matches every URL while a partial
+            # one ("h", "htt", "ww") is an ordinary prefix: "h" should find hn.com
+            prefix = normalize(q)
+            for key in self._urls.query(prefix, limit):
+                take(self._by_id[int(key.rsplit("\0", 1)[1])])
+
+        if len(picked) < limit:
+            hits: List[Tuple[float, int]] = []
+            for tok in self._words.query(words[0].strip("/:."), TOP_K):
+                hits.extend(self._postings.get(tok, ()))
+            for _, id_ in sorted(hits):
+                take(self._by_id[id_])
+                if len(picked) >= limit:
+                    break
+
+        return [Suggestion(i.url, i.title, i.score, i.bookmarked) for i in picked[:limit]]
+
+
+def top_confidence(suggestions: List[Suggestion], now: Optional[float] = None) -> float:
+    """
+    Estimated probability that the first suggestion is where the user is going:
+    its decayed visit weight over that of all suggestions plus CONFIDENCE_PRIOR.
+    """
+    if not suggestions:
+        return 0.0
+    origin = (time.time() if now is None else now) / FRECENCY_HALF_LIFE
+    # score - origin is log2 of the weight seen now (see HistoryEntry.frecency)
+    weights = [2.0 ** min(s.score - origin, 64.0) for s in suggestions]
+    return weights[0] / (sum(weights) + CONFIDENCE_PRIOR)
+
+
+def inline_completion(text: str, url: str) -> Optional[str]:
+    """
+    The address-bar text for inline completion of `text` towards `url`,
+    or None if `url` does not extend what was typed.
+    """
+    typed = normalize(text)
+    target = normalize(url)
+    if "://" in text or not typed or not target.startswith(typed) or target == typed:
+        return None
+    return text + target[len(typed):]
+
+
+def build_index(entries: Iterable, bookmarks: Iterable) -> CompletionIndex:
+    """Index HistoryEntry-like `entries` and Bookmark-like `bookmarks`."""
+    idx = CompletionIndex()
+    idx.build(((e.url, e.title, e.frecency) for e in entries),
+              ((b.url, b.name) for b in bookmarks))
+    return idx
\ No newline at end of file
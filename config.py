@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # --- Default homepage ---
 DEFAULT_HOMEPAGE = "https://duckduckgo.com/"
@@ -21,6 +21,13 @@ SEARCH_ENGINES = {
     "Bing": "https://www.bing.com/search?q={query}",
 }
 
+# Query suggestion endpoints per search engine (OpenSearch JSON); Config.suggest_endpoints overrides them
+SUGGEST_ENDPOINTS = {
+    "Google": "https://suggestqueries.google.com/complete/search?client=firefox&q={query}",
+    "DuckDuckGo": "https://duckduckgo.com/ac/?q={query}&type=list",
+    "Bing": "https://api.bing.com/osjson.aspx?query={query}",
+}
+
 # Default search engine (DuckDuckGo)
 DEFAULT_SEARCH_ENGINE = SEARCH_ENGINES["DuckDuckGo"]
 
@@ -31,6 +38,47 @@ class Config:
     download_dir: str = DEFAULT_DOWNLOAD_DIR
     user_agent: str = DEFAULT_USER_AGENT
     search_engine: str = DEFAULT_SEARCH_ENGINE
+    search_suggestions: bool = True  # ask the search engine for query suggestions while typing
+    # Engine name (or search URL of a custom engine) -> suggestion URL with {query}
+    suggest_endpoints: dict = field(default_factory=dict)
+    fulltext_index: bool = True  # capture and index the text of visited pages
+    # Background tab hibernation (see tab_lifecycle.TabLifecycleManager)
+    tab_hibernation: bool = True
+    tab_freeze_after_s: int = 5 * 60
+    tab_discard_after_s: int = 30 * 60
+    tab_memory_budget_mb: int = 2048
+    restore_session: bool = True  # reopen the last session's tabs on startup
+    # Named on-disk profile (storage.profile_root) and its web cache/cookie settings
+    profile: str = "default"
+    single_instance: bool = True  # a second launch on the same profile hands its URLs to this one
+    http_cache_type: str = "disk"    # "disk", "memory" or "none"
+    http_cache_max_mb: int = 512     # 0 lets Chromium size the cache
+    persistent_cookies: str = "allow"  # "allow", "force" (session cookies too) or "none"
+    # Speculative loading of likely address-bar destinations (see prerender.Prerenderer)
+    prerender: bool = True
+    prerender_max_tabs: int = 1
+    prerender_memory_mb: int = 300
+    prerender_confidence: float = 0.8
+    preconnect_confidence: float = 0.4
+    content_blocking: bool = True  # filter lists: *.txt in adblock.filter_dir()
+    # Per-navigation timing (see nav_timing.NavTimingRecorder)
+    nav_timing: bool = True
+    nav_timing_buffer: int = 1000   # navigations kept for the Performance panel
+    nav_timing_log: bool = False    # also append every record to data/navtiming.jsonl
+    engine_preset: str = "default"  # Chromium switches: "default", "low-memory" or "throughput"
+    # Download manager (see downloads.DownloadManager); caps in KB/s, 0 = unlimited
+    download_max_concurrent: int = 3
+    download_max_kbps: int = 0        # all downloads together
+    download_max_kbps_each: int = 0
+    # Favicons and page thumbnails (see favicons.IconStore)
+    icon_cache_max_mb: int = 64
+    page_thumbnails: bool = True   # capture the visible page after it loads, for tab tooltips
+    # Offline MHTML snapshots of visited pages (see snapshots.SnapshotStore); opt-in
+    page_snapshots: bool = False
+    snapshot_hosts: list = field(default_factory=list)  # hosts (and subdomains) to snapshot; empty = all
+    snapshot_max_mb: int = 256
+    snapshot_max_age_days: int = 30
+    task_sample_interval_s: int = 30  # background renderer sampling (task_manager); 0 = only while open
 
     def to_dict(self):
         return {
@@ -38,6 +86,39 @@ class Config:
             "download_dir": self.download_dir,
             "user_agent": self.user_agent,
             "search_engine": self.search_engine,
+            "search_suggestions": self.search_suggestions,
+            "suggest_endpoints": self.suggest_endpoints,
+            "fulltext_index": self.fulltext_index,
+            "tab_hibernation": self.tab_hibernation,
+            "tab_freeze_after_s": self.tab_freeze_after_s,
+            "tab_discard_after_s": self.tab_discard_after_s,
+            "tab_memory_budget_mb": self.tab_memory_budget_mb,
+            "restore_session": self.restore_session,
+            "profile": self.profile,
+            "single_instance": self.single_instance,
+            "http_cache_type": self.http_cache_type,
+            "http_cache_max_mb": self.http_cache_max_mb,
+            "persistent_cookies": self.persistent_cookies,
+            "prerender": self.prerender,
+            "prerender_max_tabs": self.prerender_max_tabs,
+            "prerender_memory_mb": self.prerender_memory_mb,
+            "prerender_confidence": self.prerender_confidence,
+            "preconnect_confidence": self.preconnect_confidence,
+            "content_blocking": self.content_blocking,
+            "nav_timing": self.nav_timing,
+            "nav_timing_buffer": self.nav_timing_buffer,
+            "nav_timing_log": self.nav_timing_log,
+            "engine_preset": self.engine_preset,
+            "download_max_concurrent": self.download_max_concurrent,
+            "download_max_kbps": self.download_max_kbps,
+            "download_max_kbps_each": self.download_max_kbps_each,
+            "icon_cache_max_mb": self.icon_cache_max_mb,
+            "page_thumbnails": self.page_thumbnails,
+            "page_snapshots": self.page_snapshots,
+            "snapshot_hosts": self.snapshot_hosts,
+            "snapshot_max_mb": self.snapshot_max_mb,
+            "snapshot_max_age_days": self.snapshot_max_age_days,
+            "task_sample_interval_s": self.task_sample_interval_s,
         }
 
     @staticmethod
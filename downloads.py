@@ -0,0 +1,486 @@
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .storage import load_json, save_json
+
+# Largest read per request; a capped download reads less (see _chunk_size)
+CHUNK_SIZE = 64 * 1024
+MIN_CHUNK_SIZE = 4 * 1024
+
+# A connection that sends nothing for this long fails (and can be resumed)
+READ_TIMEOUT_S = 30
+
+# A bandwidth cap may be exceeded in bursts of this long
+BURST_S = 0.25
+
+# Speed is re-estimated this often
+SPEED_WINDOW_S = 0.5
+
+QUEUED = "queued"
+ACTIVE = "active"
+PAUSED = "paused"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Downloads that can be (re)started with resume()
+RESUMABLE = (PAUSED, FAILED)
+
+_UNSAFE_NAME = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+
+
+def download_directory(configured: str) -> Path:
+    """Config.download_dir, or ~/Downloads where that is not a usable absolute path."""
+    for path in (Path(configured).expanduser(), Path.home() / "Downloads"):
+        if not path.is_absolute():
+            continue
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+            return path
+        except OSError:
+            continue
+    return Path.home()
+
+
+def filename_for(url: str, suggested: str = "") -> str:
+    """A safe file name from the engine's suggestion or the URL's last path segment."""
+    name = suggested or urllib.parse.unquote(urllib.parse.urlsplit(url).path.rsplit("/", 1)[-1])
+    name = _UNSAFE_NAME.sub("_", name).strip(". ")
+    return name or "download"
+
+
+class TokenBucket:
+    """
+    Byte-rate limiter shared by any number of threads; rate 0 means
+    unlimited. Callers take what they used and sleep off any debt, so
+    concurrent readers share the rate roughly equally.
+    """
+
+    def __init__(self, rate: float = 0):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self._tokens = 0.0
+        self._last = time.monotonic()
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self.rate = rate
+            self._tokens = min(self._tokens, rate * BURST_S)
+
+    def consume(self, n: int, stop: Optional[threading.Event] = None):
+        """Account for `n` bytes; blocks while over the rate (or until `stop` is set)."""
+        with self._lock:
+            if self.rate <= 0:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.rate * BURST_S, self._tokens + (now - self._last) * self.rate) - n
+            self._last = now
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            if stop is not None:
+                stop.wait(wait)
+            else:
+                time.sleep(wait)
+
+
+@dataclass
+class Download:
+    id: int
+    url: str
+    path: str             # final file; data goes to path + ".part" until it is complete
+    state: str = QUEUED
+    received: int = 0
+    total: int = -1       # -1: the server did not say
+    max_kbps: int = 0     # this download's cap; 0: only the global one applies
+    headers: Dict[str, str] = field(default_factory=dict)  # sent with every request (cookies, referer)
+    fallback: bool = False  # hand to on_refused if the first request is refused
+    error: str = ""
+    added: float = 0.0
+    finished: float = 0.0
+    speed: float = 0.0    # bytes/s while active; not persisted
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def part_path(self) -> str:
+        return self.path + ".part"
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        del d["speed"]
+        # Cookies are not written to disk; DownloadManager.cookies supplies them again
+        d["headers"] = {k: v for k, v in self.headers.items() if k.lower() != "cookie"}
+        return d
+
+    @staticmethod
+    def from_dict(d: dict) -> "Download":
+        known = {k: v for k, v in d.items() if k in Download.__dataclass_fields__}
+        return Download(**known)
+
+
+@dataclass
+class DownloadTotals:
+    active: int = 0
+    queued: int = 0
+    paused: int = 0
+    received: int = 0     # over active, queued and paused downloads
+    total: int = 0        # -1 if any of them has an unknown size
+    speed: float = 0.0
+
+
+class DownloadManager:
+    """
+    Downloads HTTP(S) URLs into `directory` on worker threads, at most
+    `max_concurrent` at a time in the order they were added. Each one reads
+    through its own cap (Download.max_kbps or `max_kbps_each`) and the
+    shared `max_kbps` cap. Paused, failed and interrupted downloads resume
+    from their .part file with a Range request.
+
+    The list is saved to `state_path` on every state change; downloads that
+    were running when the browser quit are queued again on start().
+    `version` changes whenever anything does, so a UI can poll cheaply.
+
+    A download added with fallback=True whose first request fails (an HTTP
+    error, say) is dropped from the list and passed to `on_refused`, on its worker
+    thread, so the caller can fetch it another way (the web engine has the
+    page's HTTP auth and session that a bare replay may lack).
+
+    `cookies(url)` returns the Cookie header for `url`. It is not persisted, so
+    add(), start() and resume() (called on the thread that owns the cookie jar)
+    ask for it again.
+    """
+
+    def __init__(self, directory: Path, state_path: Optional[Path] = None, writer=None,
+                 max_concurrent: int = 3, max_kbps: int = 0, max_kbps_each: int = 0,
+                 opener: Callable = urllib.request.urlopen,
+                 on_refused: Optional[Callable[[Download], None]] = None,
+                 cookies: Optional[Callable[[str], str]] = None):
+        self.directory = Path(directory)
+        self.state_path = state_path
+        self.writer = writer
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_kbps_each = max_kbps_each
+        self.bucket = TokenBucket(max_kbps * 1024)
+        self.version = 0
+        self._open = opener
+        self.on_refused = on_refused
+        self.cookies = cookies
+        self._lock = threading.RLock()
+        self._downloads: Dict[int, Download] = {}
+        self._stops: Dict[int, threading.Event] = {}
+        self._threads: Dict[int, threading.Thread] = {}
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._next_id = 1
+        self._started = False
+        self._closed = False
+        if state_path is not None:
+            self._load()
+
+    # --- State ---
+    def _load(self):
+        for item in load_json(self.state_path, {}).get("downloads", []):
+            try:
+                d = Download.from_dict(item)
+            except TypeError:
+                continue  # Fail silently
+            if d.state == ACTIVE:
+                d.state = QUEUED
+            if d.state not in (DONE, CANCELLED):
+                part = Path(d.part_path)
+                d.received = part.stat().st_size if part.exists() else 0
+            self._downloads[d.id] = d
+            self._next_id = max(self._next_id, d.id + 1)
+
+    def _state(self) -> dict:
+        with self._lock:
+            return {"downloads": [d.to_dict() for d in self._downloads.values()]}
+
+    def _changed(self, save: bool = True):
+        self.version += 1
+        if save and self.state_path is not None:
+            if self.writer is not None:
+                self.writer.save_json(self.state_path, self._state)
+            else:
+                save_json(self.state_path, self._state())
+
+    # --- Queue ---
+    def start(self):
+        """Begin working through the queue, including downloads queued by a previous run."""
+        with self._lock:
+            self._started = True
+            for d in self._downloads.values():
+                if d.state not in (DONE, CANCELLED):
+                    self._refresh_cookies(d)
+            self._schedule()
+
+    def add(self, url: str, filename: str = "", headers: Optional[Dict[str, str]] = None,
+            max_kbps: int = 0, fallback: bool = False) -> Download:
+        with self._lock:
+            d = Download(self._next_id, url, str(self._unique_path(filename_for(url, filename))),
+                         max_kbps=max_kbps, headers=dict(headers or {}), fallback=fallback,
+                         added=time.time())
+            self._refresh_cookies(d)
+            self._next_id += 1
+            self._downloads[d.id] = d
+            self._schedule()
+            self._changed()
+            return replace(d)
+
+    def _refresh_cookies(self, d: Download):
+        if self.cookies is None:
+            return
+        d.headers = {k: v for k, v in d.headers.items() if k.lower() != "cookie"}
+        cookie = self.cookies(d.url)
+        if cookie:
+            d.headers["Cookie"] = cookie
+
+    def _unique_path(self, name: str) -> Path:
+        taken = {d.path for d in self._downloads.values() if d.state not in (DONE, CANCELLED)}
+        stem, dot, ext = name.rpartition(".")
+        if not stem:
+            stem, dot, ext = name, "", ""
+        path, n = self.directory / name, 1
+        while str(path) in taken or path.exists() or Path(str(path) + ".part").exists():
+            path = self.directory / f"{stem} ({n}){dot}{ext}"
+            n += 1
+        return path
+
+    def _schedule(self):
+        if not self._started or self._closed:
+            return
+        for d in self._downloads.values():
+            if len(self._threads) >= self.max_concurrent:
+                break
+            # A download resumed before its paused thread has exited waits for that thread;
+            # _run schedules again when it does
+            if d.state == QUEUED and d.id not in self._threads:
+                self._launch(d)
+
+    def _launch(self, d: Download):
+        d.state, d.error, d.speed = ACTIVE, "", 0.0
+        stop = threading.Event()
+        self._stops[d.id] = stop
+        self._buckets[d.id] = TokenBucket((d.max_kbps or self.max_kbps_each) * 1024)
+        t = threading.Thread(target=self._run, args=(d, stop), name=f"download-{d.id}", daemon=True)
+        self._threads[d.id] = t
+        t.start()
+
+    def _stop(self, id_: int, state: str) -> Optional[Download]:
+        """Move a download to `state`, stopping its thread if it has one."""
+        d = self._downloads.get(id_)
+        if d is None:
+            return None
+        d.state = state
+        d.speed = 0.0
+        stop = self._stops.get(id_)
+        if stop is not None:
+            stop.set()
+        return d
+
+    def pause(self, id_: int):
+        with self._lock:
+            d = self._downloads.get(id_)
+            if d is not None and d.state in (QUEUED, ACTIVE):
+                self._stop(id_, PAUSED)
+                self._schedule()
+                self._changed()
+
+    def resume(self, id_: int):
+        with self._lock:
+            d = self._downloads.get(id_)
+            if d is not None and d.state in RESUMABLE:
+                d.state, d.error = QUEUED, ""
+                self._refresh_cookies(d)
+                self._schedule()
+                self._changed()
+
+    def cancel(self, id_: int):
+        """Stop a download and delete what it fetched so far."""
+        with self._lock:
+            d = self._downloads.get(id_)
+            if d is None or d.state in (DONE, CANCELLED):
+                return
+            self._stop(id_, CANCELLED)
+            if id_ not in self._threads:
+                self._remove_part(d)
+            self._schedule()
+            self._changed()
+
+    def remove(self, id_: int):
+        """Drop a download from the list (cancelling it if unfinished); a finished file stays."""
+        with self._lock:
+            d = self._downloads.get(id_)
+            if d is None:
+                return
+            if d.state != DONE:
+                self.cancel(id_)
+            if id_ not in self._threads:
+                del self._downloads[id_]
+            self._changed()
+
+    def clear_finished(self):
+        with self._lock:
+            for id_ in [i for i, d in self._downloads.items() if d.state in (DONE, CANCELLED)]:
+                if id_ not in self._threads:
+                    del self._downloads[id_]
+            self._changed()
+
+    def set_limits(self, max_concurrent: int, max_kbps: int, max_kbps_each: int):
+        """Apply new caps; running downloads pick up bandwidth changes immediately."""
+        with self._lock:
+            self.max_concurrent = max(1, max_concurrent)
+            self.max_kbps_each = max_kbps_each
+            self.bucket.set_rate(max_kbps * 1024)
+            for id_, bucket in self._buckets.items():
+                bucket.set_rate((self._downloads[id_].max_kbps or max_kbps_each) * 1024)
+            self._schedule()
+            self._changed(save=False)
+
+    # --- Queries ---
+    def list(self) -> List[Download]:
+        """Snapshots of all downloads, in the order they were added."""
+        with self._lock:
+            return [replace(d) for d in self._downloads.values()]
+
+    def get(self, id_: int) -> Optional[Download]:
+        with self._lock:
+            d = self._downloads.get(id_)
+            return replace(d) if d is not None else None
+
+    def totals(self) -> DownloadTotals:
+        t = DownloadTotals()
+        with self._lock:
+            for d in self._downloads.values():
+                if d.state not in (ACTIVE, QUEUED, PAUSED):
+                    continue
+                t.active += d.state == ACTIVE
+                t.queued += d.state == QUEUED
+                t.paused += d.state == PAUSED
+                t.received += d.received
+                t.total = -1 if d.total < 0 or t.total < 0 else t.total + d.total
+                t.speed += d.speed
+        return t
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is active or queued; False on timeout (for scripts and benchmarks)."""
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not any(d.state in (ACTIVE, QUEUED) for d in self._downloads.values()) and not self._threads:
+                    return True
+            if end is not None and time.monotonic() >= end:
+                return False
+            time.sleep(0.02)
+
+    def close(self, timeout: float = 2.0):
+        """Stop all transfers; running ones are queued again for the next start()."""
+        with self._lock:
+            self._closed = True
+            threads = list(self._threads.values())
+            for id_ in list(self._threads):
+                self._stop(id_, QUEUED)
+        for t in threads:
+            t.join(timeout)
+        with self._lock:
+            self._changed()
+
+    # --- Worker ---
+    def _chunk_size(self, bucket: TokenBucket) -> int:
+        # Small reads under a low cap keep the transfer (and the progress bar) smooth
+        rates = [r for r in (bucket.rate, self.bucket.rate / max(1, len(self._threads))) if r > 0]
+        if not rates:
+            return CHUNK_SIZE
+        return int(max(MIN_CHUNK_SIZE, min(CHUNK_SIZE, min(rates) * BURST_S)))
+
+    def _run(self, d: Download, stop: threading.Event):
+        error, refused = "", None
+        try:
+            self._transfer(d, stop)
+        except Exception as e:  # not only OSError: http.client raises IncompleteRead, BadStatusLine...
+            # The bookkeeping below must run whatever failed, or wait() and close() hang
+            error = str(getattr(e, "reason", "") or e) or type(e).__name__
+        with self._lock:
+            del self._threads[d.id]
+            del self._stops[d.id]
+            del self._buckets[d.id]
+            d.speed = 0.0
+            if d.state == ACTIVE:  # not stopped by pause/cancel/close
+                if error and d.fallback and self.on_refused is not None:
+                    # The first request failed (a response clears `fallback`)
+                    del self._downloads[d.id]
+                    self._remove_part(d)
+                    refused = replace(d, state=CANCELLED, error=error)
+                elif error:
+                    d.state, d.error = FAILED, error
+                elif d.total >= 0 and d.received < d.total:
+                    d.state, d.error = FAILED, "connection closed early"
+                else:
+                    try:
+                        os.replace(d.part_path, d.path)
+                        d.state, d.finished = DONE, time.time()
+                    except OSError as e:
+                        d.state, d.error = FAILED, str(e)
+            elif d.state == CANCELLED:
+                self._remove_part(d)
+            self._schedule()
+            self._changed()
+        if refused is not None:
+            self.on_refused(refused)
+
+    def _transfer(self, d: Download, stop: threading.Event):
+        part = Path(d.part_path)
+        part.parent.mkdir(parents=True, exist_ok=True)
+        offset = part.stat().st_size if part.exists() else 0
+        headers = dict(d.headers)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        try:
+            resp = self._open(urllib.request.Request(d.url, headers=headers), timeout=READ_TIMEOUT_S)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset and offset == d.total:
+                return  # it was complete; only the rename was missing
+            raise
+        with resp:
+            if offset and resp.status != 206:
+                offset = 0  # no range support; start over
+            length = resp.headers.get("Content-Length")
+            with self._lock:
+                d.total = offset + int(length) if length and length.isdigit() else -1
+                d.received = offset
+                d.fallback = False
+            bucket = self._buckets[d.id]
+            window_start, window_bytes = time.monotonic(), 0
+            with part.open("r+b" if offset else "wb") as f:
+                f.seek(offset)
+                f.truncate()
+                while not stop.is_set():
+                    data = resp.read(self._chunk_size(bucket))
+                    if not data:
+                        break
+                    f.write(data)
+                    window_bytes += len(data)
+                    now = time.monotonic()
+                    with self._lock:
+                        d.received += len(data)
+                        if now - window_start >= SPEED_WINDOW_S:
+                            d.speed = window_bytes / (now - window_start)
+                            window_start, window_bytes = now, 0
+                        self.version += 1
+                    bucket.consume(len(data), stop)
+                    self.bucket.consume(len(data), stop)
+
+    def _remove_part(self, d: Download):
+        try:
+            os.remove(d.part_path)
+        except OSError:
+            pass  # Fail silently
\ No newline at end of file
@@ -0,0 +1,113 @@
+import os
+import shlex
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# QtWebEngine reads extra Chromium switches from here when the engine starts
+FLAGS_ENV = "QTWEBENGINE_CHROMIUM_FLAGS"
+
+# Switches whose values are comma-separated lists; Chromium only honours the
+# last occurrence, so lists from the preset and the environment are merged
+_LIST_SWITCHES = ("--enable-features", "--disable-features")
+
+
+def _raster_threads() -> int:
+    return min(4, max(2, (os.cpu_count() or 2) // 2))
+
+
+@dataclass
+class EnginePreset:
+    name: str
+    description: str
+    flags: List[str] = field(default_factory=list)
+    # What benchmarks/bench_tabs.py should show with this preset: (metric, "<=" or ">=", value)
+    targets: List[Tuple[str, str, float]] = field(default_factory=list)
+
+
+PRESETS: Dict[str, EnginePreset] = {
+    "default": EnginePreset(
+        "default",
+        "Chromium's own process model and raster settings.",
+    ),
+    "low-memory": EnginePreset(
+        "low-memory",
+        "Thin clients: at most two renderer processes shared per site, one raster "
+        "thread, and aggressive throttling of timers in background pages.",
+        [
+            "--renderer-process-limit=2",
+            "--process-per-site",
+            "--num-raster-threads=1",
+            "--enable-low-end-device-mode",
+            "--enable-features=IntensiveWakeUpThrottling",
+        ],
+        [
+            ("per_tab_mb", "<=", 60),
+            ("renderer_processes", "<=", 2),
+            ("reclaimed_ratio", ">=", 0.7),
+            ("load_p50_ms", "<=", 400),
+        ],
+    ),
+    "throughput": EnginePreset(
+        "throughput",
+        "Workstations: GPU rasterization where the GPU allows it, zero-copy "
+        "uploads and more raster threads.",
+        [
+            "--enable-gpu-rasterization",
+            "--enable-zero-copy",
+            f"--num-raster-threads={_raster_threads()}",
+        ],
+        [
+            ("load_p50_ms", "<=", 150),
+            ("new_tab_ms", "<=", 30),
+            ("per_tab_mb", "<=", 150),
+        ],
+    ),
+}
+
+
+def merge_flags(*groups: List[str]) -> List[str]:
+    """
+    Combine switch lists; a later switch of the same name replaces an
+    earlier one, except feature lists, which are joined.
+    """
+    merged: Dict[str, str] = {}
+    features: Dict[str, List[str]] = {}
+    for flags in groups:
+        for flag in flags:
+            name, eq, value = flag.partition("=")
+            if name in _LIST_SWITCHES and eq:
+                items = features.setdefault(name, [])
+                items.extend(v for v in value.split(",") if v and v not in items)
+                merged[name] = ""
+            else:
+                merged.pop(name, None)  # keep the latest position
+                merged[name] = flag
+    return [f"{name}={','.join(features[name])}" if name in features else flag
+            for name, flag in merged.items()]
+
+
+def apply_preset(name: str, env=None) -> Optional[EnginePreset]:
+    """
+    Put the preset's switches into QTWEBENGINE_CHROMIUM_FLAGS. Must run before
+    QApplication is created. Switches already in the environment win over the
+    preset's. Returns the preset, or None for an unknown name.
+    """
+    env = os.environ if env is None else env
+    preset = PRESETS.get(name)
+    if preset is None:
+        return None
+    existing = shlex.split(env.get(FLAGS_ENV, ""))
+    flags = merge_flags(preset.flags, existing)
+    if flags:
+        env[FLAGS_ENV] = " ".join(shlex.quote(f) for f in flags)
+    return preset
+
+
+def active_flags(env=None) -> List[str]:
+    """Chromium switches the engine was started with (from the environment)."""
+    env = os.environ if env is None else env
+    return shlex.split(env.get(FLAGS_ENV, ""))
+
+
+def format_targets(preset: EnginePreset) -> List[str]:
+    return [f"{metric} {'≤' if op == '<=' else '≥'} {value:g}" for metric, op, value in preset.targets]
\ No newline at end of file
@@ -0,0 +1,255 @@
+import hashlib
+import os
+import re
+import time
+import urllib.parse
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QBuffer, QIODevice, QSize, Qt
+from PyQt6.QtGui import QIcon, QImage, QPixmap
+
+# Favicons are stored as PNGs of this size
+ICON_SIZE = 32
+
+# Page thumbnails: width in pixels and JPEG quality
+THUMB_WIDTH = 320
+THUMB_QUALITY = 70
+
+# A thumbnail is taken this long after loadFinished, once the page has painted
+THUMBNAIL_DELAY_MS = 1000
+
+# Decoded icons kept in memory
+MEMORY_ICONS = 1024
+
+# Eviction brings the store down to this share of its cap, so it does not run on every write
+EVICT_TO = 0.9
+
+_PLAIN_HOST = re.compile(r"[a-z0-9][a-z0-9.-]{0,200}")
+
+
+def icon_host(url: str) -> str:
+    """The key favicons are stored under."""
+    try:
+        return (urllib.parse.urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def _encode(image: QImage, fmt: str, quality: int = -1) -> bytes:
+    buf = QBuffer()
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buf, fmt, quality)
+    return bytes(buf.data())
+
+
+def _write_file(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _unlink(path: Path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # Fail silently
+
+
+@dataclass
+class IconStats:
+    icons: int = 0        # favicons on disk
+    thumbnails: int = 0
+    bytes: int = 0
+    in_memory: int = 0
+    hits: int = 0         # served from memory
+    decoded: int = 0      # read from disk and decoded
+    evicted: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.icons} icons, {self.thumbnails} thumbnails, {self.bytes / 1024 / 1024:.1f} MB; "
+                f"{self.hits} memory hits, {self.decoded} decoded from disk, {self.evicted} evicted")
+
+
+class IconStore:
+    """
+    Favicons by host and page thumbnails by URL, for tabs and the history
+    and bookmark lists. Decoded QIcons sit in an in-memory LRU over PNGs in
+    <profile>/icons; thumbnails are JPEGs in <profile>/thumbs. Both share
+    one size cap and the least recently used files go first.
+
+    The directories are listed once, on first use, so a host without an
+    icon never touches the disk; an icon is read and decoded at most once
+    while it stays in memory. Writes and deletions go through the
+    PersistenceWriter (or happen inline without one). GUI thread only.
+    """
+
+    def __init__(self, root: Path, max_mb: int = 64, writer=None, memory: int = MEMORY_ICONS):
+        self.icon_dir = Path(root) / "icons"
+        self.thumb_dir = Path(root) / "thumbs"
+        self.max_bytes = max(1, max_mb) * 1024 * 1024
+        self.writer = writer
+        self.memory = memory
+        self._icons: "OrderedDict[str, QIcon]" = OrderedDict()
+        self._files: Optional[Dict[Path, List[float]]] = None  # path -> [size, last used]
+        self._bytes = 0  # running total; thumbnail sizes are estimates until written
+        self._crc: Dict[Path, int] = {}  # icon file -> checksum of what it holds
+        self._stats = IconStats()
+
+    # --- Disk index ---
+    def _index(self) -> Dict[Path, List[float]]:
+        if self._files is None:
+            self._files = {}
+            for d in (self.icon_dir, self.thumb_dir):
+                try:
+                    with os.scandir(d) as it:
+                        for e in it:
+                            if e.is_file() and not e.name.endswith(".tmp"):
+                                st = e.stat()
+                                self._files[Path(e.path)] = [st.st_size, st.st_mtime]
+                except OSError:
+                    pass  # not created yet
+            self._bytes = sum(size for size, _ in self._files.values())
+        return self._files
+
+    def icon_path(self, host: str) -> Path:
+        name = host if _PLAIN_HOST.fullmatch(host) else hashlib.sha1(host.encode("utf-8")).hexdigest()
+        return self.icon_dir / f"{name}.png"
+
+    def thumbnail_file(self, url: str) -> Path:
+        return self.thumb_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.jpg"
+
+    def _store(self, path: Path, data: Optional[bytes], size: int, produce=None):
+        """Record `path` as stored and write it; `produce` makes the bytes on the writer thread instead."""
+        entry = [size, time.time()]
+        old = self._index().get(path)
+        self._bytes += size - (old[0] if old else 0)
+        self._files[path] = entry
+
+        def write():
+            out = data if produce is None else produce()
+            entry[0] = len(out)
+            _write_file(path, out)
+
+        if self.writer is not None:
+            self.writer.submit(str(path), write)
+        else:
+            write()
+        self._evict()
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        files = self._index()
+        total = self._bytes = sum(s for s, _ in files.values())  # exact, now that it matters
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TO
+        for path, (size, _) in sorted(files.items(), key=lambda kv: kv[1][1]):
+            if total <= target:
+                break
+            total -= size
+            self._bytes -= size
+            del files[path]
+            self._crc.pop(path, None)
+            if path.parent == self.icon_dir:
+                self._icons.pop(path.stem, None)  # hashed (non-ASCII) hosts stay until pushed out
+            self._stats.evicted += 1
+            if self.writer is not None:
+                self.writer.submit(str(path), lambda p=path: _unlink(p))  # replaces a pending write
+            else:
+                _unlink(path)
+
+    # --- Favicons ---
+    def icon(self, url: str) -> Optional[QIcon]:
+        """The favicon of `url`'s host, or None if none has been seen."""
+        host = icon_host(url)
+        icon = self._icons.get(host)
+        if icon is not None:
+            self._icons.move_to_end(host)
+            self._stats.hits += 1
+            return icon
+        path = self.icon_path(host)
+        entry = self._index().get(path) if host else None
+        if entry is None:
+            return None
+        pixmap = QPixmap()
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None  # still being written, or removed behind our back
+        if not pixmap.loadFromData(data, "PNG"):
+            return None
+        self._stats.decoded += 1
+        entry[1] = time.time()
+        try:
+            os.utime(path)  # keeps its place in the eviction order across sessions
+        except OSError:
+            pass
+        self._crc[path] = zlib.crc32(data)
+        return self._remember(host, QIcon(pixmap))
+
+    def _remember(self, host: str, icon: QIcon) -> QIcon:
+        self._icons[host] = icon
+        self._icons.move_to_end(host)
+        while len(self._icons) > self.memory:
+            self._icons.popitem(last=False)
+        return icon
+
+    def set_icon(self, url: str, icon: QIcon):
+        """Store the favicon a page reported (QWebEngineView.iconChanged)."""
+        host = icon_host(url)
+        if not host or icon.isNull():
+            return
+        image = icon.pixmap(QSize(ICON_SIZE, ICON_SIZE)).toImage()
+        if image.isNull():
+            return
+        data = _encode(image, "PNG")
+        crc = zlib.crc32(data)
+        path = self.icon_path(host)
+        self._remember(host, icon)
+        if self._crc.get(path) == crc:
+            return  # same icon as on disk
+        self._crc[path] = crc
+        self._store(path, data, len(data))
+
+    # --- Thumbnails ---
+    def thumbnail_path(self, url: str) -> Optional[Path]:
+        """File of the page's thumbnail, if one has been captured."""
+        path = self.thumbnail_file(url)
+        return path if path in self._index() else None
+
+    def set_thumbnail(self, url: str, image: QImage):
+        """Store a screenshot of the page, scaled down; encoding happens on the writer thread."""
+        if image.isNull():
+            return
+        small = image.scaledToWidth(min(THUMB_WIDTH, image.width()), Qt.TransformationMode.SmoothTransformation)
+        estimate = small.width() * small.height() // 8
+        self._store(self.thumbnail_file(url), None, estimate,
+                    lambda: _encode(small, "JPEG", THUMB_QUALITY))
+
+    # --- Housekeeping ---
+    @property
+    def stats(self) -> IconStats:
+        files = self._index()
+        s = self._stats
+        s.icons = sum(p.parent == self.icon_dir for p in files)
+        s.thumbnails = len(files) - s.icons
+        s.bytes = int(sum(size for size, _ in files.values()))
+        s.in_memory = len(self._icons)
+        return s
+
+    def clear(self):
+        for path in list(self._index()):
+            if self.writer is not None:
+                self.writer.submit(str(path), lambda p=path: _unlink(p))
+            else:
+                _unlink(path)
+        self._files = {}
+        self._bytes = 0
+        self._icons.clear()
+        self._crc.clear()
\ No newline at end of file
@@ -0,0 +1,411 @@
+"""
+Full-text index of visited pages ("search what I've read").
+
+Layout under <profile>/fulltext:
+    manifest.json      live segment names and counters
+    docs.jsonl         one line per indexed page version (append-only)
+    texts.bin          zlib-compressed page texts, addressed from docs.jsonl
+    seg-NNNNNN.post    postings: per term, uint32 doc ids then uint16 impacts
+    seg-NNNNNN.terms   {term: [byte offset, posting count]}
+
+Postings inside a term are sorted by impact (the BM25 term-frequency part,
+quantized to 16 bits), so a query only reads the best MAX_POSTINGS_PER_TERM
+entries of each term and stays fast however common the term is.
+"""
+import array
+import heapq
+import json
+import math
+import mmap
+import queue
+import re
+import threading
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .storage import save_json, load_json
+
+# --- Tokenizer (no stemming, no stop words) ---
+_TOKEN = re.compile(r"\w{2,40}")
+MAX_DOC_CHARS = 200_000
+
+# --- Ranking ---
+BM25_K1 = 1.2
+BM25_B = 0.75
+IMPACT_SCALE = 65535
+MAX_POSTINGS_PER_TERM = 4096
+
+# --- Segments ---
+FLUSH_DOCS = 200      # buffered pages per new segment
+MAX_SEGMENTS = 8      # merge the smallest segments beyond this
+MERGE_FACTOR = 4      # segments combined per merge
+SNIPPET_CHARS = 160
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass
+class Doc:
+    id: int
+    url: str
+    title: str
+    length: int
+    offset: int
+    size: int
+
+
+@dataclass
+class SearchHit:
+    url: str
+    title: str
+    score: float
+    snippet: str
+
+
+class _Segment:
+    """One immutable postings file, memory-mapped, plus its term dictionary."""
+
+    def __init__(self, root: Path, name: str):
+        self.name = name
+        self.post_path = root / f"{name}.post"
+        self.terms_path = root / f"{name}.terms"
+        with self.terms_path.open("r", encoding="utf-8") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+        self._file = self.post_path.open("rb")
+        self.size = self.post_path.stat().st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def df(self, term: str) -> int:
+        t = self.terms.get(term)
+        return t[1] if t else 0
+
+    def postings(self, term: str, limit: int) -> Tuple[array.array, array.array]:
+        ids, impacts = array.array("I"), array.array("H")
+        t = self.terms.get(term)
+        if t:
+            off, n = t
+            k = min(n, limit)
+            ids.frombytes(self._map[off:off + 4 * k])
+            impacts.frombytes(self._map[off + 4 * n:off + 4 * n + 2 * k])
+        return ids, impacts
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+
+def _write_segment(root: Path, name: str, postings: Dict[str, List[Tuple[int, int]]]):
+    """Write `{term: [(impact, doc_id), ...]}` (any order) as a segment."""
+    terms = {}
+    tmp = root / f"{name}.post.tmp"
+    with tmp.open("wb") as f:
+        off = 0
+        for term in sorted(postings):
+            plist = sorted(postings[term], reverse=True)
+            ids = array.array("I", (d for _, d in plist))
+            imps = array.array("H", (i for i, _ in plist))
+            f.write(ids.tobytes())
+            f.write(imps.tobytes())
+            terms[term] = [off, len(plist)]
+            off += 6 * len(plist)
+    tmp.replace(root / f"{name}.post")
+    tmp = root / f"{name}.terms.tmp"
+    with tmp.open("w", encoding="utf-8") as f:
+        # dumps() uses the C encoder; dump() to a file does not
+        f.write(json.dumps(terms, ensure_ascii=False, separators=(",", ":")))
+    tmp.replace(root / f"{name}.terms")
+
+
+class FullTextIndex:
+    """Segmented inverted index; all public methods are thread-safe."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._merge_lock = threading.Lock()
+        self._docs: Dict[int, Doc] = {}
+        self._by_url: Dict[str, int] = {}
+        self._total_len = 0
+        self._buffer: Dict[str, List[Tuple[int, int]]] = defaultdict(list)  # term -> [(doc, tf)]
+        self._buffered_docs = 0
+        self._flushing: Dict[str, List[Tuple[int, int]]] = {}  # buffer being written out
+
+        manifest = load_json(self.root / "manifest.json", {})
+        self._next_doc = manifest.get("next_doc", 1)
+        self._next_seg = manifest.get("next_seg", 1)
+        self._segments: List[_Segment] = []
+        for name in manifest.get("segments", []):
+            try:
+                self._segments.append(_Segment(self.root, name))
+            except (OSError, ValueError):
+                continue
+        self._load_docs()
+        self._texts = (self.root / "texts.bin").open("a+b")
+        self._docs_log = (self.root / "docs.jsonl").open("a", encoding="utf-8")
+
+    def _load_docs(self):
+        path = self.root / "docs.jsonl"
+        if not path.exists():
+            return
+        flushed = self._next_doc
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    d = Doc(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                # Never hand out an id twice, even one whose postings were lost
+                self._next_doc = max(self._next_doc, d.id + 1)
+                if d.id >= flushed:
+                    # Written after the last flush; its postings were never saved
+                    continue
+                self._replace(d)
+
+    def _replace(self, d: Doc):
+        old = self._by_url.get(d.url)
+        if old is not None:
+            self._total_len -= self._docs.pop(old).length
+        self._docs[d.id] = d
+        self._by_url[d.url] = d.id
+        self._total_len += d.length
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # --- Indexing ---
+    def add(self, url: str, title: str, text: str):
+        """Index (or re-index) the plain text of `url`."""
+        text = text[:MAX_DOC_CHARS]
+        tokens = tokenize(title + "\n" + text)
+        if not tokens:
+            return
+        tf: Dict[str, int] = defaultdict(int)
+        for t in tokens:
+            tf[t] += 1
+        blob = zlib.compress(text.encode("utf-8"), 6)
+        with self._lock:
+            self._texts.seek(0, 2)
+            offset = self._texts.tell()
+            self._texts.write(blob)
+            self._texts.flush()
+            d = Doc(self._next_doc, url, title, len(tokens), offset, len(blob))
+            self._next_doc += 1
+            self._docs_log.write(json.dumps(d.__dict__, ensure_ascii=False) + "\n")
+            self._docs_log.flush()
+            self._replace(d)
+            for term, n in tf.items():
+                self._buffer[term].append((d.id, n))
+            self._buffered_docs += 1
+            full = self._buffered_docs >= FLUSH_DOCS
+        if full:
+            self.flush()  # takes the lock itself, and not while writing
+
+    def _impact(self, tf: int, length: int, avgdl: float) -> int:
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl)
+        return int(tf * (BM25_K1 + 1) / (tf + norm) / (BM25_K1 + 1) * IMPACT_SCALE)
+
+    def flush(self):
+        """
+        Write buffered postings as a new segment. The buffer stays searchable
+        while the file is written outside the index lock.
+        """
+        with self._lock:
+            if not self._buffer:
+                return
+            buf = self._flushing = self._buffer
+            self._buffer = defaultdict(list)
+            self._buffered_docs = 0
+            name = f"seg-{self._next_seg:06d}"
+            self._next_seg += 1
+            avgdl = self._avgdl()
+            lengths = {d: doc.length for d, doc in self._docs.items()}
+        postings = {}
+        for term, plist in buf.items():
+            live = [(self._impact(tf, lengths[d], avgdl), d) for d, tf in plist if d in lengths]
+            if live:
+                postings[term] = live
+        _write_segment(self.root, name, postings)
+        seg = _Segment(self.root, name)
+        with self._lock:
+            self._segments.append(seg)
+            self._flushing = {}
+            self._save_manifest()
+
+    def merge_if_needed(self) -> bool:
+        """
+        Keep at most MAX_SEGMENTS segments by merging the MERGE_FACTOR smallest,
+        so segment sizes grow geometrically and each posting is rewritten only
+        a logarithmic number of times.
+        """
+        merged = False
+        while True:
+            with self._lock:
+                if len(self._segments) <= MAX_SEGMENTS:
+                    return merged
+                smallest = sorted(self._segments, key=lambda s: s.size)[:MERGE_FACTOR]
+            self.merge(smallest)
+            merged = True
+
+    def merge(self, segments: Optional[List["_Segment"]] = None):
+        """
+        Rewrite `segments` (default: all) as one, dropping postings of replaced
+        pages. The new segment is built without holding the index lock, so
+        searches and adds keep working meanwhile.
+        """
+        with self._merge_lock:
+            with self._lock:
+                old = [s for s in (segments or self._segments) if s in self._segments]
+                if len(old) < 2:
+                    return
+                live = set(self._docs)
+                name = f"seg-{self._next_seg:06d}"
+                self._next_seg += 1
+            merged: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+            for seg in old:
+                for term in seg.terms:
+                    ids, imps = seg.postings(term, seg.terms[term][1])
+                    merged[term].extend((i, d) for d, i in zip(ids, imps) if d in live)
+            _write_segment(self.root, name, {t: p for t, p in merged.items() if p})
+            new = _Segment(self.root, name)
+            with self._lock:
+                self._segments = [new] + [s for s in self._segments if s not in old]
+                self._save_manifest()
+            for seg in old:
+                seg.close()
+                for p in (seg.post_path, seg.terms_path):
+                    try:
+                        p.unlink()
+                    except OSError:
+                        pass
+
+    def _save_manifest(self):
+        save_json(self.root / "manifest.json", {
+            "segments": [s.name for s in self._segments],
+            "next_doc": self._next_doc,
+            "next_seg": self._next_seg,
+        })
+
+    def _avgdl(self) -> float:
+        return self._total_len / len(self._docs) if self._docs else 1.0
+
+    # --- Queries ---
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Best pages for `query`; pages matching more terms always rank first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = max(len(self._docs), 1)
+            avgdl = self._avgdl()
+            scores: Dict[int, float] = defaultdict(float)
+            matched: Dict[int, int] = defaultdict(int)
+            docs = self._docs
+            for term in terms:
+                buffered = self._buffer.get(term, []) + self._flushing.get(term, [])
+                df = sum(s.df(term) for s in self._segments) + len(buffered)
+                if not df:
+                    continue
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                w = idf / IMPACT_SCALE
+                for seg in self._segments:
+                    # Split the per-term budget by each segment's share of the term
+                    share = -(-MAX_POSTINGS_PER_TERM * seg.df(term) // df)
+                    ids, imps = seg.postings(term, share)
+                    for d, imp in zip(ids, imps):
+                        if d in docs:
+                            scores[d] += w * imp
+                            matched[d] += 1
+                for d, tf in buffered:
+                    if d in docs:
+                        scores[d] += w * self._impact(tf, docs[d].length, avgdl)
+                        matched[d] += 1
+            best = heapq.nlargest(limit, scores, key=lambda d: (matched[d], scores[d]))
+            return [SearchHit(docs[d].url, docs[d].title, scores[d], self._snippet(docs[d], terms))
+                    for d in best]
+
+    def text(self, doc: Doc) -> str:
+        with self._lock:
+            self._texts.seek(doc.offset)
+            blob = self._texts.read(doc.size)
+        try:
+            return zlib.decompress(blob).decode("utf-8", "replace")
+        except zlib.error:
+            return ""
+
+    def _snippet(self, doc: Doc, terms: List[str]) -> str:
+        text = self.text(doc)
+        m = re.search(r"\b(?:" + "|".join(map(re.escape, terms)) + r")", text, re.IGNORECASE)
+        start = max(0, (m.start() if m else 0) - SNIPPET_CHARS // 3)
+        snippet = " ".join(text[start:start + SNIPPET_CHARS].split())
+        return ("…" if start else "") + snippet
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._texts.close()
+            self._docs_log.close()
+            for seg in self._segments:
+                seg.close()
+
+
+class FullTextIndexer:
+    """Feeds a FullTextIndex from a worker thread so tokenizing and disk I/O stay off the GUI thread."""
+
+    def __init__(self, root: Path):
+        self._root = root
+        self._index: Optional[FullTextIndex] = None
+        self._ready = threading.Event()
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="fulltext", daemon=True)
+        self._thread.start()
+
+    @property
+    def index(self) -> Optional[FullTextIndex]:
+        """The index, once opened; None if it could not be (e.g. an unwritable profile)."""
+        self._ready.wait()
+        return self._index
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been opened (or failed to), so index and search() do not block."""
+        return self._ready.is_set()
+
+    def submit(self, url: str, title: str, text: str):
+        self._jobs.put((url, title, text))
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        index = self.index
+        return index.search(query, limit) if index is not None else []
+
+    def _run(self):
+        try:
+            self._index = FullTextIndex(self._root)
+        except (OSError, ValueError):
+            pass  # Keep browsing without page search; submitted pages are dropped
+        finally:
+            self._ready.set()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if self._index is None:
+                continue
+            try:
+                self._index.add(*job)
+                self._index.merge_if_needed()
+            except OSError:
+                # Keep browsing even if the profile is not writable
+                pass
+
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join()
+        if self._index is not None:
+            self._index.close()
\ No newline at end of file
@@ -1,58 +1,289 @@
 import os
 import json
-from dataclasses import dataclass, asdict
-from typing import List
+import math
+import time
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
-# --- Path under AppData\Roaming\CopperBrowserV1 ---
-APPDATA_DIR = os.path.join(os.environ["APPDATA"], "CopperBrowserV1")
-os.makedirs(APPDATA_DIR, exist_ok=True)
+from .storage import JsonLinesLog, app_root, log_file
 
-HISTORY_FILE = os.path.join(APPDATA_DIR, "history.json")
+# Legacy whole-file store under AppData\Roaming\CopperBrowserV1; migrated
+# into the append-only log on first load
+LEGACY_HISTORY_NAME = "history.json"
+
+# Rewrite the log once it holds this many stale lines and more stale than live ones
+COMPACT_MIN_STALE = 1000
+
+# A visit counts half as much towards frecency after this many seconds
+FRECENCY_HALF_LIFE = 30 * 24 * 3600.0
 
 
 @dataclass
 class HistoryEntry:
     url: str
     title: str
+    visit_count: int = 0
+    first_visit: float = 0.0
+    last_visit: float = 0.0
+    score: float = 0.0  # visit weight decayed to last_visit
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "title": self.title,
+            "visit_count": self.visit_count,
+            "first_visit": self.first_visit,
+            "last_visit": self.last_visit,
+            "score": self.score,
+        }
+
+    def visit(self, ts: float, title: str = ""):
+        """Record one visit at `ts`, updating the decayed score in O(1)."""
+        if self.visit_count == 0:
+            self.first_visit = self.last_visit = ts
+            self.score = 1.0
+        elif ts >= self.last_visit:
+            self.score = self.score * _decay(ts - self.last_visit) + 1.0
+            self.last_visit = ts
+        else:
+            self.score += _decay(self.last_visit - ts)
+            self.first_visit = min(self.first_visit, ts)
+        self.visit_count += 1
+        if title:
+            self.title = title
+
+    @property
+    def frecency(self) -> float:
+        """
+        Ranking key: log2 of the score projected to a common time origin.
+        Decay does not change the order, so keys never need recomputing.
+        """
+        if self.score <= 0:
+            return float("-inf")
+        return math.log2(self.score) + self.last_visit / FRECENCY_HALF_LIFE
+
+    def frecency_at(self, now: float) -> float:
+        """Decayed visit weight as seen at `now` (1.0 == one visit just now)."""
+        return self.score * _decay(now - self.last_visit)
+
+
+def _decay(dt: float) -> float:
+    return 2.0 ** (-dt / FRECENCY_HALF_LIFE)
+
+
+# The log format is shared with other stores; see storage.JsonLinesLog
+HistoryLog = JsonLinesLog
 
 
 class History:
-    def __init__(self):
-        self.entries: List[HistoryEntry] = []
+    """URL-keyed history: one entry per unique URL, ordered by last visit."""
+
+    def __init__(self, log: Optional[HistoryLog] = None):
+        self._log = log
+        self._index: Optional[Dict[str, HistoryEntry]] = None
+        self._lines = 0  # records currently in the log
+        # Lets worker threads load and write the log while the GUI thread keeps adding.
+        # Disk writes hold only _io_lock (taken before _lock), so add() never waits on them
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+    @property
+    def index(self) -> Dict[str, HistoryEntry]:
+        """Entries are read from the log on first access, not at startup."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._load()
+        return self._index
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    @property
+    def entries(self) -> List[HistoryEntry]:
+        return list(self.index.values())
+
+    def _load(self):
+        # Build privately so readers never see a half-loaded index
+        index: Dict[str, HistoryEntry] = {}
+        self._lines = 0
+        if self._log is not None:
+            for rec in self._log.read():
+                self._lines += 1
+                try:
+                    _apply(index, rec)
+                except (KeyError, TypeError, ValueError):
+                    continue
+            # Visits added before the load that are not written yet
+            for rec in self._log.pending:
+                _apply(index, rec)
+        # A compaction that is due is left to the next persist()
+        self._index = index
+
+    def add(self, url: str, title: str, ts: Optional[float] = None) -> Optional[HistoryEntry]:
+        """
+        Record a visit to `url`; repeat visits update the existing entry.
+        Returns the entry, or None while history has not been loaded yet.
+        """
+        rec = {"url": url, "title": title, "ts": time.time() if ts is None else ts}
+        with self._lock:
+            entry = _apply(self._index, rec) if self._index is not None else None
+            if self._log is not None:
+                self._log.append(rec)
+                self._lines += 1
+        return entry
+
+    def get(self, url: str) -> Optional[HistoryEntry]:
+        """Return the entry for `url`, or None if it was never visited."""
+        return self.index.get(url)
 
-    def add(self, url: str, title: str):
-        """Add a new entry to history."""
-        self.entries.append(HistoryEntry(url, title))
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
 
     def list(self) -> List[HistoryEntry]:
-        """Return all history entries."""
+        """Return all history entries, oldest visit first."""
         return self.entries
 
+    def top(self, n: int) -> List[HistoryEntry]:
+        """Return the `n` entries with the highest frecency."""
+        return heapq.nlargest(n, self.index.values(), key=lambda e: e.frecency)
+
     def clear(self):
         """Remove all history entries."""
-        self.entries = []
+        with self._io_lock, self._lock:
+            self._index = {}
+            self._lines = 0
+            if self._log is not None:
+                self._log.take()
+                self._log.rewrite([])
+
+    def persist(self):
+        """Write buffered visits, compacting the log instead if that is due."""
+        if self._log is None:
+            return
+        with self._io_lock:
+            with self._lock:
+                due = self._compact_due()
+            self._write(due)
+
+    def compact_if_needed(self) -> bool:
+        """Rewrite the log without stale lines once they outweigh live entries."""
+        if self._log is None:
+            return False
+        with self._io_lock:
+            with self._lock:
+                due = self._compact_due()
+            if due:
+                self._write(True)
+            return due
+
+    def compact(self):
+        """Rewrite the log as one snapshot record per unique URL."""
+        self.index  # load first
+        if self._log is None:
+            return
+        with self._io_lock:
+            self._write(True)
 
+    def _compact_due(self) -> bool:
+        if self._index is None or self._log is None:
+            return False
+        stale = self._lines - len(self._index)
+        return stale >= COMPACT_MIN_STALE and stale > len(self._index)
 
-def load_history() -> History:
-    """Load history from JSON file into a History object."""
-    h = History()
-    if os.path.exists(HISTORY_FILE):
+    def _write(self, compact: bool):
+        # Caller holds _io_lock. The records are taken under _lock and written
+        # outside it; a compaction snapshot includes every buffered visit
+        snapshot = None
+        with self._lock:
+            lines = self._lines
+            taken = self._log.take()
+            if compact:
+                snapshot = [e.to_dict() for e in self._index.values()]
+                self._lines = len(snapshot)
         try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                for item in data:
-                    h.entries.append(HistoryEntry(**item))
-        except Exception:
-            # If file is corrupt or unreadable, start fresh
-            pass
-    return h
-
-
-def save_history(history: History):
-    """Save history entries to JSON file."""
+            if snapshot is not None:
+                self._log.rewrite(snapshot)
+            else:
+                self._log.write(taken)
+        except BaseException:
+            with self._lock:
+                self._log.pending[:0] = taken  # retried by the next persist()
+                if snapshot is not None:
+                    self._lines += lines - len(snapshot)
+            raise
+
+    def close(self):
+        """Write any buffered visits and close the log."""
+        if self._log is None:
+            return
+        with self._io_lock, self._lock:
+            try:
+                self._log.flush()
+            except OSError:
+                pass  # Fail silently; the profile is not writable
+            self._log.close()
+
+
+def _apply(index: Dict[str, HistoryEntry], rec: dict) -> HistoryEntry:
+    url = rec["url"]
+    if "visit_count" in rec:
+        # Compacted snapshot of an entry
+        e = HistoryEntry(url, rec.get("title", ""), int(rec["visit_count"]),
+                         float(rec["first_visit"]), float(rec["last_visit"]), float(rec["score"]))
+    else:
+        e = index.get(url) or HistoryEntry(url, "")
+        e.visit(float(rec.get("ts", 0.0)), rec.get("title", ""))
+    # Re-insert so the dict stays ordered by last visit
+    index.pop(url, None)
+    index[url] = e
+    return e
+
+
+def _migrate_legacy(log: HistoryLog):
+    """One-time import of the old history.json into the log; the old file is kept as .bak."""
+    legacy = app_root() / LEGACY_HISTORY_NAME
+    if log.exists() or not legacy.exists():
+        return
+    try:
+        with legacy.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        # The old format has no timestamps; date its visits by the file itself
+        ts = legacy.stat().st_mtime
+        records = [{"url": item["url"], "title": item.get("title", ""), "ts": ts} for item in data]
+    except Exception:
+        # If file is corrupt or unreadable, start fresh
+        records = []
+    log.rewrite(records)
+    try:
+        os.replace(legacy, legacy.with_name(legacy.name + ".bak"))
+    except OSError:
+        pass
+
+
+def load_history(profile: str = "default") -> History:
+    """Open the profile's history log; entries are read lazily on first use."""
+    log = HistoryLog(log_file("history", profile))
+    _migrate_legacy(log)
+    return History(log)
+
+
+def save_history(history: History, writer=None):
+    """
+    Write buffered visits (compacting the log if due). With a PersistenceWriter
+    this happens on its thread and bursts of page loads share one write.
+    """
+    if writer is not None:
+        writer.submit(f"history-{id(history)}", history.persist)
+        return
     try:
-        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-            json.dump([asdict(e) for e in history.entries], f, indent=2)
+        history.persist()
     except Exception:
         # Fail silently if file cannot be written
         pass
\ No newline at end of file
@@ -1,23 +1,102 @@
+import time
+_T0 = time.perf_counter()  # before the imports, so --profile-startup can time them
+
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication
 
 from copper_browser.config import Config
-from copper_browser.browser_window import MainWindow
+from copper_browser.engine_presets import PRESETS, apply_preset
+from copper_browser.storage import valid_profile_name
+from copper_browser.startup import StartupProfiler
+from copper_browser.single_instance import (
+    InstanceBusy, InstanceServer, command_line_urls, forward, server_name
+)
+
+
+def _profile_name(name: str) -> str:
+    if not valid_profile_name(name):
+        raise argparse.ArgumentTypeError(f"invalid profile name: {name!r}")
+    return name
+
+
+def parse_args(argv):
+    """Split our options from the rest, which are passed on to Qt."""
+    parser = argparse.ArgumentParser(prog="CopperBrowser")
+    parser.add_argument("--profile", type=_profile_name, default=None,
+                        help="name of the on-disk profile to use (default: Config.profile)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a per-phase startup timing breakdown to stderr")
+    parser.add_argument("--engine-preset", choices=sorted(PRESETS), default=None,
+                        help="Chromium process/raster preset (default: Config.engine_preset)")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="start a separate browser even if one is running on the profile")
+    parser.add_argument("urls", nargs="*", metavar="URL",
+                        help="pages to open; handed to the running browser if there is one")
+    return parser.parse_known_args(argv[1:])
 
 
 def main():
     """
     Entry point for CopperBrowser.
     Creates the QApplication, loads config, and launches the main window.
+    The web engine, first tab and indexes start once the event loop runs.
+    If a browser already runs on the profile, the URLs go to it instead and
+    this process exits before Qt widgets or the web engine are loaded.
     """
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
 
     # Load configuration (homepage, user agent, search engine, etc.)
     config = Config()
+    if args.profile:
+        config.profile = args.profile
+    if args.engine_preset:
+        config.engine_preset = args.engine_preset
+
+    urls = command_line_urls(args.urls)
+    name = server_name(config.profile) if config.single_instance and not args.new_instance else None
+    if name is not None:
+        try:
+            if forward(name, urls):
+                return
+        except InstanceBusy as e:
+            print(f"CopperBrowser is running on profile {config.profile!r} but not responding: {e}",
+                  file=sys.stderr)
+            sys.exit(1)
+
+    from PyQt6.QtWidgets import QApplication
+    from copper_browser.browser_window import MainWindow
+    profiler = StartupProfiler(args.profile_startup, _T0)
+    profiler.mark("imports")
+
+    # Chromium switches are read once, when the web engine starts
+    if apply_preset(config.engine_preset) is None:
+        print(f"unknown engine preset {config.engine_preset!r}; using default", file=sys.stderr)
+        config.engine_preset = "default"
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    profiler.mark("QApplication")
+
+    # Later launches on this profile hand their URLs to this process
+    server = None
+    if name is not None:
+        server = InstanceServer(name, app)
+        if not server.listen():
+            # Another launch may have won the race since forward() found nobody
+            try:
+                if forward(name, urls):
+                    return
+            except InstanceBusy:
+                pass
+            print(f"single-instance mode unavailable: {server.error()}", file=sys.stderr)
+            server = None
 
     # Create and show the main browser window
-    window = MainWindow(config)
+    window = MainWindow(config, profiler)
+    window.open_urls(urls)
+    if server is not None:
+        server.urlsReceived.connect(window.open_urls)
     window.show()
+    profiler.mark("window")
 
     # Run the Qt event loop
     sys.exit(app.exec())
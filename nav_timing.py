@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from PyQt6.QtCore import QObject
+
+from .storage import JsonLinesLog
+
+# Navigations kept in memory for the Performance panel
+NAV_BUFFER_SIZE = 1000
+
+# The JSONL sink is rotated to <name>.1 once it grows past this
+NAV_LOG_MAX_BYTES = 16 * 1024 * 1024
+
+# loadProgress steps kept per navigation (the first ones are the interesting ones)
+MAX_PROGRESS_STEPS = 50
+
+# Navigation Timing and paint entries, in ms from the start of the navigation
+_NAV_TIMING_JS = """
+(function () {
+    var out = {timing: {}, paint: {}};
+    var n = performance.getEntriesByType('navigation')[0];
+    if (n) {
+        out.timing = {
+            type: n.type,
+            redirect: n.redirectEnd - n.redirectStart,
+            dns: n.domainLookupEnd - n.domainLookupStart,
+            connect: n.connectEnd - n.connectStart,
+            tls: n.secureConnectionStart > 0 ? n.connectEnd - n.secureConnectionStart : 0,
+            ttfb: n.responseStart,
+            response: n.responseEnd - n.responseStart,
+            dom_interactive: n.domInteractive,
+            dom_content_loaded: n.domContentLoadedEventEnd,
+            load_event: n.loadEventEnd || n.loadEventStart,
+            transfer_size: n.transferSize,
+            body_size: n.encodedBodySize
+        };
+    }
+    performance.getEntriesByType('paint').forEach(function (p) {
+        out.paint[p.name] = p.startTime;
+    });
+    return out;
+})()
+"""
+
+
+@dataclass
+class NavRecord:
+    url: str
+    host: str
+    started: float            # wall clock, seconds since the epoch
+    ok: bool
+    load_ms: float            # loadStarted to loadFinished, as seen by the browser
+    progress: List[list] = field(default_factory=list)  # [ms since start, percent]
+    timing: Dict[str, object] = field(default_factory=dict)
+    paint: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "host": self.host,
+            "started": self.started,
+            "ok": self.ok,
+            "load_ms": self.load_ms,
+            "progress": self.progress,
+            "timing": self.timing,
+            "paint": self.paint,
+        }
+
+
+@dataclass
+class HostStats:
+    host: str
+    loads: int = 0
+    failed: int = 0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    last_ms: float = 0.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (0 for none); q in [0, 1]."""
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, max(0, int(q * len(s) + 0.5) - 1))]
+
+
+class NavTimingLog:
+    """
+    The last `size` navigations in a ring buffer, optionally also appended
+    to a JSON-lines sink. Sink writes go through the PersistenceWriter when
+    one is given, like history.
+    """
+
+    def __init__(self, size: int = NAV_BUFFER_SIZE, sink: Optional[JsonLinesLog] = None, writer=None):
+        self._records = deque(maxlen=max(1, size))
+        self._sink = sink
+        self._writer = writer
+        # The sink is written on the writer's thread while records keep arriving
+        self._lock = threading.Lock()
+
+    def add(self, rec: NavRecord):
+        self._records.append(rec)
+        if self._sink is None:
+            return
+        with self._lock:
+            self._sink.append(rec.to_dict())
+        if self._writer is not None:
+            self._writer.submit(f"navtiming-{id(self)}", self.flush)
+        else:
+            self.flush()
+
+    def records(self) -> List[NavRecord]:
+        """Buffered navigations, oldest first."""
+        return list(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def clear(self):
+        """Empty the buffer; the sink keeps what it has."""
+        self._records.clear()
+
+    def host_stats(self) -> List[HostStats]:
+        """Load-time percentiles of successful navigations per host, slowest p95 first."""
+        times: Dict[str, List[float]] = {}
+        stats: Dict[str, HostStats] = {}
+        for rec in self._records:
+            s = stats.get(rec.host)
+            if s is None:
+                s = stats[rec.host] = HostStats(rec.host)
+            s.loads += 1
+            if not rec.ok:
+                s.failed += 1
+                continue
+            times.setdefault(rec.host, []).append(rec.load_ms)
+            s.last_ms = rec.load_ms
+        for host, s in stats.items():
+            values = times.get(host, [])
+            s.p50_ms = percentile(values, 0.50)
+            s.p95_ms = percentile(values, 0.95)
+        return sorted(stats.values(), key=lambda s: s.p95_ms, reverse=True)
+
+    def export(self, path):
+        """Write the buffered navigations to `path` as JSON lines (atomically)."""
+        JsonLinesLog(path).rewrite([r.to_dict() for r in self.records()])
+
+    def flush(self):
+        if self._sink is None:
+            return
+        with self._lock:
+            self._sink.flush()
+            try:
+                big = self._sink.path.stat().st_size > NAV_LOG_MAX_BYTES
+            except OSError:
+                big = False
+            if big:
+                self._sink.close()
+                os.replace(self._sink.path, self._sink.path.with_name(self._sink.path.name + ".1"))
+
+    def close(self):
+        if self._sink is None:
+            return
+        with self._lock:
+            try:
+                self._sink.flush()
+            except OSError:
+                pass  # Fail silently; the profile is not writable
+            self._sink.close()
+
+
+class NavTimingRecorder(QObject):
+    """
+    Times every navigation of the tabs it is attached to: loadStarted,
+    each loadProgress step and loadFinished, then the page's own Navigation
+    Timing and paint entries (via runJavaScript). Finished records go to a
+    NavTimingLog.
+    """
+
+    def __init__(self, log: NavTimingLog, parent=None):
+        super().__init__(parent)
+        self.log = log
+        self._inflight: Dict[int, list] = {}  # id(tab) -> [started, t0, progress]
+
+    def attach(self, tab):
+        view = tab.view
+        key = id(tab)
+        view.loadStarted.connect(lambda k=key: self._on_started(k))
+        view.loadProgress.connect(lambda p, k=key: self._on_progress(k, p))
+        view.loadFinished.connect(lambda ok, t=tab: self._on_finished(t, ok))
+        tab.destroyed.connect(lambda _=None, k=key: self._inflight.pop(k, None))
+
+    def _on_started(self, key: int):
+        self._inflight[key] = [time.time(), time.monotonic(), []]
+
+    def _on_progress(self, key: int, percent: int):
+        nav = self._inflight.get(key)
+        if nav is None or len(nav[2]) >= MAX_PROGRESS_STEPS:
+            return
+        if not nav[2] or nav[2][-1][1] != percent:
+            nav[2].append([round((time.monotonic() - nav[1]) * 1000, 1), percent])
+
+    def _on_finished(self, tab, ok: bool):
+        nav = self._inflight.pop(id(tab), None)
+        if nav is None:
+            return  # finished without a start we saw (e.g. attached mid-load)
+        started, t0, progress = nav
+        url = tab.view.url().toString()
+        if not url.startswith(("http://", "https://")):
+            return
+        rec = NavRecord(url, urlsplit(url).hostname or "", started, ok,
+                        round((time.monotonic() - t0) * 1000, 1), progress)
+        if not ok:
+            self.log.add(rec)
+            return
+        tab.view.page().runJavaScript(_NAV_TIMING_JS, lambda r, rec=rec: self._on_timing(rec, r))
+
+    def _on_timing(self, rec: NavRecord, result):
+        if isinstance(result, dict):
+            rec.timing = {k: round(v, 1) if isinstance(v, float) else v
+                          for k, v in (result.get("timing") or {}).items()}
+            rec.paint = {k: round(float(v), 1) for k, v in (result.get("paint") or {}).items()}
+        self.log.add(rec)
\ No newline at end of file
@@ -0,0 +1,154 @@
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .storage import save_json
+
+# Wait this long after the last change to an item before writing it
+WRITE_DELAY_S = 1.0
+
+# ...but never hold back an item that keeps changing for longer than this
+MAX_DELAY_S = 5.0
+
+
+@dataclass
+class WriterStats:
+    pending: int = 0      # items waiting to be written
+    scheduled: int = 0    # save requests received
+    coalesced: int = 0    # requests folded into an already pending write
+    written: int = 0
+    failed: int = 0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    total_ms: float = 0.0
+    last_error: str = ""
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.written if self.written else 0.0
+
+
+class _Job:
+    __slots__ = ("fn", "due", "deadline")
+
+    def __init__(self, fn, due, deadline):
+        self.fn = fn
+        self.due = due
+        self.deadline = deadline
+
+
+class PersistenceWriter:
+    """
+    Writes profile data on a worker thread. Saves are keyed (usually by file
+    path): a save of a key that is already pending replaces the pending one
+    and pushes it back by `delay`, up to `max_delay` after the first, so a
+    burst of changes costs one write. The GUI thread only hands over a
+    callable; serializing and disk I/O happen here.
+    """
+
+    def __init__(self, delay: float = WRITE_DELAY_S, max_delay: float = MAX_DELAY_S):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._jobs: Dict[str, _Job] = {}
+        self._running: Optional[str] = None
+        self._stats = WriterStats()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self._thread.start()
+
+    # --- Scheduling ---
+    def submit(self, key: str, fn: Callable[[], None]):
+        """
+        Run `fn` on the writer thread once `key` has been quiet for `delay`.
+        After close() it runs right away on the caller's thread, so a save
+        from a slot that fires during shutdown is still written.
+        """
+        now = time.monotonic()
+        with self._cond:
+            if not self._closed:
+                self._stats.scheduled += 1
+                job = self._jobs.get(key)
+                if job is None:
+                    self._jobs[key] = _Job(fn, now + self.delay, now + self.max_delay)
+                else:
+                    self._stats.coalesced += 1
+                    job.fn = fn
+                    job.due = min(now + self.delay, job.deadline)
+                self._cond.notify_all()
+                return
+        try:
+            fn()
+        except Exception as e:
+            with self._cond:
+                self._stats.failed += 1
+                self._stats.last_error = f"{key}: {e!r}"
+
+    def save_json(self, path: Path, producer: Callable[[], Any]):
+        """Atomically write `producer()` to `path`; the producer runs on the writer thread."""
+        self.submit(str(path), lambda: save_json(path, producer()))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything pending now and wait for it; False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            now = time.monotonic()
+            for job in self._jobs.values():
+                job.due = now
+            self._cond.notify_all()
+            while self._jobs or self._running is not None:
+                left = None if end is None else end - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush pending writes and stop the thread (call on application quit)."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    @property
+    def stats(self) -> WriterStats:
+        """A snapshot of the counters."""
+        with self._cond:
+            return replace(self._stats, pending=len(self._jobs) + (self._running is not None))
+
+    # --- Worker ---
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed and not self._jobs:
+                        return
+                    now = time.monotonic()
+                    key = min(self._jobs, key=lambda k: self._jobs[k].due, default=None)
+                    if key is not None and self._jobs[key].due <= now:
+                        break
+                    self._cond.wait(None if key is None else self._jobs[key].due - now)
+                job = self._jobs.pop(key)
+                self._running = key
+            t0 = time.perf_counter()
+            error = ""
+            try:
+                job.fn()
+            except Exception as e:
+                # Keep the writer alive; the failure shows up in stats
+                error = f"{key}: {e!r}"
+            ms = (time.perf_counter() - t0) * 1000
+            with self._cond:
+                self._running = None
+                if error:
+                    self._stats.failed += 1
+                    self._stats.last_error = error
+                else:
+                    self._stats.written += 1
+                    self._stats.last_ms = ms
+                    self._stats.max_ms = max(self._stats.max_ms, ms)
+                    self._stats.total_ms += ms
+                self._cond.notify_all()
\ No newline at end of file
@@ -0,0 +1,199 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer, QUrl
+
+from .completion import Suggestion, normalize, top_confidence
+from .tab_lifecycle import rss_mb
+
+# Wait for typing to pause before acting on the top suggestion
+PREDICT_DELAY_MS = 200
+
+# Unused prerenders are dropped after this many seconds
+PRERENDER_TTL_S = 60
+
+# Do not preconnect to the same origin again within this many seconds
+PRECONNECT_TTL_S = 30
+
+# Hint the network stack from the current page; connections are shared per profile
+_PRECONNECT_JS = """
+(function (href) {
+    ['dns-prefetch', 'preconnect'].forEach(function (rel) {
+        var l = document.createElement('link');
+        l.rel = rel;
+        l.href = href;
+        (document.head || document.documentElement).appendChild(l);
+    });
+})(%s)
+"""
+
+
+@dataclass
+class PrerenderStats:
+    preconnects: int = 0
+    prerenders: int = 0
+    hits: int = 0      # navigations served by a prerendered tab
+    misses: int = 0    # navigations that had to load cold
+    wasted: int = 0    # prerenders dropped unused (expired, evicted, over budget, failed)
+    saved_ms: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses ({self.hit_ratio:.0%}), "
+                f"{self.wasted} wasted, {self.saved_ms / 1000:.1f} s saved")
+
+
+class Prerender:
+    """A hidden tab loading `url`; load_ms is set once it has loaded."""
+    __slots__ = ("tab", "url", "started", "load_ms")
+
+    def __init__(self, tab, url: str):
+        self.tab = tab
+        self.url = url
+        self.started = time.monotonic()
+        self.load_ms: Optional[float] = None  # None while still loading
+
+
+class Prerenderer(QObject):
+    """
+    Speculative loading for address-bar navigations. When the top suggestion
+    is likely enough (completion.top_confidence), its page is loaded in a
+    hidden, muted BrowserTab; a less likely one only gets a DNS lookup and a
+    preconnect. take() hands a matching hidden tab to MainWindow to swap in.
+
+    Budget (Config): prerender_max_tabs hidden tabs at most, each dropped if
+    its renderer exceeds prerender_memory_mb; prerender_confidence and
+    preconnect_confidence are the thresholds.
+    """
+
+    def __init__(self, make_tab: Callable, current_tab: Callable, config, parent=None):
+        super().__init__(parent)
+        self._make_tab = make_tab
+        self._current_tab = current_tab
+        self.config = config
+        self.stats = PrerenderStats()
+        self._hidden: "OrderedDict[str, Prerender]" = OrderedDict()  # normalized url -> prerender
+        self._preconnected: Dict[str, float] = {}  # origin -> time
+        self._suggestions: List[Suggestion] = []
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(PREDICT_DELAY_MS)
+        self._timer.timeout.connect(self._predict_now)
+        self._expiry = QTimer(self)
+        self._expiry.setInterval(PRERENDER_TTL_S * 1000 // 4)
+        self._expiry.timeout.connect(self._expire)
+
+    # --- Prediction ---
+    def predict(self, suggestions: List[Suggestion]):
+        """Called with the address-bar suggestions as the user types."""
+        self._suggestions = suggestions
+        if self.config.prerender and suggestions:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _predict_now(self):
+        suggestions = self._suggestions
+        url = suggestions[0].url if suggestions else ""
+        if not url.startswith(("http://", "https://")):
+            return
+        p = top_confidence(suggestions)
+        if p >= self.config.prerender_confidence and self.config.prerender_max_tabs > 0:
+            self.prerender(url)
+        elif p >= self.config.preconnect_confidence:
+            self.preconnect(url)
+
+    def preconnect(self, url: str):
+        q = QUrl(url)
+        origin = q.adjusted(QUrl.UrlFormattingOption.RemovePath | QUrl.UrlFormattingOption.RemoveQuery
+                            | QUrl.UrlFormattingOption.RemoveFragment).toString()
+        now = time.monotonic()
+        if not q.host() or now - self._preconnected.get(origin, -PRECONNECT_TTL_S) < PRECONNECT_TTL_S:
+            return
+        tab = self._current_tab()
+        if tab is None:
+            return
+        self._preconnected[origin] = now
+        tab.view.page().runJavaScript(_PRECONNECT_JS % json.dumps(origin))
+        self.stats.preconnects += 1
+
+    def prerender(self, url: str):
+        key = normalize(url)
+        if key in self._hidden:
+            self._hidden.move_to_end(key)
+            return
+        tab = self._current_tab()
+        if tab is not None and normalize(tab.url) == key:
+            return
+        while len(self._hidden) >= self.config.prerender_max_tabs:
+            self._drop(next(iter(self._hidden)))
+        tab = self._make_tab()
+        tab.hide()
+        tab.view.page().setAudioMuted(True)
+        p = Prerender(tab, url)
+        tab.view.loadFinished.connect(lambda ok, p=p: self._on_loaded(p, ok))
+        self._hidden[key] = p
+        tab.load(url)
+        self.stats.prerenders += 1
+        self._expiry.start()
+
+    def _on_loaded(self, p: Prerender, ok: bool):
+        key = normalize(p.url)
+        if self._hidden.get(key) is not p or p.load_ms is not None:
+            return  # taken or dropped, or a later in-page load
+        p.load_ms = (time.monotonic() - p.started) * 1000
+        if not ok:
+            self._drop(key)
+            return
+        pid = p.tab.view.page().renderProcessPid()
+        if pid > 0 and os.name != "nt" and rss_mb(pid) > self.config.prerender_memory_mb:
+            self._drop(key)
+
+    # --- Use ---
+    def take(self, url: str) -> Optional[Prerender]:
+        """
+        The prerender of `url`, whose tab now belongs to the caller (unmuted),
+        or None. Either way the navigation is counted as a hit or a miss.
+        """
+        if not self.config.prerender:
+            return None
+        key = normalize(url)
+        p = self._hidden.pop(key, None)
+        if p is None:
+            self.stats.misses += 1
+            return None
+        elapsed = (time.monotonic() - p.started) * 1000
+        self.stats.hits += 1
+        self.stats.saved_ms += p.load_ms if p.load_ms is not None else elapsed
+        p.tab.view.page().setAudioMuted(False)
+        return p
+
+    def _drop(self, key: str):
+        p = self._hidden.pop(key, None)
+        if p is None:
+            return
+        self.stats.wasted += 1
+        p.tab.deleteLater()
+
+    def _expire(self):
+        now = time.monotonic()
+        for key, p in list(self._hidden.items()):
+            if now - p.started > PRERENDER_TTL_S:
+                self._drop(key)
+        if not self._hidden:
+            self._expiry.stop()
+
+    def clear(self):
+        """Drop every prerender (e.g. on quit)."""
+        self._timer.stop()
+        for key in list(self._hidden):
+            self._drop(key)
\ No newline at end of file
@@ -0,0 +1,222 @@
+import json
+import time
+import urllib.parse
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+from .config import SEARCH_ENGINES, SUGGEST_ENDPOINTS
+
+# Wait this long after the last keystroke before asking the engine
+SUGGEST_DELAY_MS = 150
+
+# Give up on a suggestion request after this long
+SUGGEST_TIMEOUT_MS = 2000
+
+# Cached prefixes, and how long their suggestions stay fresh
+CACHE_ENTRIES = 512
+CACHE_TTL_S = 10 * 60
+
+# Phrases kept per response
+MAX_SUGGESTIONS = 8
+
+
+def is_search_query(text: str) -> bool:
+    """What MainWindow.on_go sends to the search engine rather than opening as an address."""
+    return "://" not in text and "." not in text
+
+
+def search_url(template: str, text: str) -> str:
+    """The search engine's results URL for `text`."""
+    return template.replace("{query}", urllib.parse.quote_plus(text))
+
+
+def engine_name(template: str) -> str:
+    """The SEARCH_ENGINES name of a search URL template, or "" for a custom one."""
+    return next((name for name, url in SEARCH_ENGINES.items() if url == template), "")
+
+
+def suggest_endpoint(config) -> str:
+    """
+    Suggestion URL template ({query}) for the configured engine:
+    Config.suggest_endpoints (by engine name, or by search URL for a custom
+    engine) wins over the built-in SUGGEST_ENDPOINTS; "" means none.
+    """
+    name = engine_name(config.search_engine)
+    overrides = config.suggest_endpoints or {}
+    return overrides.get(name) or overrides.get(config.search_engine) or SUGGEST_ENDPOINTS.get(name, "")
+
+
+def parse_suggestions(body: bytes) -> List[str]:
+    """
+    OpenSearch suggestions (["query", ["a", "b", ...], ...]), a plain list
+    of strings, or a list of {"phrase": ...} objects.
+    """
+    try:
+        data = json.loads(body.decode("utf-8", "replace"))
+    except ValueError:
+        return []
+    if isinstance(data, list) and len(data) >= 2 and isinstance(data[0], str) and isinstance(data[1], list):
+        data = data[1]
+    if not isinstance(data, list):
+        return []
+    out = []
+    for item in data:
+        if isinstance(item, dict):
+            item = item.get("phrase")
+        if isinstance(item, str) and item and item not in out:
+            out.append(item)
+    return out[:MAX_SUGGESTIONS]
+
+
+class SuggestCache:
+    """LRU of suggestion lists keyed by (endpoint, prefix); entries expire after `ttl`."""
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES, ttl: float = CACHE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._items: "OrderedDict[Tuple[str, str], Tuple[float, List[str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _prefix(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def get(self, endpoint: str, text: str, now: Optional[float] = None) -> Optional[List[str]]:
+        key = (endpoint, self._prefix(text))
+        item = self._items.get(key)
+        now = time.monotonic() if now is None else now
+        if item is None or now - item[0] > self.ttl:
+            if item is not None:
+                del self._items[key]
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def put(self, endpoint: str, text: str, phrases: List[str], now: Optional[float] = None):
+        key = (endpoint, self._prefix(text))
+        self._items[key] = (time.monotonic() if now is None else now, phrases)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def narrowed(self, endpoint: str, text: str) -> List[str]:
+        """Cached phrases of the longest shorter prefix that still match `text` (a stopgap while fetching)."""
+        prefix = self._prefix(text)
+        now = time.monotonic()
+        for n in range(len(prefix) - 1, 0, -1):
+            item = self._items.get((endpoint, prefix[:n]))
+            if item is not None and now - item[0] <= self.ttl:
+                return [p for p in item[1] if p.lower().startswith(prefix)]
+        return []
+
+    def clear(self):
+        self._items.clear()
+
+
+@dataclass
+class SuggestStats:
+    requests: int = 0    # sent to the engine
+    cancelled: int = 0   # aborted because the text changed first
+    failed: int = 0
+    total_ms: float = 0.0
+    answered: int = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.answered if self.answered else 0.0
+
+
+class SearchSuggester(QObject):
+    """
+    Search-engine query suggestions for the address bar. Keystrokes are
+    debounced; a request still running when the text changes is aborted.
+    All requests go through one QNetworkAccessManager, which keeps the
+    connection to the engine alive between them. Answers are cached by
+    endpoint and prefix, so a prefix seen recently is answered at once.
+
+    `suggested` carries the text the phrases are for; drop it if the
+    address bar has moved on.
+    """
+
+    suggested = pyqtSignal(str, list)
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.user_agent = config.user_agent
+        self.cache = SuggestCache()
+        self.stats = SuggestStats()
+        self._nam = QNetworkAccessManager(self)
+        self._reply: Optional[QNetworkReply] = None
+        self._text = ""
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SUGGEST_DELAY_MS)
+        self._timer.timeout.connect(self._fetch)
+
+    def request(self, text: str):
+        """Suggestions for `text` as typed so far; cached ones are emitted immediately."""
+        self._text = text = text.strip()
+        self._timer.stop()
+        self._abort()
+        endpoint = suggest_endpoint(self.config)
+        if not (self.config.search_suggestions and endpoint and text and is_search_query(text)):
+            return
+        phrases = self.cache.get(endpoint, text)
+        if phrases is not None:
+            self.suggested.emit(text, phrases)
+            return
+        narrowed = self.cache.narrowed(endpoint, text)
+        if narrowed:
+            self.suggested.emit(text, narrowed)
+        self._timer.start()
+
+    def _abort(self):
+        if self._reply is not None:
+            reply, self._reply = self._reply, None
+            self.stats.cancelled += 1
+            reply.abort()
+
+    def _fetch(self):
+        endpoint = suggest_endpoint(self.config)
+        if not endpoint:
+            return
+        url = endpoint.replace("{query}", urllib.parse.quote(self._text, safe=""))
+        req = QNetworkRequest(QUrl(url))
+        req.setTransferTimeout(SUGGEST_TIMEOUT_MS)
+        req.setHeader(QNetworkRequest.KnownHeaders.UserAgentHeader, self.user_agent)
+        reply = self._nam.get(req)
+        self._reply = reply
+        self.stats.requests += 1
+        t0 = time.perf_counter()
+        reply.finished.connect(lambda r=reply, text=self._text: self._on_finished(r, endpoint, text, t0))
+
+    def _on_finished(self, reply: QNetworkReply, endpoint: str, text: str, t0: float):
+        reply.deleteLater()
+        if reply is not self._reply:
+            return  # aborted; a newer request (if any) owns the text
+        self._reply = None
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            self.stats.failed += 1
+            return
+        self.stats.answered += 1
+        self.stats.total_ms += (time.perf_counter() - t0) * 1e3
+        phrases = parse_suggestions(bytes(reply.readAll()))
+        self.cache.put(endpoint, text, phrases)
+        if text == self._text:
+            self.suggested.emit(text, phrases)
+
+    def clear(self):
+        self._timer.stop()
+        self._abort()
+        self.cache.clear()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import base64
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional
+
+from PyQt6.QtCore import Qt, QByteArray, QDataStream, QIODevice
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+
+from .storage import data_file, save_json, load_json
+
+SESSION_NAME = "session"
+
+# Crash-recovery checkpoint period; an unchanged session is not rewritten
+CHECKPOINT_INTERVAL_MS = 30_000
+
+
+@dataclass
+class TabState:
+    url: str
+    title: str = ""
+    history: str = ""  # base64 of the serialized QWebEngineHistory
+
+
+@dataclass
+class SessionState:
+    tabs: List[TabState] = field(default_factory=list)
+    current: int = 0
+
+    def to_dict(self) -> dict:
+        return {"tabs": [asdict(t) for t in self.tabs], "current": self.current}
+
+    @staticmethod
+    def from_dict(d: dict) -> "SessionState":
+        tabs = []
+        for t in d.get("tabs", []):
+            try:
+                tabs.append(TabState(t["url"], t.get("title", ""), t.get("history", "")))
+            except (KeyError, TypeError):
+                continue
+        current = d.get("current", 0)
+        return SessionState(tabs, current if isinstance(current, int) else 0)
+
+
+def serialize_history(history) -> str:
+    """QWebEngineHistory -> base64 text, or "" if it cannot be streamed."""
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.OpenModeFlag.WriteOnly)
+    try:
+        stream << history
+    except TypeError:
+        return ""
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def restore_history(history, encoded: str) -> bool:
+    """Load base64 history written by serialize_history(); False if it could not be used."""
+    if not encoded:
+        return False
+    try:
+        data = QByteArray(base64.b64decode(encoded))
+        stream = QDataStream(data, QIODevice.OpenModeFlag.ReadOnly)
+        stream >> history
+    except (TypeError, ValueError):
+        return False
+    return stream.status() == QDataStream.Status.Ok and history.count() > 0
+
+
+def save_session(state: SessionState, profile: str = "default", writer=None):
+    """Save the session (on `writer`'s thread when a PersistenceWriter is given)."""
+    path = data_file(SESSION_NAME, profile)
+    if writer is not None:
+        writer.save_json(path, state.to_dict)
+    else:
+        save_json(path, state.to_dict())
+
+
+def load_session(profile: str = "default") -> Optional[SessionState]:
+    d = load_json(data_file(SESSION_NAME, profile), None)
+    if not isinstance(d, dict):
+        return None
+    state = SessionState.from_dict(d)
+    return state if state.tabs else None
+
+
+class LazyTab(QWidget):
+    """
+    Placeholder for a restored tab. It holds only the saved state; MainWindow
+    swaps in a real BrowserTab (and a QWebEngineView) on first activation.
+    """
+
+    def __init__(self, state: TabState, parent=None):
+        super().__init__(parent)
+        self.state = state
+        self.url = state.url
+        self.title = state.title
+        layout = QVBoxLayout(self)
+        label = QLabel(state.title or state.url, self)
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(label)
\ No newline at end of file
@@ -0,0 +1,148 @@
+import getpass
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from .storage import APP_NAME
+
+# A second launch waits this long for the running browser to accept and answer
+CONNECT_TIMEOUT_MS = 200
+REPLY_TIMEOUT_MS = 2000
+
+# Larger messages are not from a launch of ours; the connection is dropped
+MAX_MESSAGE = 1024 * 1024
+
+_ACK = b"ok\n"
+
+
+class InstanceBusy(Exception):
+    """A browser is listening on the profile but did not take the URLs in time."""
+
+
+def server_name(profile: str = "default") -> str:
+    """
+    Local socket name of the browser running `profile`: one per user, data
+    directory and profile, so separate profiles still run side by side.
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = ""
+    key = "\0".join((user, os.getenv("APPDATA") or "", profile))
+    return f"{APP_NAME}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
+
+
+def command_line_urls(args: List[str]) -> List[str]:
+    """
+    URLs from the command line. Existing files become file:// URLs here, so a
+    relative path means the same in the browser it is forwarded to; anything
+    else is left for MainWindow to treat like address-bar text.
+    """
+    urls = []
+    for arg in args:
+        arg = arg.strip()
+        if not arg:
+            continue
+        if "://" not in arg and os.path.exists(arg):
+            arg = Path(arg).resolve().as_uri()
+        urls.append(arg)
+    return urls
+
+
+def forward(name: str, urls: List[str]) -> bool:
+    """
+    Hand `urls` to the browser listening on `name`. False if none is; raises
+    InstanceBusy if one is but does not answer. Blocking and needs no
+    QCoreApplication, so a second launch can call it before loading Qt widgets.
+    """
+    sock = QLocalSocket()
+    sock.connectToServer(name)
+    if not sock.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False  # nothing listening, or a socket file left by a crash
+    sock.write(json.dumps({"urls": urls}).encode("utf-8") + b"\n")
+    sock.flush()
+    reply = b""
+    while not reply.endswith(b"\n") and sock.waitForReadyRead(REPLY_TIMEOUT_MS):
+        reply += bytes(sock.readAll())
+    sock.disconnectFromServer()
+    if reply != _ACK:
+        raise InstanceBusy(f"the running browser did not answer within {REPLY_TIMEOUT_MS} ms")
+    return True
+
+
+class InstanceServer(QObject):
+    """
+    Listens for later launches on the same profile (see forward()). Each
+    sends one JSON line with its URLs and gets "ok" back once `urlsReceived`
+    has been emitted, so it can exit straight away. Only the user who
+    started the browser can connect.
+    """
+
+    urlsReceived = pyqtSignal(list)
+
+    def __init__(self, name: str, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.received = 0  # messages handled
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_connection)
+        self._buffers: Dict[QLocalSocket, bytes] = {}
+
+    def listen(self) -> bool:
+        """Start listening; a socket file left behind by a crashed browser is replaced."""
+        if self._server.listen(self.name):
+            return True
+        # Another launch may have started listening since our forward() found nobody
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.disconnectFromServer()
+            return False
+        QLocalServer.removeServer(self.name)
+        return self._server.listen(self.name)
+
+    def error(self) -> Optional[str]:
+        return self._server.errorString() or None
+
+    def close(self):
+        self._server.close()
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            sock = self._server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda s=sock: self._read(s))
+            sock.disconnected.connect(lambda s=sock: self._drop(s))
+
+    def _drop(self, sock: QLocalSocket):
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
+
+    def _read(self, sock: QLocalSocket):
+        data = self._buffers.get(sock, b"") + bytes(sock.readAll())
+        if b"\n" not in data:
+            if len(data) > MAX_MESSAGE:
+                sock.abort()
+            else:
+                self._buffers[sock] = data
+            return
+        line = data.split(b"\n", 1)[0]
+        self._buffers[sock] = b""
+        try:
+            urls = json.loads(line.decode("utf-8")).get("urls", [])
+        except (ValueError, AttributeError):
+            sock.abort()
+            return
+        if not isinstance(urls, list):
+            urls = []
+        self.received += 1
+        self.urlsReceived.emit([u for u in urls if isinstance(u, str)])
+        sock.write(_ACK)
+        sock.flush()
+        sock.disconnectFromServer()
\ No newline at end of file
@@ -0,0 +1,236 @@
+import hashlib
+import os
+import time
+import urllib.parse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# A snapshot is taken this long after loadFinished, once scripts have filled the page in
+SNAPSHOT_DELAY_MS = 2000
+
+# A page's snapshot is retaken on a visit at most this often
+REFRESH_S = 10 * 60
+
+# A save the engine never reported back on is given up after this long
+PENDING_TIMEOUT_S = 60
+
+# Eviction brings the store down to this share of its cap, so it does not run on every save
+EVICT_TO = 0.9
+
+SUFFIX = ".mhtml"
+
+
+def snapshot_eligible(url: str, hosts: List[str]) -> bool:
+    """http(s) pages on one of `hosts` (or a subdomain); every such page if `hosts` is empty."""
+    try:
+        parts = urllib.parse.urlsplit(url)
+    except ValueError:
+        return False
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+    host = parts.hostname.lower()
+    suffixes = [h.lower().strip(".") for h in hosts]
+    return not suffixes or any(host == h or host.endswith("." + h) for h in suffixes)
+
+
+def _unlink(path: Path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # Fail silently
+
+
+@dataclass
+class SnapshotStats:
+    snapshots: int = 0
+    bytes: int = 0
+    hits: int = 0       # "Open snapshot"s that found a fresh snapshot
+    misses: int = 0
+    revisits: int = 0   # page loads that had a fresh snapshot to fall back on
+    saved: int = 0
+    failed: int = 0
+    evicted: int = 0    # over the size cap, least recently used first
+    expired: int = 0    # older than the max age
+
+    @property
+    def hit_ratio(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.snapshots} pages, {self.bytes / 1024 / 1024:.1f} MB; {self.hits} hits, "
+                f"{self.misses} misses ({self.hit_ratio:.0%}); {self.revisits} revisits; "
+                f"{self.saved} saved, {self.failed} failed, "
+                f"{self.evicted} evicted, {self.expired} expired")
+
+
+class SnapshotStore:
+    """
+    MHTML snapshots of pages (QWebEnginePage.save), one file per URL in
+    <profile>/snapshots, so a page can be shown again without the network.
+    The store is capped in size, least recently used first, and snapshots
+    older than `max_age_s` are dropped.
+
+    The engine writes a snapshot to the path begin() returns and reports
+    back through a download request; finished() then moves it into place,
+    so a half-written file is never opened. The file's mtime is when it was
+    saved and its atime when it was last used. Files are renamed and
+    removed inline, not through the PersistenceWriter, so a queued removal
+    can never hit a newer snapshot of the same page. GUI thread only.
+    """
+
+    def __init__(self, root: Path, max_mb: int = 256, max_age_s: float = 30 * 86400):
+        self.dir = Path(root) / "snapshots"
+        self.max_bytes = max(1, max_mb) * 1024 * 1024
+        self.max_age_s = max_age_s
+        self._files: Optional[Dict[Path, List[float]]] = None  # path -> [size, saved, last used]
+        self._bytes = 0
+        self._pending: Dict[Path, float] = {}  # temp path -> started
+        self._stats = SnapshotStats()
+
+    # --- Disk index ---
+    def _index(self) -> Dict[Path, List[float]]:
+        if self._files is None:
+            self._files = {}
+            try:
+                with os.scandir(self.dir) as it:
+                    for e in it:
+                        if e.is_file() and e.name.endswith(SUFFIX):
+                            st = e.stat()
+                            self._files[Path(e.path)] = [st.st_size, st.st_mtime, st.st_atime]
+                        elif e.is_file() and Path(e.path) not in self._pending:
+                            _unlink(Path(e.path))  # a save cut short by a crash
+            except OSError:
+                pass  # not created yet
+            self._bytes = sum(size for size, _, _ in self._files.values())
+            self._expire()
+        return self._files
+
+    def path_for(self, url: str) -> Path:
+        return self.dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}{SUFFIX}"
+
+    def is_snapshot(self, path: str) -> bool:
+        """Whether a local file (QUrl.toLocalFile() of a tab's URL) is one of our snapshots."""
+        if not path:
+            return False
+        p = Path(path)
+        return p.parent == self.dir and p.suffix == SUFFIX
+
+    def _remove(self, path: Path):
+        size = self._files.pop(path)[0]
+        self._bytes -= size
+        _unlink(path)
+
+    def _fresh(self, path: Path, now: float) -> Optional[List[float]]:
+        entry = self._index().get(path)
+        if entry is not None and now - entry[1] > self.max_age_s:
+            self._remove(path)
+            self._stats.expired += 1
+            return None
+        return entry
+
+    def _expire(self):
+        now = time.time()
+        for path in [p for p, e in self._files.items() if now - e[1] > self.max_age_s]:
+            self._remove(path)
+            self._stats.expired += 1
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TO
+        for path, _ in sorted(self._files.items(), key=lambda kv: kv[1][2]):
+            if self._bytes <= target:
+                break
+            self._remove(path)
+            self._stats.evicted += 1
+
+    # --- Lookups ---
+    def has(self, url: str) -> bool:
+        """Whether a fresh snapshot of `url` exists; not counted in the stats."""
+        return self._fresh(self.path_for(url), time.time()) is not None
+
+    def visited(self, url: str) -> bool:
+        """Whether a page load of `url` had a fresh snapshot; counted as a revisit, not a use."""
+        fresh = self.has(url)
+        if fresh:
+            self._stats.revisits += 1
+        return fresh
+
+    def get(self, url: str) -> Optional[Path]:
+        """The snapshot of `url` if there is a fresh one; counts as a hit or miss and as a use."""
+        path = self.path_for(url)
+        now = time.time()
+        entry = self._fresh(path, now)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        entry[2] = now
+        try:
+            os.utime(path, (now, entry[1]))  # keeps its place in the eviction order across sessions
+        except OSError:
+            pass
+        return path
+
+    # --- Saving ---
+    def wants(self, url: str) -> bool:
+        """Whether a visit to `url` should take a new snapshot (none yet, or an old one)."""
+        path = self.path_for(url)
+        started = self._pending.get(self._temp(path))
+        now = time.time()
+        if started is not None and now - started < PENDING_TIMEOUT_S:
+            return False
+        entry = self._fresh(path, now)
+        return entry is None or now - entry[1] >= REFRESH_S
+
+    @staticmethod
+    def _temp(path: Path) -> Path:
+        return path.with_name(path.name + ".part")
+
+    def begin(self, url: str) -> Path:
+        """Path to save the snapshot of `url` to; pass it to finished() when the engine is done."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        temp = self._temp(self.path_for(url))
+        self._pending[temp] = time.time()
+        return temp
+
+    def finished(self, temp: Path, ok: bool) -> bool:
+        """Move a completed save into place; False if `temp` was not ours."""
+        temp = Path(temp)
+        if self._pending.pop(temp, None) is None:
+            return False
+        if not ok:
+            self._stats.failed += 1
+            _unlink(temp)
+            return True
+        path = temp.with_name(temp.name[:-len(".part")])
+        try:
+            os.replace(temp, path)
+            size = os.path.getsize(path)
+        except OSError:
+            self._stats.failed += 1
+            return True
+        files = self._index()
+        if path in files:
+            self._bytes -= files[path][0]
+        now = time.time()
+        files[path] = [size, now, now]
+        self._bytes += size
+        self._stats.saved += 1
+        self._evict()
+        return True
+
+    # --- Housekeeping ---
+    @property
+    def stats(self) -> SnapshotStats:
+        files = self._index()
+        s = self._stats
+        s.snapshots = len(files)
+        s.bytes = int(self._bytes)
+        return s
+
+    def clear(self):
+        for path in list(self._index()):
+            self._remove(path)
\ No newline at end of file
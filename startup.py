@@ -0,0 +1,45 @@
+import sys
+import time
+from typing import List, Optional, Tuple
+
+
+class StartupProfiler:
+    """
+    Per-phase startup timing for --profile-startup. Each mark() closes the
+    phase that began at the previous mark; finish() prints the breakdown once.
+    Marks are cheap and always recorded, so callers need not check `enabled`.
+    """
+
+    def __init__(self, enabled: bool = False, t0: Optional[float] = None):
+        self.enabled = enabled
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self._last = self.t0
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+
+    def mark(self, phase: str):
+        if self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self) -> float:
+        return (self._last - self.t0) * 1000
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        for phase, ms in self.phases:
+            lines.append(f"  {phase:<14}{ms:9.1f} ms")
+        lines.append(f"  {'total':<14}{self.total_ms():9.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self, phase: Optional[str] = None):
+        """Close the last phase and print the report (only the first call counts)."""
+        if self.finished:
+            return
+        if phase:
+            self.mark(phase)
+        self.finished = True
+        if self.enabled:
+            print(self.report(), file=sys.stderr, flush=True)
\ No newline at end of file
@@ -1,25 +1,42 @@
 import json
 import os
+import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, List, Optional
 
 APP_NAME = "CopperBrowserV1"
 
+_PROFILE_NAME = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}")
+
 def app_root() -> Path:
     base = Path(os.getenv("APPDATA")) / APP_NAME
     (base / "profiles" / "default" / "data").mkdir(parents=True, exist_ok=True)
     return base
 
+def valid_profile_name(name: str) -> bool:
+    """Profile names become directory names: letters, digits, '.', '_' and '-'."""
+    return bool(_PROFILE_NAME.fullmatch(name))
+
 def profile_root(profile: str = "default") -> Path:
+    if not valid_profile_name(profile):
+        raise ValueError(f"invalid profile name: {profile!r}")
     return app_root() / "profiles" / profile
 
 def data_file(name: str, profile: str = "default") -> Path:
     return profile_root(profile) / "data" / f"{name}.json"
 
-def save_json(path: Path, obj: Any) -> None:
+def log_file(name: str, profile: str = "default") -> Path:
+    return profile_root(profile) / "data" / f"{name}.jsonl"
+
+def save_json(path: Path, obj: Any, indent: Optional[int] = 2) -> None:
+    """Write atomically: temp file, fsync, rename. A crash leaves the old or new file, never half of one."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 def load_json(path: Path, default: Any) -> Any:
     if not path.exists():
@@ -28,4 +45,85 @@ def load_json(path: Path, default: Any) -> Any:
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
-        return default
\ No newline at end of file
+        return default
+
+
+class JsonLinesLog:
+    """
+    Append-only JSON-lines file: one record per line, so adding costs O(1) I/O.
+    Appended records are buffered in memory until flush(), which the stores
+    (history, bookmarks) run on the persistence writer's thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fh = None
+        self.pending: List[dict] = []
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def read(self) -> Iterator[dict]:
+        """Yield every readable record; torn or corrupt lines are skipped."""
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def append(self, record: dict):
+        """Buffer a single record; nothing touches the disk until flush()."""
+        self.pending.append(record)
+
+    def take(self) -> List[dict]:
+        """
+        Remove and return the buffered records. The stores take them under
+        their lock and write() them outside it, so append() never waits on
+        the disk.
+        """
+        records, self.pending = self.pending, []
+        return records
+
+    def flush(self):
+        """Write buffered records and fsync them. On error they stay buffered for a retry."""
+        records = self.take()
+        try:
+            self.write(records)
+        except BaseException:
+            self.pending[:0] = records
+            raise
+
+    def write(self, records: List[dict]):
+        """Append `records` and fsync them."""
+        if not records:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a", encoding="utf-8")
+        self._fh.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def rewrite(self, records: List[dict]):
+        """
+        Replace the whole log with `records` (used for compaction and clear).
+        Buffered records are kept; take() them first to drop them.
+        """
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def close(self):
+        """Close the file; call flush() first to keep buffered records."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
\ No newline at end of file
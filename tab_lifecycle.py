@@ -0,0 +1,179 @@
+import os
+import time
+from collections import defaultdict
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+# How often idle tabs and the memory budget are checked
+CHECK_INTERVAL_MS = 15_000
+
+# Assumed renderer footprint when it cannot be measured (non-Linux)
+ESTIMATED_TAB_MB = 150
+
+# True when a form field differs from what the page was served with
+_DIRTY_FORM_JS = """
+(function () {
+    var els = document.querySelectorAll('input, textarea, select');
+    for (var i = 0; i < els.length; i++) {
+        var e = els[i];
+        if (e.tagName === 'SELECT') {
+            for (var j = 0; j < e.options.length; j++)
+                if (e.options[j].selected !== e.options[j].defaultSelected) return true;
+        } else if (e.type === 'checkbox' || e.type === 'radio') {
+            if (e.checked !== e.defaultChecked) return true;
+        } else if (['hidden', 'submit', 'button', 'reset', 'image'].indexOf(e.type) < 0) {
+            if (e.value !== e.defaultValue) return true;
+        }
+    }
+    return false;
+})()
+"""
+
+
+def rss_mb(pid: int) -> float:
+    """Resident memory of `pid` from /proc, or -1 where that is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return -1
+
+
+class TabLifecycleManager(QObject):
+    """
+    Moves background tabs from Active to Frozen to Discarded.
+
+    Tabs idle for Config.tab_freeze_after_s are frozen (no JS, no timers, but
+    the renderer keeps the page). Tabs idle for Config.tab_discard_after_s are
+    discarded (renderer memory released). If the tabs together still exceed
+    Config.tab_memory_budget_mb, the least recently used ones are discarded
+    first. The current tab, tabs playing audio and tabs with edited form
+    fields are never touched. Selecting a frozen or discarded tab makes it
+    Active again; a discarded page reloads its URL.
+    """
+
+    def __init__(self, tabs, config, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.config = config
+        self.tabs.currentChanged.connect(self._on_current_changed)
+        self._timer = QTimer(self)
+        self._timer.setInterval(CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self.check)
+        self._checking = set()  # tabs whose dirty-form check is still running
+        self._budget_pass = 0   # bumped by check(); older budget passes stop
+        if config.tab_hibernation:
+            self._timer.start()
+
+    def _all_tabs(self):
+        # Restored tabs that were never opened (session.LazyTab) have no view
+        tabs = (self.tabs.widget(i) for i in range(self.tabs.count()))
+        return [t for t in tabs if hasattr(t, "view")]
+
+    def _on_current_changed(self, index: int):
+        tab = self.tabs.widget(index)
+        if tab is None or not hasattr(tab, "view"):
+            return
+        tab.last_active = time.monotonic()
+        page = tab.view.page()
+        if page.lifecycleState() != LifecycleState.Active:
+            page.setLifecycleState(LifecycleState.Active)
+            if page.url().isEmpty() and tab.url:
+                tab.load(tab.url)
+
+    # --- Memory ---
+    def memory_mb(self) -> dict:
+        """Estimated renderer memory per tab; tabs sharing a renderer split its RSS."""
+        by_pid = defaultdict(list)
+        for tab in self._all_tabs():
+            page = tab.view.page()
+            if page.lifecycleState() != LifecycleState.Discarded:
+                by_pid[page.renderProcessPid()].append(tab)
+        out = {tab: 0.0 for tab in self._all_tabs()}
+        for pid, shared in by_pid.items():
+            rss = rss_mb(pid) if pid > 0 and os.name != "nt" else -1
+            for tab in shared:
+                out[tab] = rss / len(shared) if rss >= 0 else ESTIMATED_TAB_MB
+        return out
+
+    # --- Policy ---
+    def check(self):
+        if not self.config.tab_hibernation:
+            return
+        now = time.monotonic()
+        current = self.tabs.currentWidget()
+        candidates = [t for t in self._all_tabs()
+                      if t is not current and not t.view.page().recentlyAudible()]
+
+        for tab in candidates:
+            if tab in self._checking:
+                continue
+            idle = now - tab.last_active
+            state = tab.view.page().lifecycleState()
+            if state != LifecycleState.Discarded and idle >= self.config.tab_discard_after_s:
+                self._transition(tab, LifecycleState.Discarded)
+            elif state == LifecycleState.Active and idle >= self.config.tab_freeze_after_s:
+                self._transition(tab, LifecycleState.Frozen)
+
+        self._budget_pass += 1
+        mem = self.memory_mb()
+        self._enforce_budget(self._budget_pass, sorted(candidates, key=lambda t: t.last_active),
+                             mem, sum(mem.values()))
+
+    def _enforce_budget(self, pass_: int, queue: list, mem: dict, total: float):
+        """
+        Discard the least recently used tabs in `queue` until `total` fits the
+        budget, one at a time: a dirty form can still veto a discard, so a
+        tab's memory only counts as freed once it is actually discarded.
+        """
+        if pass_ != self._budget_pass:
+            return  # a newer check() has taken over
+        while queue and total > self.config.tab_memory_budget_mb:
+            tab = queue.pop(0)
+            try:
+                if tab in self._checking or tab.view.page().lifecycleState() == LifecycleState.Discarded:
+                    continue
+            except RuntimeError:
+                continue  # tab was closed
+            freed = mem.get(tab, 0)
+            self._transition(tab, LifecycleState.Discarded,
+                             lambda applied: self._enforce_budget(pass_, queue, mem,
+                                                                  total - freed if applied else total))
+            return
+
+    def _transition(self, tab, state, done=None):
+        """Move `tab` to `state` unless it has edited form fields; then done(applied), if given."""
+        page = tab.view.page()
+        if page.lifecycleState() != LifecycleState.Active:
+            # Frozen pages cannot have been edited since they were checked
+            applied = self._apply(tab, state)
+            if done is not None:
+                done(applied)
+            return
+        self._checking.add(tab)
+
+        def checked(dirty):
+            self._checking.discard(tab)
+            applied = not dirty and self._apply(tab, state)
+            if done is not None:
+                done(applied)
+
+        page.runJavaScript(_DIRTY_FORM_JS, checked)
+
+    def _apply(self, tab, state) -> bool:
+        try:
+            page = tab.view.page()
+            if tab is self.tabs.currentWidget() or page.recentlyAudible():
+                return False  # became active or started playing while we waited
+            if state == LifecycleState.Discarded:
+                tab.remember_state()
+            page.setLifecycleState(state)
+            return True
+        except RuntimeError:
+            return False  # tab was closed
\ No newline at end of file
@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .storage import save_json
+
+# Sampling interval while the task manager is open
+LIVE_INTERVAL_MS = 1000
+
+# Totals kept for tracking memory growth over a long session
+MAX_HISTORY = 2880  # a day at 30 s
+
+try:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLK_TCK = 100
+
+
+@dataclass
+class ProcSample:
+    pid: int
+    rss_mb: float = -1.0   # -1: unavailable (no /proc, or the process is gone)
+    pss_mb: float = -1.0   # proportional share of pages shared with other processes
+    cpu_s: float = -1.0    # user + system CPU time so far
+    cpu_pct: float = 0.0   # since the previous sample
+
+
+def read_proc(pid: int) -> ProcSample:
+    """RSS, PSS and CPU time of `pid` from /proc (Linux)."""
+    s = ProcSample(pid)
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    s.rss_mb = int(line.split()[1]) / 1024
+                    break
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        s.cpu_s = (int(fields[11]) + int(fields[12])) / _CLK_TCK
+    except (OSError, ValueError, IndexError):
+        return s
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    s.pss_mb = int(line.split()[1]) / 1024
+                    break
+    except (OSError, ValueError):
+        pass  # older kernels; RSS is still there
+    return s
+
+
+@dataclass
+class TabSample:
+    """One tab's renderer as of the last sample. `tab` is only for GUI-thread use."""
+    tab: object
+    title: str
+    url: str
+    proc: ProcSample
+    shared: int = 1  # tabs on the same renderer process
+
+    def to_dict(self) -> dict:
+        p = self.proc
+        return {"title": self.title, "url": self.url, "pid": p.pid, "rss_mb": round(p.rss_mb, 1),
+                "pss_mb": round(p.pss_mb, 1), "cpu_s": round(p.cpu_s, 2),
+                "cpu_pct": round(p.cpu_pct, 1), "shared": self.shared}
+
+
+class TaskSampler(QObject):
+    """
+    Maps each tab to its renderer (QWebEnginePage.renderProcessPid) and
+    samples RSS, PSS and CPU from /proc on a timer. The /proc reads run on
+    a worker thread; `sampled` is emitted on the GUI thread with the
+    browser process and one TabSample per tab, largest PSS first.
+
+    `latest`, `browser` and `history` (session totals over time) are there
+    for policies and for dump().
+    """
+
+    sampled = pyqtSignal(list)
+    _read = pyqtSignal(object, object)  # worker -> GUI thread
+
+    def __init__(self, tabs, interval_s: int = 30, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.latest: List[TabSample] = []
+        self.browser: Optional[ProcSample] = None
+        self.history = deque(maxlen=MAX_HISTORY)  # (time, browser + renderers RSS, PSS)
+        self._prev: Dict[int, tuple] = {}  # pid -> (cpu_s, monotonic)
+        self._busy = False
+        self._interval_ms = max(0, interval_s) * 1000
+        self._live = 0
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.sample)
+        self._read.connect(self._on_read)
+        self._schedule()
+
+    @property
+    def available(self) -> bool:
+        return os.path.isdir("/proc")
+
+    # --- Scheduling ---
+    def set_live(self, live: bool):
+        """Sample every LIVE_INTERVAL_MS while someone is watching."""
+        self._live += 1 if live else -1
+        self._schedule()
+        if live:
+            self.sample()
+
+    def _schedule(self):
+        interval = LIVE_INTERVAL_MS if self._live > 0 else self._interval_ms
+        if interval and self.available:
+            self._timer.start(interval)
+        else:
+            self._timer.stop()
+
+    # --- Sampling ---
+    def sample(self):
+        """Start a sample; skipped while the previous one is still reading /proc."""
+        if self._busy or not self.available:
+            return
+        tabs = []
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if hasattr(tab, "view"):  # restored tabs that were never opened have no renderer
+                tabs.append((tab, tab.view.title() or tab.title, tab.url, tab.view.page().renderProcessPid()))
+        self._busy = True
+        pids = {pid for *_, pid in tabs if pid > 0} | {os.getpid()}
+        threading.Thread(target=lambda: self._read.emit(tabs, {p: read_proc(p) for p in pids}),
+                         name="task-sampler", daemon=True).start()
+
+    def _on_read(self, tabs, procs: Dict[int, ProcSample]):
+        self._busy = False
+        now = time.monotonic()
+        for pid, p in procs.items():
+            prev = self._prev.get(pid)
+            if prev is not None and p.cpu_s >= 0 and now > prev[1]:
+                p.cpu_pct = max(0.0, (p.cpu_s - prev[0]) / (now - prev[1]) * 100)
+        self._prev = {pid: (p.cpu_s, now) for pid, p in procs.items() if p.cpu_s >= 0}
+
+        counts: Dict[int, int] = {}
+        for *_, pid in tabs:
+            counts[pid] = counts.get(pid, 0) + 1
+        samples = [TabSample(tab, title, url, procs.get(pid) or ProcSample(pid), counts[pid])
+                   for tab, title, url, pid in tabs]
+        samples.sort(key=lambda s: (s.proc.pss_mb if s.proc.pss_mb >= 0 else s.proc.rss_mb), reverse=True)
+        self.latest = samples
+        self.browser = procs.get(os.getpid())
+
+        renderers = {s.proc.pid: s.proc for s in samples if s.proc.pid > 0 and s.proc.pid != os.getpid()}.values()
+        rss = sum(max(p.rss_mb, 0) for p in renderers) + max(self.browser.rss_mb, 0)
+        pss = sum(max(p.pss_mb, 0) for p in renderers) + max(self.browser.pss_mb, 0)
+        self.history.append((time.time(), round(rss, 1), round(pss, 1)))
+        self.sampled.emit(samples)
+
+    def by_tab(self) -> Dict[object, TabSample]:
+        return {s.tab: s for s in self.latest}
+
+    # --- Export ---
+    def to_dict(self) -> dict:
+        return {
+            "time": time.time(),
+            "browser": self.browser.__dict__ if self.browser else None,
+            "tabs": [s.to_dict() for s in self.latest],
+            "history": [{"time": t, "rss_mb": r, "pss_mb": p} for t, r, p in self.history],
+        }
+
+    def dump(self, path):
+        """Write the latest samples and the session's memory history as JSON."""
+        save_json(Path(path), self.to_dict())
\ No newline at end of file
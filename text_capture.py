@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QTimer
+
+# Give a freshly loaded page this long to settle (late scripts, lazy content)
+CAPTURE_DELAY_MS = 3000
+
+# At most one page is captured per interval, whatever the load rate
+CAPTURE_INTERVAL_MS = 1000
+
+# Do not re-capture the same URL within this many seconds
+RECAPTURE_AFTER = 6 * 3600
+
+MAX_PENDING = 64
+
+# Capture times kept for RECAPTURE_AFTER; beyond this many URLs the oldest are forgotten
+MAX_CAPTURED = 4096
+
+
+class PageTextCapture(QObject):
+    """
+    Throttled capture of page text for the full-text index. Loaded tabs are
+    queued; a timer pulls one page's plain text at a time via toPlainText()
+    and hands it to the indexer, which tokenizes and writes off the GUI thread.
+    """
+
+    def __init__(self, indexer, parent=None):
+        super().__init__(parent)
+        self.indexer = indexer
+        self._pending: "OrderedDict[object, tuple]" = OrderedDict()  # tab -> (url, due time)
+        # url -> time of last capture, oldest first; pruned by _prune()
+        self._captured: "OrderedDict[str, float]" = OrderedDict()
+        self._timer = QTimer(self)
+        self._timer.setInterval(CAPTURE_INTERVAL_MS)
+        self._timer.timeout.connect(self._capture_next)
+
+    def page_loaded(self, tab):
+        url = tab.view.url().toString()
+        if not url.startswith(("http://", "https://")):
+            return
+        if time.time() - self._captured.get(url, 0) < RECAPTURE_AFTER:
+            return
+        # A tab that navigates again replaces its older pending capture
+        self._pending.pop(tab, None)
+        self._pending[tab] = (url, time.monotonic() + CAPTURE_DELAY_MS / 1000)
+        while len(self._pending) > MAX_PENDING:
+            self._pending.popitem(last=False)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _capture_next(self):
+        now = time.monotonic()
+        for tab, (url, due) in list(self._pending.items()):
+            if due > now:
+                continue
+            del self._pending[tab]
+            try:
+                if tab.view.url().toString() != url:
+                    continue  # navigated away; its new load queues it again
+                title = tab.view.title()
+                page = tab.view.page()
+            except RuntimeError:
+                continue  # tab was closed
+            self._captured.pop(url, None)
+            self._captured[url] = time.time()
+            page.toPlainText(lambda text, u=url, t=title: self.indexer.submit(u, t, text))
+            break
+        self._prune()
+        if not self._pending:
+            self._timer.stop()
+
+    def _prune(self):
+        """Forget captures older than RECAPTURE_AFTER, and the oldest beyond MAX_CAPTURED."""
+        cutoff = time.time() - RECAPTURE_AFTER
+        while self._captured:
+            url, ts = next(iter(self._captured.items()))
+            if ts >= cutoff and len(self._captured) <= MAX_CAPTURED:
+                break
+            del self._captured[url]
\ No newline at end of file
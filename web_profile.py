@@ -0,0 +1,170 @@
+import time
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtNetwork import QNetworkCookieJar
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
+from .storage import profile_root
+
+HTTP_CACHE_TYPES = {
+    "disk": QWebEngineProfile.HttpCacheType.DiskHttpCache,
+    "memory": QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+    "none": QWebEngineProfile.HttpCacheType.NoCache,
+}
+
+COOKIE_POLICIES = {
+    "allow": QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies,
+    "force": QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies,
+    "none": QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies,
+}
+
+_RT = QWebEngineUrlRequestInfo.ResourceType
+
+# Filter-list type of each request kind; page navigations are never blocked
+_RESOURCE_TYPES = {
+    getattr(_RT, name): rtype for name, rtype in (
+        ("ResourceTypeSubFrame", "subdocument"),
+        ("ResourceTypeNavigationPreloadSubFrame", "subdocument"),
+        ("ResourceTypeStylesheet", "stylesheet"),
+        ("ResourceTypeScript", "script"),
+        ("ResourceTypeWorker", "script"),
+        ("ResourceTypeSharedWorker", "script"),
+        ("ResourceTypeServiceWorker", "script"),
+        ("ResourceTypeImage", "image"),
+        ("ResourceTypeFavicon", "image"),
+        ("ResourceTypeFontResource", "font"),
+        ("ResourceTypeObject", "object"),
+        ("ResourceTypePluginResource", "object"),
+        ("ResourceTypeMedia", "media"),
+        ("ResourceTypeXhr", "xmlhttprequest"),
+        ("ResourceTypePing", "ping"),
+        ("ResourceTypeCspReport", "ping"),
+        ("ResourceTypeWebSocket", "websocket"),
+        ("ResourceTypeSubResource", "other"),
+        ("ResourceTypePrefetch", "other"),
+        ("ResourceTypeUnknown", "other"),
+    ) if hasattr(_RT, name)
+}
+
+# Resources with a body but nothing transferred were served from the cache.
+# Cross-origin resources without Timing-Allow-Origin report no sizes and are skipped.
+_CACHE_SAMPLE_JS = """
+(function () {
+    var out = {requests: 0, hits: 0, bytes: 0, cached_bytes: 0};
+    var entries = performance.getEntriesByType('navigation')
+        .concat(performance.getEntriesByType('resource'));
+    for (var i = 0; i < entries.length; i++) {
+        var e = entries[i];
+        if (!e.decodedBodySize) continue;
+        out.requests++;
+        out.bytes += e.decodedBodySize;
+        if (e.transferSize === 0) {
+            out.hits++;
+            out.cached_bytes += e.decodedBodySize;
+        }
+    }
+    return out;
+})()
+"""
+
+
+def create_web_profile(config, parent=None) -> QWebEngineProfile:
+    """
+    On-disk web profile named Config.profile, stored under storage.profile_root():
+    cookies and site storage in web/, the HTTP cache in cache/.
+    """
+    root = profile_root(config.profile)
+    profile = QWebEngineProfile(config.profile, parent)
+    profile.setPersistentStoragePath(str(root / "web"))
+    profile.setCachePath(str(root / "cache"))
+    profile.setHttpCacheType(HTTP_CACHE_TYPES.get(config.http_cache_type, HTTP_CACHE_TYPES["disk"]))
+    profile.setHttpCacheMaximumSize(max(0, config.http_cache_max_mb) * 1024 * 1024)  # 0: Chromium decides
+    profile.setPersistentCookiesPolicy(COOKIE_POLICIES.get(config.persistent_cookies, COOKIE_POLICIES["allow"]))
+    profile.setHttpUserAgent(config.user_agent)
+    return profile
+
+
+class CookieMirror(QNetworkCookieJar):
+    """
+    Follows the profile's cookie store, so requests made outside the web
+    engine (downloads) can send the same cookies as the page did.
+    """
+
+    def __init__(self, profile: QWebEngineProfile, parent=None):
+        super().__init__(parent)
+        store = profile.cookieStore()
+        store.cookieAdded.connect(self.insertCookie)
+        store.cookieRemoved.connect(self.deleteCookie)
+        store.loadAllCookies()
+
+    def header(self, url: str) -> str:
+        """Cookie header value for a request to `url`."""
+        return "; ".join(f"{bytes(c.name()).decode('latin-1')}={bytes(c.value()).decode('latin-1')}"
+                         for c in self.cookiesForUrl(QUrl(url)))
+
+
+@dataclass
+class CacheStats:
+    """HTTP cache effectiveness over the pages sampled so far."""
+    pages: int = 0
+    requests: int = 0
+    hits: int = 0
+    bytes: int = 0
+    cached_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    @property
+    def byte_hit_ratio(self) -> float:
+        return self.cached_bytes / self.bytes if self.bytes else 0.0
+
+    def add(self, sample: dict):
+        self.pages += 1
+        self.requests += int(sample.get("requests", 0))
+        self.hits += int(sample.get("hits", 0))
+        self.bytes += int(sample.get("bytes", 0))
+        self.cached_bytes += int(sample.get("cached_bytes", 0))
+
+    def sample(self, page):
+        """Add the resource timings of a loaded page (asynchronously)."""
+        page.runJavaScript(_CACHE_SAMPLE_JS,
+                           lambda r: self.add(r) if isinstance(r, dict) else None)
+
+    def summary(self) -> str:
+        return (f"{self.pages} pages, {self.hits}/{self.requests} requests from cache "
+                f"({self.hit_ratio:.0%}), {self.byte_hit_ratio:.0%} of bytes")
+
+
+class RequestBlocker(QWebEngineUrlRequestInterceptor):
+    """
+    Blocks subresource requests matched by an adblock.FilterEngine. `engine`
+    may be set later (it is compiled off the GUI thread); until then nothing
+    is blocked.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.engine = None
+        self.checked = 0
+        self.blocked = 0
+        self.total_us = 0.0
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo):
+        engine = self.engine
+        rtype = _RESOURCE_TYPES.get(info.resourceType())
+        if engine is None or rtype is None:
+            return
+        t0 = time.perf_counter()
+        rule = engine.match(info.requestUrl().toString(), info.firstPartyUrl().host(), rtype)
+        self.total_us += (time.perf_counter() - t0) * 1e6
+        self.checked += 1
+        if rule is not None:
+            self.blocked += 1
+            info.block(True)
+
+    @property
+    def avg_us(self) -> float:
+        return self.total_us / self.checked if self.checked else 0.0
\ No newline at end of file